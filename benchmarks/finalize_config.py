@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmarks tendermint_finalize_config for a single node group of increasing
+size, to show how finalization scales with the number of nodes. Node keys and
+configuration are generated up front (and aren't timed).
+
+With a bounded-degree topology, each node's configuration is the same size
+regardless of the size of the network, and the time per node should remain
+roughly constant. In a full mesh, each node's configuration lists every other
+node, so the time per node grows with its configuration size instead.
+
+Usage:
+    python benchmarks/finalize_config.py [--nodes 250,500,1000,2000] [--topology random-regular]
+"""
+
+import argparse
+import logging
+import os
+import os.path
+import shutil
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tmtestnet  # noqa: E402
+
+
+CONFIG_TEMPLATE = """id: finalize-benchmark
+node_groups:
+  - validators:
+      regions:
+        - us_east_1: %(node_count)d
+      persistent_peers:
+        - validators
+%(topology)s"""
+
+TOPOLOGY_TEMPLATE = """      topology:
+        type: %(type)s
+        degree: %(degree)d
+        seed: 0
+"""
+
+
+def benchmark(node_count: int, topology: str, degree: int, workdir: str):
+    """Returns how long it took to finalize the configuration of a node group
+    of the given size, along with the size of its first node's configuration
+    file."""
+    config_file = os.path.join(workdir, "tmtestnet.yaml")
+    with open(config_file, "wt") as f:
+        f.write(CONFIG_TEMPLATE % {
+            "node_count": node_count,
+            "topology": TOPOLOGY_TEMPLATE % {"type": topology, "degree": degree} if topology else "",
+        })
+    cfg = tmtestnet.load_testnet_config(config_file)._replace(home=os.path.join(workdir, "home"))
+    tendermint_config = OrderedDict()
+    tendermint_config["validators"] = tmtestnet.tendermint_generate_config(
+        os.path.join(cfg.home, cfg.id, "tendermint", "validators"),
+        "validators",
+        None,
+        node_count,
+        0,
+        ["node%d.example.com" % i for i in range(node_count)],
+        False,
+    )
+    started = time.perf_counter()
+    tmtestnet.tendermint_finalize_config(cfg, tendermint_config)
+    elapsed = time.perf_counter() - started
+    return elapsed, os.path.getsize(os.path.join(tendermint_config["validators"][0].config_path, "config.toml"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks tendermint_finalize_config")
+    parser.add_argument("--nodes", default="250,500,1000,2000", help="Comma-separated node counts (default: 250,500,1000,2000)")
+    parser.add_argument(
+        "--topology",
+        choices=tmtestnet.TOPOLOGY_TYPES,
+        default=None,
+        help="Lay the node group out with this topology (default: full mesh)",
+    )
+    parser.add_argument("--degree", type=int, default=8, help="The topology's degree (default: 8)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    node_counts = [int(n) for n in args.nodes.split(",")]
+    print("%8s %12s %14s %10s %16s" % ("nodes", "seconds", "ms per node", "scaling", "config KB/node"))
+    baseline = None
+    for node_count in node_counts:
+        workdir = tempfile.mkdtemp(prefix="tmtestnet-benchmark-")
+        try:
+            elapsed, config_size = benchmark(node_count, args.topology, args.degree, workdir)
+        finally:
+            shutil.rmtree(workdir)
+        per_node = elapsed / node_count
+        baseline = baseline or per_node
+        # how much more each node costs than in the smallest network (1.0 is
+        # perfectly linear scaling)
+        print("%8d %12.3f %14.3f %10.2f %16.1f" % (node_count, elapsed, 1000 * per_node, per_node / baseline, config_size / 1024))
+
+
+if __name__ == "__main__":
+    main()
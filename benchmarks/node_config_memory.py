@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Measures how much memory the loaded configuration of a single node group
+retains, with each node holding its own parsed copy of its configuration file
+(as TendermintNodeConfig used to) versus its node group's shared template
+plus a TendermintNodeConfigOverrides record (as it does now). Node keys and
+configuration are generated up front, and are loaded from disk (without the
+node configuration cache) for each measurement.
+
+Retained memory is measured with tracemalloc, and includes the nodes' keys and
+peer IDs, which are the same in both cases. Tracing slows loading down
+considerably, so with 5,000 nodes this takes several minutes.
+
+Usage:
+    python benchmarks/node_config_memory.py [--nodes 5000]
+"""
+
+import argparse
+import gc
+import logging
+import os
+import os.path
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tmtestnet  # noqa: E402
+
+
+def load_per_node_configs(base_path: str, node_count: int):
+    """Loads the node group's configuration, keeping a complete parsed copy of
+    each node's configuration file in place of its template and overrides."""
+    return [
+        node_cfg._replace(
+            template=tmtestnet.load_toml_config(os.path.join(node_cfg.config_path, "config.toml")),
+            overrides=None,
+        )
+        for node_cfg in tmtestnet.tendermint_load_nodes_config(base_path, node_count)
+    ]
+
+
+def load_shared_templates(base_path: str, node_count: int):
+    return tmtestnet.tendermint_load_nodes_config(base_path, node_count)
+
+
+def retained_memory(load, base_path: str, node_count: int):
+    """Returns how many bytes the result of the given loader retains once it's
+    done, along with how long it took."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    nodes = load(base_path, node_count)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    assert len(nodes) == node_count
+    del nodes
+    return retained, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the memory retained by loaded node configuration")
+    parser.add_argument("--nodes", type=int, default=5000, help="The number of nodes in the node group (default: 5000)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    workdir = tempfile.mkdtemp(prefix="tmtestnet-benchmark-")
+    try:
+        base_path = os.path.join(workdir, "validators")
+        tmtestnet.tendermint_generate_config(
+            base_path,
+            "validators",
+            None,
+            args.nodes,
+            0,
+            ["node%d.example.com" % i for i in range(args.nodes)],
+            False,
+        )
+        print("%-28s %12s %14s %12s" % ("node configuration", "MiB", "KiB per node", "seconds"))
+        for desc, load in [
+            ("parsed copy per node", load_per_node_configs),
+            ("shared template+overrides", load_shared_templates),
+        ]:
+            retained, elapsed = retained_memory(load, base_path, args.nodes)
+            print("%-28s %12.1f %14.2f %12.2f" % (desc, retained / (1024 * 1024), retained / 1024 / args.nodes, elapsed))
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
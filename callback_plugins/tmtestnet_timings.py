@@ -0,0 +1,96 @@
+# Ansible callback plugin that records when each task started and finished on
+# each host, so that tmtestnet can report on slow hosts and tasks (see
+# "tmtestnet.py network timings"). Timings are written as JSON lines to the
+# file named by the TMTESTNET_TIMINGS_FILE environment variable, which is
+# truncated at the start of each playbook run.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import time
+
+from ansible.plugins.callback import CallbackBase
+
+
+DOCUMENTATION = """
+    name: tmtestnet_timings
+    type: aggregate
+    short_description: Records per-host, per-task start and end times
+    description:
+      - Writes a JSON line per host per task to the file named by the
+        TMTESTNET_TIMINGS_FILE environment variable.
+    requirements:
+      - enable in configuration
+"""
+
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "aggregate"
+    CALLBACK_NAME = "tmtestnet_timings"
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, *args, **kwargs):
+        super(CallbackModule, self).__init__(*args, **kwargs)
+        self._timings_file = os.environ.get("TMTESTNET_TIMINGS_FILE", None)
+        self._f = None
+        self._playbook = None
+        self._play = None
+        self._task_started = dict()
+        self._host_started = dict()
+
+    def v2_playbook_on_start(self, playbook):
+        self._playbook = os.path.basename(playbook._file_name)
+        if self._timings_file is not None:
+            self._f = open(self._timings_file, "wt")
+
+    def v2_playbook_on_play_start(self, play):
+        self._play = play.get_name()
+
+    def v2_playbook_on_task_start(self, task, is_conditional):
+        self._task_started[task._uuid] = time.time()
+
+    def v2_playbook_on_handler_task_start(self, task):
+        self._task_started[task._uuid] = time.time()
+
+    def v2_runner_on_start(self, host, task):
+        self._host_started[(host.get_name(), task._uuid)] = time.time()
+
+    def v2_runner_on_ok(self, result):
+        self._record(result, "ok" if not result._result.get("changed", False) else "changed")
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._record(result, "ignored" if ignore_errors else "failed")
+
+    def v2_runner_on_skipped(self, result):
+        self._record(result, "skipped")
+
+    def v2_runner_on_unreachable(self, result):
+        self._record(result, "unreachable")
+
+    def v2_playbook_on_stats(self, stats):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def _record(self, result, status):
+        if self._f is None:
+            return
+        end = time.time()
+        host = result._host.get_name()
+        task = result._task
+        start = self._host_started.pop((host, task._uuid), self._task_started.get(task._uuid, end))
+        self._f.write(json.dumps({
+            "playbook": self._playbook,
+            "play": self._play,
+            "host": host,
+            "task": task.get_name(),
+            "task_uuid": task._uuid,
+            "start": start,
+            "end": end,
+            "duration": end - start,
+            "status": status,
+        }) + "\n")
+        self._f.flush()
@@ -134,6 +134,13 @@ resource "aws_security_group" "tendermint_sg" {
         cidr_blocks = ["0.0.0.0/0"]
         description = "Tendermint Outage Simulator"
     }
+    ingress {
+        from_port   = 26690
+        to_port     = 26690
+        protocol    = "tcp"
+        self        = true
+        description = "Binary distribution between nodes in this group and region"
+    }
 
     egress {
         from_port   = 0
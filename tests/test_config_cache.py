@@ -0,0 +1,63 @@
+"""Node configuration cache tests: the cache, which holds the nodes' keys, is
+kept in the testnet's home directory rather than alongside custom
+configuration, and is reused while the nodes' files are unchanged."""
+
+import os
+import os.path
+import stat
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tmtestnet  # noqa: E402
+
+
+NODE_COUNT = 4
+
+
+@pytest.fixture
+def custom_config_root(tmp_path):
+    path = str(tmp_path / "custom")
+    tmtestnet.tendermint_generate_config(
+        path,
+        "validators",
+        None,
+        NODE_COUNT,
+        0,
+        ["node%d.example.com" % i for i in range(NODE_COUNT)],
+        False,
+    )
+    return path
+
+
+def test_cache_is_kept_out_of_custom_config_root(custom_config_root, tmp_path, monkeypatch):
+    cache_file = str(tmp_path / "home" / "testnet" / "tendermint" / "validators" / tmtestnet.NODES_CONFIG_CACHE_FILE)
+    before = set(os.listdir(custom_config_root))
+    nodes = tmtestnet.tendermint_load_nodes_config(custom_config_root, NODE_COUNT, cache_file=cache_file)
+    assert set(os.listdir(custom_config_root)) == before
+    assert os.path.isfile(cache_file)
+    assert stat.S_IMODE(os.stat(cache_file).st_mode) == 0o600
+
+    # unchanged nodes are loaded from the cache without parsing their files
+    def fail(_):
+        raise AssertionError("node configuration should have been cached")
+
+    monkeypatch.setattr(tmtestnet, "load_tendermint_node_config", fail)
+    assert tmtestnet.tendermint_load_nodes_config(custom_config_root, NODE_COUNT, cache_file=cache_file) == nodes
+
+
+def test_many_uncached_nodes_are_loaded_in_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(tmtestnet, "CONFIG_LOAD_THREAD_POOL_THRESHOLD", 2)
+    path = str(tmp_path / "config")
+    generated = tmtestnet.tendermint_generate_config(
+        path,
+        "validators",
+        None,
+        NODE_COUNT,
+        0,
+        ["node%d.example.com" % i for i in range(NODE_COUNT)],
+        False,
+    )
+    loaded = tmtestnet.tendermint_load_nodes_config(path, NODE_COUNT)
+    assert [node.peer_id for node in loaded] == [node.peer_id for node in generated]
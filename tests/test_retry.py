@@ -0,0 +1,71 @@
+"""Retry tests: SSH service changes are rerun against only the hosts on which
+they failed, backing off like Ansible playbook retries."""
+
+import os
+import os.path
+import sys
+from collections import OrderedDict
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tmtestnet  # noqa: E402
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(tmtestnet.time, "sleep", slept.append)
+    return slept
+
+
+def make_flaky_task(name, failures, calls):
+    """Returns a task that fails its first `failures` calls."""
+    def task():
+        calls.append(name)
+        if calls.count(name) <= failures:
+            raise Exception("connection reset")
+        return name
+    return task
+
+
+def test_only_failed_tasks_are_retried(sleeps):
+    calls = []
+    tasks = OrderedDict([
+        ("a", make_flaky_task("a", 0, calls)),
+        ("b", make_flaky_task("b", 2, calls)),
+        ("c", make_flaky_task("c", 1, calls)),
+    ])
+    results = tmtestnet.run_in_parallel(tasks, 2, "start Tendermint", retry_failed=3)
+    assert list(results.items()) == [("a", "a"), ("b", "b"), ("c", "c")]
+    assert sorted(calls) == ["a", "b", "b", "b", "c", "c"]
+    assert sleeps == [tmtestnet.RETRY_BACKOFF_INITIAL, tmtestnet.RETRY_BACKOFF_INITIAL * 2]
+
+
+def test_failures_are_reported_once_retries_run_out(sleeps):
+    calls = []
+    tasks = OrderedDict([
+        ("a", make_flaky_task("a", 0, calls)),
+        ("b", make_flaky_task("b", 5, calls)),
+    ])
+    with pytest.raises(Exception, match="stop Tendermint: b: connection reset"):
+        tmtestnet.run_in_parallel(tasks, 2, "stop Tendermint", retry_failed=1)
+    assert calls.count("b") == 2
+    assert len(sleeps) == 1
+
+
+def test_ssh_state_changer_retries_failed_hosts(sleeps, monkeypatch):
+    attempts = []
+
+    def run_command(cmd, echo=True):
+        hostname = cmd[-2].split("@")[1]
+        attempts.append(hostname)
+        ok = hostname != "host-b" or attempts.count(hostname) > 1
+        return tmtestnet.CommandResult(cmd, 0 if ok else 255, "" if ok else "Connection reset", 0.0)
+
+    monkeypatch.setattr(tmtestnet, "run_command", run_command)
+    host_refs = [tmtestnet.TestnetHostRef("validators", i, "host-%s" % c) for i, c in enumerate("abc")]
+    changer = tmtestnet.make_ssh_tendermint_state_changer(host_refs, "started", "key", "known_hosts", None, 4, retry_failed=2)
+    changer()
+    assert sorted(attempts) == ["host-a", "host-b", "host-b", "host-c"]
+    assert len(sleeps) == 1
@@ -0,0 +1,79 @@
+"""Rolling state change tests: a wave's nodes only have to commit blocks
+beyond the chain's height if the chain was already advancing before the
+wave."""
+
+import os
+import os.path
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tmtestnet  # noqa: E402
+
+
+@pytest.fixture
+def heights(monkeypatch):
+    """Makes tendermint_max_height return the given sequence of heights (the
+    last one repeatedly) without waiting between polls."""
+    sequence = []
+
+    def max_height(_):
+        return sequence.pop(0) if len(sequence) > 1 else sequence[0]
+
+    monkeypatch.setattr(tmtestnet, "tendermint_max_height", max_height)
+    monkeypatch.setattr(tmtestnet.time, "sleep", lambda _: None)
+    return sequence
+
+
+def test_gate_when_no_nodes_are_reachable(heights):
+    heights.extend([None])
+    assert tmtestnet.rolling_height_gate(["a", "b"], timeout=0.01) is None
+
+
+def test_gate_when_chain_is_stalled(heights):
+    # e.g. after starting the first wave of a stopped network: the nodes
+    # respond, but there isn't enough voting power to commit blocks
+    heights.extend([100])
+    assert tmtestnet.rolling_height_gate(["a", "b"], timeout=0.01) is None
+
+
+def test_gate_when_chain_is_advancing(heights):
+    heights.extend([100, 100, 101])
+    assert tmtestnet.rolling_height_gate(["a", "b"], timeout=5) == 101
+
+
+def test_rolling_start_of_stopped_network(monkeypatch, tmp_path):
+    cfg = tmtestnet.TestnetConfig(id="rolling-test", home=str(tmp_path))
+    host_refs = [tmtestnet.TestnetHostRef(group="validators", id=i, hostname="node%d" % i) for i in range(8)]
+    monkeypatch.setattr(tmtestnet, "node_to_host_refs", lambda *args, **kwargs: host_refs)
+    # the chain only advances once more than 2/3 of the nodes are up
+    started = []
+    height = [10]
+
+    def max_height(_):
+        if len(started) > 5:
+            height[0] += 1
+        return height[0]
+
+    monkeypatch.setattr(tmtestnet, "tendermint_max_height", max_height)
+    monkeypatch.setattr(tmtestnet.time, "sleep", lambda _: None)
+    monkeypatch.setattr(tmtestnet, "ROLLING_ADVANCE_TIMEOUT", 0.01)
+    gates = []
+    monkeypatch.setattr(
+        tmtestnet,
+        "wait_for_nodes_caught_up",
+        lambda hostnames, timeout, past_height=None: gates.append((hostnames, past_height)),
+    )
+    tmtestnet.run_in_waves(
+        cfg,
+        [tmtestnet.TestnetNodeRef(group="validators")],
+        lambda wave_refs, _: started.extend(wave_refs),
+        rolling=tmtestnet.RollingConfig(wave_size="2", wave_timeout=1),
+        wait_for=lambda _: True,
+    )
+    assert len(started) == 8
+    assert [len(hostnames) for hostnames, _ in gates] == [2, 2, 2, 2]
+    # the first three waves can't rely on the chain advancing, but the last
+    # one can
+    assert [past_height for _, past_height in gates] == [None, None, None, 12]
@@ -0,0 +1,173 @@
+"""Startup regression tests: quick commands shouldn't pay for the heavier
+dependencies, which tmtestnet.py only imports from the functions that need
+them, and should stay within the startup budgets measured for them."""
+
+import json
+import os
+import os.path
+import stat
+import subprocess
+import sys
+import time
+
+import pytest
+
+
+REPO_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be imported just to parse the command line, set up
+# logging and load the configuration.
+HEAVY_MODULES = ["colorlog", "requests", "toml", "pytz", "cryptography", "websocket"]
+
+# Median wall-clock time (in seconds, including interpreter startup) of each
+# invocation, measured over 9 runs on a development machine, which each run must
+# stay within STARTUP_BUDGET_MARGIN times of. The "--help" runs only parse the
+# command line, while "network info" and "network start" also load the
+# configuration and a deployed node group's outputs, and the latter changes a
+# node's state over (stub) SSH.
+MEASURED_STARTUP_TIMES = {
+    "--help": 0.11,
+    "network info": 0.12,
+    "network info (not deployed)": 0.11,
+    "network start": 0.13,
+}
+
+STARTUP_BUDGET_MARGIN = 5
+
+SUBCOMMANDS = [
+    [],
+    ["network"],
+    ["network", "deploy"],
+    ["network", "destroy"],
+    ["network", "start"],
+    ["network", "stop"],
+    ["network", "fetch_logs"],
+    ["network", "reset"],
+    ["network", "upgrade"],
+    ["network", "status"],
+    ["network", "watch"],
+    ["network", "timings"],
+    ["loadtest"],
+    ["loadtest", "start"],
+    ["loadtest", "stop"],
+]
+
+# Runs tmtestnet's main() with the given arguments, and then reports its exit
+# code and which of the heavy modules ended up being imported.
+DRIVER = """
+import json, sys
+sys.path.insert(0, %(repo_path)r)
+import tmtestnet
+sys.argv = ["tmtestnet.py"] + %(args)r
+exit_code = 0
+try:
+    tmtestnet.main()
+except SystemExit as e:
+    exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+print(json.dumps({
+    "exit_code": exit_code,
+    "imported": [m for m in %(heavy_modules)r if m in sys.modules],
+}))
+"""
+
+MINIMAL_CONFIG = """id: startup-test
+node_groups:
+  - validators:
+      regions:
+        - us_east_1: 4
+"""
+
+DEPLOYED_OUTPUT_VARS = """inventory_ordered:
+  - node0.example.com
+  - node1.example.com
+  - node2.example.com
+  - node3.example.com
+"""
+
+# Stands in for ssh, recording the host and command it was asked to run.
+STUB_SSH = """#!/bin/sh
+for arg in "$@"; do last2="$last"; last="$arg"; done
+echo "$last2 $last" >> "%(log)s"
+"""
+
+
+def run_driver(args, tmp_path, path=None):
+    env = dict(os.environ)
+    env["TMTESTNET_HOME"] = str(tmp_path / "home")
+    if path is not None:
+        env["PATH"] = path + os.pathsep + env.get("PATH", "")
+    started = time.time()
+    result = subprocess.run(
+        [sys.executable, "-c", DRIVER % {"repo_path": REPO_PATH, "args": args, "heavy_modules": HEAVY_MODULES}],
+        cwd=str(tmp_path),
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    elapsed = time.time() - started
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return report["exit_code"], report["imported"], elapsed, result
+
+
+def assert_within_budget(name, elapsed):
+    budget = MEASURED_STARTUP_TIMES[name] * STARTUP_BUDGET_MARGIN
+    assert elapsed < budget, "\"%s\" took %.2fs (budget: %.2fs)" % (name, elapsed, budget)
+
+
+@pytest.fixture
+def deployed(tmp_path):
+    """A stub deployment of MINIMAL_CONFIG: the validators' Terraform outputs,
+    an EC2 private key and an ssh executable that always succeeds."""
+    (tmp_path / "tmtestnet.yaml").write_text(MINIMAL_CONFIG)
+    group_path = tmp_path / "home" / "startup-test" / "tendermint" / "validators"
+    group_path.mkdir(parents=True)
+    (group_path / "output-vars.yaml").write_text(DEPLOYED_OUTPUT_VARS)
+    (tmp_path / "ec2-user.pem").write_text("")
+    bin_path = tmp_path / "bin"
+    bin_path.mkdir()
+    ssh = bin_path / "ssh"
+    ssh.write_text(STUB_SSH % {"log": str(tmp_path / "ssh.log")})
+    ssh.chmod(ssh.stat().st_mode | stat.S_IXUSR)
+    return tmp_path
+
+
+@pytest.mark.parametrize("subcommand", SUBCOMMANDS, ids=lambda s: " ".join(s) or "tmtestnet")
+def test_help_is_light(subcommand, tmp_path):
+    exit_code, imported, elapsed, _ = run_driver(subcommand + ["--help"], tmp_path)
+    assert exit_code == 0
+    assert imported == []
+    assert_within_budget("--help", elapsed)
+
+
+def test_network_info_before_deploying(tmp_path):
+    (tmp_path / "tmtestnet.yaml").write_text(MINIMAL_CONFIG)
+    # "network info" configures logging and loads the configuration, and then
+    # fails because the network hasn't been deployed
+    exit_code, imported, elapsed, _ = run_driver(["network", "info"], tmp_path)
+    assert exit_code == 1
+    assert imported == []
+    assert_within_budget("network info (not deployed)", elapsed)
+    # loading the configuration doesn't create the home directory
+    assert not (tmp_path / "home").exists()
+
+
+def test_network_info(deployed):
+    exit_code, imported, elapsed, result = run_driver(["network", "info"], deployed)
+    assert exit_code == 0, result.stderr
+    assert imported == []
+    assert_within_budget("network info", elapsed)
+    assert "validators[3] => node3.example.com" in result.stderr
+
+
+def test_network_start_node(deployed):
+    exit_code, imported, elapsed, result = run_driver(
+        ["--ec2-private-key", str(deployed / "ec2-user.pem"), "network", "start", "validators[1]"],
+        deployed,
+        path=str(deployed / "bin"),
+    )
+    assert exit_code == 0, result.stderr
+    assert imported == []
+    assert_within_budget("network start", elapsed)
+    assert (deployed / "ssh.log").read_text() == "ec2-user@node1.example.com sudo systemctl start tendermint\n"
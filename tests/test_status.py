@@ -0,0 +1,81 @@
+"""Status query tests: every node is queried at once, and a node whose RPC
+responses are malformed is reported with an error rather than failing the
+whole query."""
+
+import contextlib
+import os
+import os.path
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tmtestnet  # noqa: E402
+
+
+def status(height, catching_up=False):
+    return {"sync_info": {"latest_block_height": str(height), "catching_up": catching_up}}
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    """Makes RPC queries return (or raise) the response registered for each
+    (hostname, endpoint) pair, after RESPONSE_DELAY seconds."""
+    registered = dict()
+
+    def rpc_query(hostname, endpoint, session=None):
+        time.sleep(RESPONSE_DELAY)
+        response = registered[(hostname, endpoint)]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(tmtestnet, "tendermint_rpc_query", rpc_query)
+    monkeypatch.setattr(tmtestnet, "tendermint_rpc_session", lambda _: contextlib.nullcontext())
+    return registered
+
+
+RESPONSE_DELAY = 0.2
+
+
+def host_refs(count):
+    return [tmtestnet.TestnetHostRef("validators", i, "node%d" % i) for i in range(count)]
+
+
+def test_malformed_responses_are_reported_per_node(responses):
+    responses.update({
+        ("node0", "status"): status(10),
+        ("node0", "net_info"): {"n_peers": "3"},
+        ("node1", "status"): {"node_info": {}},
+        ("node1", "net_info"): {"n_peers": None},
+        ("node2", "status"): Exception("connection refused"),
+        ("node2", "net_info"): {"n_peers": "3"},
+        ("node3", "status"): status(8, catching_up=True),
+        ("node3", "net_info"): {"n_peers": "2"},
+    })
+    statuses = tmtestnet.tendermint_nodes_status(host_refs(4))
+    assert [(s.height, s.catching_up, s.peers, s.behind) for s in statuses] == [
+        (10, False, 3, 0),
+        (None, None, None, None),
+        (None, None, 3, None),
+        (8, True, 2, 2),
+    ]
+    assert statuses[0].error is None
+    assert statuses[1].error.startswith("status: malformed response (KeyError")
+    assert "net_info: malformed response (TypeError" in statuses[1].error
+    assert statuses[2].error == "status: connection refused"
+    assert tmtestnet.tendermint_max_height(["node0", "node1", "node3"]) == 10
+
+
+def test_all_nodes_are_queried_at_once(responses):
+    count = 200
+    for i in range(count):
+        responses[("node%d" % i, "status")] = status(i)
+        responses[("node%d" % i, "net_info")] = {"n_peers": "1"}
+    started = time.monotonic()
+    statuses = tmtestnet.tendermint_nodes_status(host_refs(count))
+    elapsed = time.monotonic() - started
+    assert [s.height for s in statuses] == list(range(count))
+    # with a bounded pool, this would take a multiple of the response delay
+    assert elapsed < RESPONSE_DELAY * 3
@@ -0,0 +1,74 @@
+"""Peer topology tests: topologies must stay within their degree bound, and
+must be connected given the links that actually end up in the node group's
+configuration."""
+
+import os
+import os.path
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tmtestnet  # noqa: E402
+
+
+CONFIG_TEMPLATE = """id: topology-test
+node_groups:
+  - validators:
+      regions:
+        - us_east_1: 34
+        - us_west_1: 33
+        - eu_west_1: 34
+      persistent_peers:
+        - validators
+  - full:
+      validators: no
+      regions:
+        - us_east_1: 3
+        - eu_west_1: 4
+      persistent_peers:
+        - full
+        - validators
+      topology:
+        type: %(type)s
+        degree: %(degree)d
+        seed: %(seed)d
+"""
+
+
+def load_config(tmp_path, topology_type, degree, seed):
+    config_file = tmp_path / "tmtestnet.yaml"
+    config_file.write_text(CONFIG_TEMPLATE % {"type": topology_type, "degree": degree, "seed": seed})
+    return tmtestnet.load_testnet_config(str(config_file))
+
+
+@pytest.mark.parametrize("topology_type,degree", [
+    ("random-regular", 3),
+    ("ring-chords", 3),
+    ("region-clusters", 4),
+])
+@pytest.mark.parametrize("seed", range(5))
+def test_topology_peering_into_larger_group(tmp_path, topology_type, degree, seed):
+    cfg = load_config(tmp_path, topology_type, degree, seed)
+    nodes, adjacency = tmtestnet.generate_topology(cfg, "full")
+    own_node_count = tmtestnet.node_group_node_count(cfg.node_groups["full"])
+    # only links touching the group's own nodes are realized
+    for i, neighbours in enumerate(adjacency):
+        for j in neighbours:
+            assert i < own_node_count or j < own_node_count
+            assert i in adjacency[j]
+    # no node gets more than the requested number of peers
+    assert max([len(neighbours) for neighbours in adjacency]) <= degree
+    links, paths = tmtestnet.configured_topology(nodes, adjacency, own_node_count)
+    assert tmtestnet.topology_is_connected(paths)
+    stats = tmtestnet.node_group_topology_stats(cfg, "full", nodes, adjacency)
+    assert stats["max_degree"] <= degree
+    assert stats["diameter"] > 0
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_region_clusters_degree_bound(seed):
+    regions = ["us_east_1"] * 20 + ["us_west_1"] * 15 + ["eu_west_1"] * 12 + ["ap_northeast_2"] * 3
+    adjacency = tmtestnet.region_clusters_topology(regions, 4, 2, tmtestnet.random.Random(seed))
+    assert max([len(neighbours) for neighbours in adjacency]) <= 4
+    assert tmtestnet.topology_is_connected(adjacency)
@@ -0,0 +1,64 @@
+"""Watch tests: duplicate blocks from different nodes aren't queued, the queue
+is bounded, and alert commands don't hold up the watch loop."""
+
+import logging
+import os
+import os.path
+import queue
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tmtestnet  # noqa: E402
+
+
+def block(height):
+    return tmtestnet.BlockSample(height=height, time=float(height), txs=0)
+
+
+def queued(blocks):
+    result = []
+    while not blocks.empty():
+        result.append(blocks.get_nowait().height)
+    return result
+
+
+def test_duplicate_blocks_are_not_queued():
+    blocks = queue.Queue(maxsize=10)
+    publish = tmtestnet.make_block_publisher(blocks)
+    # the same blocks arrive from three nodes, one of which lags behind
+    for height in [1, 1, 2, 1, 2, 3, 3, 2]:
+        publish(block(height))
+    assert queued(blocks) == [1, 2, 3]
+
+
+def test_blocks_are_dropped_when_the_queue_is_full(caplog):
+    blocks = queue.Queue(maxsize=2)
+    publish = tmtestnet.make_block_publisher(blocks)
+    with caplog.at_level(logging.WARNING):
+        for height in range(1, 5):
+            publish(block(height))
+    assert queued(blocks) == [1, 2]
+    assert "Dropped block 4" in caplog.text
+    # once there's room again, newer blocks are queued
+    publish(block(5))
+    assert queued(blocks) == [5]
+
+
+def test_alert_runs_in_background_with_timeout(monkeypatch, tmp_path, caplog):
+    monkeypatch.setattr(tmtestnet, "WATCH_ALERT_TIMEOUT", 0.5)
+    out = tmp_path / "alert"
+    watch = tmtestnet.WatchConfig(alert_cmd="echo $TMTESTNET_ALERT $TMTESTNET_HEIGHT > %s; sleep 10" % out)
+    started = time.monotonic()
+    with caplog.at_level(logging.WARNING):
+        thread = tmtestnet.alert_tendermint_watch(watch, "stalled", 42)
+        assert time.monotonic() - started < 0.5
+        thread.join(5)
+    assert not thread.is_alive()
+    assert time.monotonic() - started < 5
+    assert out.read_text() == "stalled 42\n"
+    assert "Alert command timed out" in caplog.text
+
+
+def test_no_alert_command():
+    assert tmtestnet.alert_tendermint_watch(tmtestnet.WatchConfig(), "stalled", 1) is None
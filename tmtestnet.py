@@ -15,22 +15,30 @@ import subprocess
 import shlex
 import time
 import hashlib
+import hmac
 from typing import OrderedDict as OrderedDictType, List, Dict, Set
-from collections import namedtuple, OrderedDict
+from collections import namedtuple, OrderedDict, deque
 from copy import copy, deepcopy
-import zipfile
 import shutil
 import pwd
 import json
 import datetime
 import base64
 import tempfile
+import threading
+import queue
+import io
+import random
+import statistics
+import math
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 import yaml
-import colorlog
-import requests
-import toml
-import pytz
+
+# NOTE: Heavier dependencies (colorlog, requests, websocket, toml, pytz and
+# zipfile) are imported by the functions that need them, so as to keep startup
+# times low for commands that don't (colorlog is only needed when logging to a
+# terminal). See tests/test_startup.py.
 
 
 # The default logger is pretty plain and boring
@@ -65,6 +73,12 @@ def main():
         default=False,
         help="Causes the script to fail entirely if an environment variable used in the config file is not set (default behaviour will just insert an empty value)",
     )
+    parser.add_argument(
+        "--terraform-driver",
+        choices=TERRAFORM_DRIVERS,
+        default=DEFAULT_TERRAFORM_DRIVER,
+        help="How to execute Terraform: through the ansible-terraform.yaml playbook (\"ansible\"), or by calling Terraform directly (\"native\") (default: %s)" % DEFAULT_TERRAFORM_DRIVER,
+    )
     parser.add_argument(
         "-v", "--verbose",
         action="store_true",
@@ -98,6 +112,33 @@ def main():
         action="store_true",
         help="If this flag is specified and configuration is already present for a particular node group, it will not be overwritten/regenerated",
     )
+    parser_network_deploy.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Execute deployment tasks concurrently (each group's Terraform/Ansible output is written to log files in its working directory)",
+    )
+    parser_network_deploy.add_argument(
+        "--max-workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="The maximum number of tasks to execute concurrently when --parallel is specified (default: %d)" % DEFAULT_MAX_WORKERS,
+    )
+    parser_network_deploy.add_argument(
+        "--force-terraform",
+        action="store_true",
+        help="Run Terraform for all node groups, even those whose Terraform inputs have not changed since they were last deployed",
+    )
+    parser_network_deploy.add_argument(
+        "--binary-distribution",
+        choices=BINARY_DISTRIBUTION_MODES,
+        default=DEFAULT_BINARY_DISTRIBUTION,
+        help="How to distribute Tendermint binaries: from this machine to every host (\"direct\"), or from this machine to one host per node group and region, which then serves the binary to the other hosts in its region (\"regional\") (default: %s)" % DEFAULT_BINARY_DISTRIBUTION,
+    )
+    parser_network_deploy.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume a previously failed deployment, only executing the steps that failed or whose inputs have changed since",
+    )
 
     # network destroy
     parser_network_destroy = subparsers_network.add_parser(
@@ -127,6 +168,12 @@ def main():
         action="store_true",
         help="By default, this command fails if a group/node reference has not yet been deployed. Specifying this flag will just skip that group/node instead.",
     )
+    parser_network_start.add_argument(
+        "--ssh-parallelism",
+        type=int,
+        default=DEFAULT_SSH_PARALLELISM,
+        help="The maximum number of hosts whose Tendermint service state to change at the same time (default: %d)" % DEFAULT_SSH_PARALLELISM,
+    )
 
     # network stop
     parser_network_stop = subparsers_network.add_parser(
@@ -145,6 +192,12 @@ def main():
         action="store_true",
         help="By default, this command fails if a group/node reference has not yet been deployed. Specifying this flag will just skip that group/node instead.",
     )
+    parser_network_stop.add_argument(
+        "--ssh-parallelism",
+        type=int,
+        default=DEFAULT_SSH_PARALLELISM,
+        help="The maximum number of hosts whose Tendermint service state to change at the same time (default: %d)" % DEFAULT_SSH_PARALLELISM,
+    )
 
     # network fetch_logs
     parser_network_fetch_logs = subparsers_network.add_parser(
@@ -175,6 +228,88 @@ def main():
         action="store_true",
         help="If set, the network reset operation will truncate the Tendermint logs prior to starting Tendermint",
     )
+    parser_network_reset.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Generate and deploy node groups' configuration concurrently",
+    )
+    parser_network_reset.add_argument(
+        "--max-workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="The maximum number of tasks to execute concurrently when --parallel is specified (default: %d)" % DEFAULT_MAX_WORKERS,
+    )
+    parser_network_reset.add_argument(
+        "--binary-distribution",
+        choices=BINARY_DISTRIBUTION_MODES,
+        default=DEFAULT_BINARY_DISTRIBUTION,
+        help="How to distribute Tendermint binaries (see \"network deploy --help\") (default: %s)" % DEFAULT_BINARY_DISTRIBUTION,
+    )
+
+    # network upgrade
+    parser_network_upgrade = subparsers_network.add_parser(
+        "upgrade",
+        help="Install node groups' configured Tendermint binaries on one or more node(s) or node group(s) and restart them, keeping their configuration and data",
+    )
+    parser_network_upgrade.add_argument(
+        "node_or_group_ids",
+        metavar="node_or_group_id",
+        nargs="*",
+        help="Zero or more node or group IDs of network node(s) to upgrade. If this is not supplied, all nodes will be upgraded."
+    )
+    parser_network_upgrade.add_argument(
+        "--no-fail-on-missing",
+        default=False,
+        action="store_true",
+        help="By default, this command fails if a group/node reference has not yet been deployed. Specifying this flag will just skip that group/node instead.",
+    )
+    parser_network_upgrade.add_argument(
+        "--binary-distribution",
+        choices=BINARY_DISTRIBUTION_MODES,
+        default=DEFAULT_BINARY_DISTRIBUTION,
+        help="How to distribute Tendermint binaries (see \"network deploy --help\") (default: %s)" % DEFAULT_BINARY_DISTRIBUTION,
+    )
+
+    for parser_retrying in [
+        parser_network_deploy,
+        parser_network_start,
+        parser_network_stop,
+        parser_network_fetch_logs,
+        parser_network_reset,
+        parser_network_upgrade,
+    ]:
+        parser_retrying.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="If an Ansible playbook fails on some hosts, automatically rerun it (with the same variables) against only the hosts that failed",
+        )
+        parser_retrying.add_argument(
+            "--max-retries",
+            type=int,
+            default=DEFAULT_MAX_RETRIES,
+            help="The maximum number of times to rerun a playbook against its failed hosts when --retry-failed is specified (default: %d)" % DEFAULT_MAX_RETRIES,
+        )
+
+    # a reset creates a new chain (new genesis, and wiped data), so it can't be
+    # rolled out to some nodes while the rest stay on the old chain (upgrades
+    # keep nodes' configuration and data, though)
+    for parser_rolling in [parser_network_start, parser_network_stop, parser_network_upgrade]:
+        parser_rolling.add_argument(
+            "--rolling",
+            action="store_true",
+            help="Change nodes' state in waves, waiting for each wave's (started) nodes to catch up before continuing",
+        )
+        parser_rolling.add_argument(
+            "--wave-size",
+            default=DEFAULT_WAVE_SIZE,
+            help="The number (e.g. 5) or percentage (e.g. 10%%%%) of target nodes in each wave when --rolling is specified (default: %s)" % DEFAULT_WAVE_SIZE.replace("%", "%%"),
+        )
+        parser_rolling.add_argument(
+            "--wave-timeout",
+            type=int,
+            default=DEFAULT_WAVE_TIMEOUT,
+            help="How long to wait (in seconds) for each wave's nodes to catch up when --rolling is specified (default: %d)" % DEFAULT_WAVE_TIMEOUT,
+        )
 
     # network info
     subparsers_network.add_parser(
@@ -182,6 +317,78 @@ def main():
         help="Show information about a deployed network (e.g. hostnames and node IDs)",
     )
 
+    # network status
+    parser_network_status = subparsers_network.add_parser(
+        "status",
+        help="Query every node's RPC endpoint and show its height, sync status and peer count",
+    )
+    parser_network_status.add_argument(
+        "--format",
+        dest="output_format",
+        choices=STATUS_OUTPUT_FORMATS,
+        default=DEFAULT_STATUS_OUTPUT_FORMAT,
+        help="How to output the nodes' status (default: %s)" % DEFAULT_STATUS_OUTPUT_FORMAT,
+    )
+
+    # network watch
+    parser_network_watch = subparsers_network.add_parser(
+        "watch",
+        help="Monitor block times and TPS live, and alert when the chain stalls",
+    )
+    parser_network_watch.add_argument(
+        "node_or_group_ids",
+        metavar="node_or_group_id",
+        nargs="*",
+        help="Zero or more node or group IDs of network node(s) to subscribe to. If this is not supplied, the first node of each group will be used."
+    )
+    parser_network_watch.add_argument(
+        "--window",
+        type=int,
+        default=DEFAULT_WATCH_WINDOW,
+        help="The number of most recent blocks over which to compute statistics (default: %d)" % DEFAULT_WATCH_WINDOW,
+    )
+    parser_network_watch.add_argument(
+        "--report-interval",
+        type=int,
+        default=DEFAULT_WATCH_REPORT_INTERVAL,
+        help="How often (in seconds) to report statistics (default: %d)" % DEFAULT_WATCH_REPORT_INTERVAL,
+    )
+    parser_network_watch.add_argument(
+        "--stall-threshold",
+        type=int,
+        default=DEFAULT_WATCH_STALL_THRESHOLD,
+        help="Raise an alert if no new block arrives within this many seconds (default: %d)" % DEFAULT_WATCH_STALL_THRESHOLD,
+    )
+    parser_network_watch.add_argument(
+        "--alert-cmd",
+        default=None,
+        help="A shell command to execute when the chain stalls or recovers (TMTESTNET_ALERT is set to \"stalled\" or \"recovered\", and TMTESTNET_HEIGHT to the last height seen)",
+    )
+    parser_network_watch.add_argument(
+        "--duration",
+        type=int,
+        default=0,
+        help="Stop watching after this many seconds (default: watch until interrupted)",
+    )
+
+    # network timings
+    parser_network_timings = subparsers_network.add_parser(
+        "timings",
+        help="Show the slowest hosts and tasks of the most recent Ansible playbook runs",
+    )
+    parser_network_timings.add_argument(
+        "--top",
+        type=int,
+        default=DEFAULT_TIMINGS_TOP,
+        help="How many of the slowest hosts and tasks to show for each playbook run (default: %d)" % DEFAULT_TIMINGS_TOP,
+    )
+
+    # network topology
+    subparsers_network.add_parser(
+        "topology",
+        help="Show degree and diameter statistics for each node group's peer topology",
+    )
+
     # loadtest
     parser_loadtest = subparsers.add_parser(
         "loadtest", 
@@ -219,10 +426,9 @@ def main():
     args = parser.parse_args()
 
     configure_logging(verbose=args.verbose)
-    # Allow for interpolation of environment variables within YAML files
-    configure_env_var_yaml_loading(fail_on_missing=args.fail_on_missing_envvars)
 
     kwargs = {
+        "fail_on_missing_envvars": args.fail_on_missing_envvars,
         "aws_keypair_name": os.environ.get("AWS_KEYPAIR_NAME", getattr(args, "aws_keypair_name", default_aws_keypair_name)),
         "ec2_private_key_path": os.environ.get("EC2_PRIVATE_KEY", getattr(args, "ec2_private_key", default_ec2_private_key)),
         "keep_existing_tendermint_config": getattr(args, "keep_existing_tendermint_config", False),
@@ -232,6 +438,27 @@ def main():
         "load_test_id": getattr(args, "load_test_id", None),
         "keep_monitoring": getattr(args, "keep_monitoring", False),
         "truncate_logs": getattr(args, "truncate_logs", False),
+        "parallel": getattr(args, "parallel", False),
+        "max_workers": getattr(args, "max_workers", DEFAULT_MAX_WORKERS),
+        "force_terraform": getattr(args, "force_terraform", False),
+        "resume": getattr(args, "resume", False),
+        "terraform_driver": getattr(args, "terraform_driver", DEFAULT_TERRAFORM_DRIVER),
+        "binary_distribution": getattr(args, "binary_distribution", DEFAULT_BINARY_DISTRIBUTION),
+        "ssh_parallelism": getattr(args, "ssh_parallelism", DEFAULT_SSH_PARALLELISM),
+        "output_format": getattr(args, "output_format", DEFAULT_STATUS_OUTPUT_FORMAT),
+        "top": getattr(args, "top", DEFAULT_TIMINGS_TOP),
+        "retry_failed": args.max_retries if getattr(args, "retry_failed", False) else 0,
+        "watch": WatchConfig(
+            window=args.window,
+            report_interval=args.report_interval,
+            stall_threshold=args.stall_threshold,
+            alert_cmd=args.alert_cmd,
+            duration=args.duration,
+        ) if getattr(args, "subcommand", None) == "watch" else None,
+        "rolling": RollingConfig(
+            wave_size=args.wave_size,
+            wave_timeout=args.wave_timeout,
+        ) if getattr(args, "rolling", False) else None,
     }
     sys.exit(tmtestnet(args.config, args.command, args.subcommand, **kwargs))
 
@@ -340,6 +567,201 @@ TMBENCH_OUTPUT_VARS_TEMPLATE = """hosts:
 TMTESTNET_HOME = os.environ.get("TMTESTNET_HOME", "~/.tmtestnet")
 
 
+# The default size of worker pools for operations that can run concurrently
+DEFAULT_MAX_WORKERS = 4
+
+
+# Serializes modifications to the local known_hosts file when multiple node
+# groups are being provisioned at the same time
+KNOWN_HOSTS_LOCK = threading.Lock()
+
+
+# The supported ways of executing Terraform
+TERRAFORM_DRIVERS = ["ansible", "native"]
+DEFAULT_TERRAFORM_DRIVER = "ansible"
+
+
+# Serializes Terraform operations that modify a Terraform project's local
+# working directory (initialization and workspace creation)
+TERRAFORM_PROJECT_LOCK = threading.RLock()
+
+
+# Terraform providers are downloaded once per machine into a shared plugin
+# cache (unless TF_PLUGIN_CACHE_DIR is already set), and a project is only
+# (re-)initialized when its provider/module requirements or dependency lock
+# file change, as recorded in TERRAFORM_INIT_FINGERPRINT in the project's
+# .terraform directory. The time each skipped initialization would have taken
+# (as of the last one) is tallied in TERRAFORM_INIT_SECONDS_SAVED.
+TERRAFORM_PLUGIN_CACHE_DIR = os.environ.get(
+    "TF_PLUGIN_CACHE_DIR",
+    os.path.join(os.path.expanduser(TMTESTNET_HOME), "terraform-plugin-cache"),
+)
+TERRAFORM_INIT_FINGERPRINT = "tmtestnet-init.yaml"
+TERRAFORM_INIT_SECONDS_SAVED = []
+
+
+# The Tendermint configuration template to use for node groups that don't
+# specify their own
+DEFAULT_TENDERMINT_CONFIG_TEMPLATE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "tendermint",
+    "default-tendermint-config.toml",
+)
+
+
+# The `tendermint testnet` command always overrides these P2P settings in the
+# configuration it generates (whatever the template), since testnet nodes
+# often have non-routable addresses or share IP addresses
+TENDERMINT_TESTNET_P2P_CONFIG = {
+    "addr_book_strict": False,
+    "allow_duplicate_ip": True,
+}
+
+
+# Placeholders rendered into a node group's Tendermint configuration template
+# and substituted with each node's own values when finalizing its configuration
+CONFIG_PLACEHOLDERS = {
+    "moniker": "__tmtestnet_moniker__",
+    "persistent_peers": "__tmtestnet_persistent_peers__",
+    "seeds": "__tmtestnet_seeds__",
+}
+
+# The number of threads to use when writing out nodes' finalized configuration
+CONFIG_WRITE_WORKERS = 8
+# The gzip compression level for node configuration archives. In a full mesh,
+# every node's configuration includes the whole peer list, and compressing it
+# at the highest level costs several times as much as at the lowest for only
+# marginally smaller archives.
+CONFIG_ARCHIVE_COMPRESSION_LEVEL = 1
+
+
+# The bounded-degree peer topologies that node groups can use instead of the
+# default full mesh of persistent peers
+TOPOLOGY_TYPES = ["random-regular", "ring-chords", "region-clusters"]
+# How many times to attempt to generate a random regular topology (or a topology
+# that remains connected once links between other groups' nodes are dropped),
+# and how many random candidates to try when looking for a node's next peer
+TOPOLOGY_ATTEMPTS = 100
+TOPOLOGY_PEER_CANDIDATES = 100
+# Topology diameters are computed exactly for topologies with up to this many
+# nodes, and estimated from this many randomly sampled nodes otherwise
+TOPOLOGY_DIAMETER_SAMPLES = 128
+
+
+# How Tendermint binaries are distributed to hosts: directly from this machine
+# to every host, or from this machine to one seed host per node group and
+# region, which then serves it to the other hosts in its region on
+# BINARY_DISTRIBUTION_PORT (for up to BINARY_DISTRIBUTION_TIMEOUT seconds)
+BINARY_DISTRIBUTION_MODES = ["direct", "regional"]
+DEFAULT_BINARY_DISTRIBUTION = "direct"
+BINARY_DISTRIBUTION_PORT = 26690
+BINARY_DISTRIBUTION_TIMEOUT = 600
+
+
+# Parameters for running commands on hosts over SSH directly. Connections to
+# each host are multiplexed over a master connection that's kept open for
+# SSH_CONTROL_PERSIST seconds after it was last used.
+DEFAULT_SSH_PARALLELISM = 32
+SSH_CONNECT_TIMEOUT = 10
+SSH_CONTROL_PERSIST = 60
+
+
+# Tendermint's RPC port, on which nodes' status is queried. Requests time out
+# after RPC_CONNECT_TIMEOUT seconds if a connection can't be established, and
+# after RPC_REQUEST_TIMEOUT seconds if the node doesn't respond.
+TENDERMINT_RPC_PORT = 26657
+RPC_CONNECT_TIMEOUT = 2
+RPC_REQUEST_TIMEOUT = 5
+
+
+# `network status` queries the RPC endpoints of all of the nodes at once (one
+# thread per query), so that it takes about as long as the slowest query,
+# however large the network
+STATUS_OUTPUT_FORMATS = ["table", "json"]
+DEFAULT_STATUS_OUTPUT_FORMAT = "table"
+
+
+# `network watch` subscribes to NewBlock events on the chosen nodes (by
+# default, the first node of each node group), keeping the last
+# DEFAULT_WATCH_WINDOW blocks to compute rolling statistics (reported every
+# DEFAULT_WATCH_REPORT_INTERVAL seconds). If no block arrives within
+# DEFAULT_WATCH_STALL_THRESHOLD seconds, a stall alert is raised (and the
+# alert command, if any, is run in the background for up to
+# WATCH_ALERT_TIMEOUT seconds). Dropped subscriptions are retried every
+# WATCH_RECONNECT_INTERVAL seconds. Only blocks beyond the highest one seen
+# from any node are queued for processing, in a queue of at most
+# WATCH_QUEUE_SIZE blocks.
+DEFAULT_WATCH_WINDOW = 100
+DEFAULT_WATCH_REPORT_INTERVAL = 10
+DEFAULT_WATCH_STALL_THRESHOLD = 30
+WATCH_RECONNECT_INTERVAL = 5
+WATCH_ALERT_TIMEOUT = 30
+WATCH_QUEUE_SIZE = 1000
+WATCH_PERCENTILES = [50, 90, 99]
+
+
+# Ansible playbook runs record each task's start and end time on each host (by
+# way of the callback plugin in ANSIBLE_CALLBACK_PLUGINS_PATH) into the
+# testnet's "timings" directory. `network timings` flags hosts and tasks that
+# took more than TIMINGS_OUTLIER_FACTOR times the median, and at least
+# TIMINGS_OUTLIER_MIN_SECONDS longer than it.
+ANSIBLE_CALLBACK_PLUGINS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "callback_plugins",
+)
+ANSIBLE_TIMINGS_CALLBACK = "tmtestnet_timings"
+
+
+# Playbook runs that fail on some hosts can be rerun against only the failed
+# hosts (as recorded in Ansible's retry files), up to DEFAULT_MAX_RETRIES times
+# by default. The first retry waits RETRY_BACKOFF_INITIAL seconds, and each
+# subsequent retry waits twice as long as the last (up to RETRY_BACKOFF_MAX).
+DEFAULT_MAX_RETRIES = 3
+RETRY_BACKOFF_INITIAL = 5
+RETRY_BACKOFF_MAX = 60
+DEFAULT_TIMINGS_TOP = 10
+TIMINGS_OUTLIER_FACTOR = 2.0
+TIMINGS_OUTLIER_MIN_SECONDS = 5
+
+
+# Rolling state changes process target nodes in waves (of a number or
+# percentage of nodes), waiting up to DEFAULT_WAVE_TIMEOUT seconds after each
+# wave for its nodes to catch up, checking every ROLLING_POLL_INTERVAL seconds.
+# If the chain's height increases within ROLLING_ADVANCE_TIMEOUT seconds before
+# a wave, the wave's nodes must also commit blocks beyond it.
+DEFAULT_WAVE_SIZE = "25%"
+DEFAULT_WAVE_TIMEOUT = 300
+ROLLING_POLL_INTERVAL = 2
+ROLLING_ADVANCE_TIMEOUT = 10
+
+
+# Node configuration (including the nodes' keys) is cached in this file in each
+# node group's directory in the testnet's home directory - never in a custom
+# configuration root - keyed by the modification time and size of each node's
+# files.
+# Loading more than CONFIG_LOAD_THREAD_POOL_THRESHOLD uncached nodes is spread
+# across CONFIG_LOAD_WORKERS threads, which overlap the reading of the nodes'
+# files. (A process pool would have to fork the possibly multi-threaded tool,
+# risking deadlocks, or spawn fresh interpreters, whose startup costs more than
+# parsing a few hundred nodes' files.)
+NODES_CONFIG_CACHE_FILE = "nodes-config-cache.json"
+CONFIG_LOAD_THREAD_POOL_THRESHOLD = 64
+CONFIG_LOAD_WORKERS = 8
+
+
+# How much of a subprocess' output to read at a time
+COMMAND_OUTPUT_CHUNK_SIZE = 64 * 1024
+
+
+# Parameters for scanning hosts' SSH keys. Failed scans are retried with
+# exponential backoff, starting at KEYSCAN_RETRY_WAIT seconds.
+KEYSCAN_BATCH_SIZE = 25
+KEYSCAN_TIMEOUT = 5
+KEYSCAN_RETRIES = 10
+KEYSCAN_RETRY_WAIT = 1
+KEYSCAN_MAX_RETRY_WAIT = 30
+
+
 # -----------------------------------------------------------------------------
 #
 #   Core functionality
@@ -353,7 +775,7 @@ def tmtestnet(cfg_file, command, subcommand, **kwargs) -> int:
     from execution."""
 
     try:
-        cfg = load_testnet_config(cfg_file)
+        cfg = load_testnet_config(cfg_file, fail_on_missing_envvars=kwargs.get("fail_on_missing_envvars", False))
     except Exception as e:
         logger.error("Failed to load configuration from file: %s", cfg_file)
         logger.exception(e)
@@ -374,8 +796,18 @@ def tmtestnet(cfg_file, command, subcommand, **kwargs) -> int:
             fn = network_fetch_logs
         elif subcommand == "reset":
             fn = network_reset
+        elif subcommand == "upgrade":
+            fn = network_upgrade
         elif subcommand == "info":
             fn = network_info
+        elif subcommand == "status":
+            fn = network_status
+        elif subcommand == "watch":
+            fn = network_watch
+        elif subcommand == "timings":
+            fn = network_timings
+        elif subcommand == "topology":
+            fn = network_topology
     elif command == "loadtest":
         if subcommand == "start":
             fn = loadtest_start
@@ -403,72 +835,132 @@ def network_deploy(
     aws_keypair_name: str = None,
     ec2_private_key_path: str = None,
     keep_existing_tendermint_config: bool = False,
+    parallel: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    force_terraform: bool = False,
+    resume: bool = False,
+    terraform_driver: str = DEFAULT_TERRAFORM_DRIVER,
     **kwargs,
 ):
-    """Deploys the network according to the given configuration."""
+    """Deploys the network according to the given configuration. The
+    deployment is executed as a pipeline of tasks (see tendermint_pipeline_tasks).
+    If `parallel` is set, up to `max_workers` of these tasks are executed
+    concurrently as soon as their dependencies are satisfied. Monitoring is
+    always deployed before the node groups, because the node groups need its
+    InfluxDB URL. Node groups whose Terraform inputs
+    have not changed since they were last deployed are skipped, unless
+    `force_terraform` is set.
+
+    The outcome of each deployment task is recorded in a journal in the
+    testnet's home directory. If `resume` is set, tasks that completed
+    successfully during the previous deployment, and whose inputs have not
+    changed since, are not executed again."""
     if not aws_keypair_name:
         raise Exception("Missing AWS keypair name")
     if not os.path.exists(ec2_private_key_path):
         raise Exception("Cannot find EC2 private key: %s" % ec2_private_key_path)
 
     testnet_home = os.path.join(cfg.home, cfg.id)
+    tasks = []
 
     # next up, optionally deploy monitoring
-    influxdb_url = cfg.monitoring.influxdb.url
-    monitoring_outputs = None
+    provision_deps = []
     if cfg.monitoring.influxdb.enabled and cfg.monitoring.influxdb.deploy:
-        monitoring_outputs = terraform_deploy_monitoring(
-            os.path.join(testnet_home, "monitoring"),
-            aws_keypair_name,
-            cfg.id,
-            cfg.monitoring.influxdb.password,
-            cfg.monitoring.influxdb.instance_type,
-            cfg.monitoring.influxdb.volume_size,
-        )
-        influxdb_url = monitoring_outputs["influxdb_url"]
-    
-    # deploy the Tendermint nodes
-    tendermint_outputs = OrderedDict()
+        tasks.append(PipelineTask(
+            name="monitoring",
+            fn=make_monitoring_deployer(
+                os.path.join(testnet_home, "monitoring"),
+                aws_keypair_name,
+                cfg,
+                terraform_driver=terraform_driver,
+            ),
+            inputs=(aws_keypair_name, cfg.id, cfg.monitoring.influxdb),
+            restore=make_yaml_config_loader(os.path.join(testnet_home, "monitoring", "terraform-output-vars.yaml")),
+        ))
+        provision_deps = ["monitoring"]
+
+    # provision the Tendermint nodes
     for name, node_group_cfg in cfg.node_groups.items():
-        tendermint_outputs[name] = terraform_deploy_tendermint_node_group(
-            os.path.join(testnet_home, "tendermint", name),
-            aws_keypair_name,
-            cfg.id,
-            name,
-            influxdb_url,
-            cfg.monitoring.influxdb.password,
-            node_group_cfg.instance_type,
-            node_group_cfg.volume_size,
-            node_group_cfg.regions,
-        )
+        tasks.append(PipelineTask(
+            name="provision:%s" % name,
+            fn=make_node_group_deployer(
+                os.path.join(testnet_home, "tendermint", name),
+                aws_keypair_name,
+                cfg,
+                name,
+                node_group_cfg,
+                log_output=parallel,
+                force=force_terraform,
+                terraform_driver=terraform_driver,
+            ),
+            deps=provision_deps,
+            inputs=(
+                aws_keypair_name,
+                cfg.id,
+                name,
+                cfg.monitoring.influxdb,
+                node_group_cfg.instance_type,
+                node_group_cfg.volume_size,
+                node_group_cfg.regions,
+            ),
+            restore=make_node_group_outputs_loader(os.path.join(testnet_home, "tendermint", name, "output-vars.yaml")),
+        ))
 
-    # reuse the network_reset functionality
-    network_reset(
-        cfg, 
-        ec2_private_key_path=ec2_private_key_path,
+    # then generate and deploy the Tendermint configuration
+    tasks.extend(tendermint_pipeline_tasks(
+        cfg,
+        ec2_private_key_path,
         keep_existing_tendermint_config=keep_existing_tendermint_config,
+        parallel=parallel,
         **kwargs,
+    ))
+    logger.info("Deploying network with up to %d concurrent task(s)", max_workers if parallel else 1)
+    ensure_path_exists(testnet_home)
+    results = run_pipeline(
+        tasks,
+        max_workers if parallel else 1,
+        journal_file=os.path.join(testnet_home, "deploy-journal.yaml"),
+        resume=resume,
     )
+
+    skipped = [name for name, _ in cfg.node_groups.items() if results["provision:%s" % name].skipped]
+    if len(skipped) > 0:
+        logger.info("Skipped Terraform for unchanged node group(s): %s", ", ".join(skipped))
+    log_terraform_init_savings()
     network_info(cfg)
 
 
-def network_destroy(cfg: "TestnetConfig", keep_monitoring: bool = False, **kwargs):
+def network_destroy(
+    cfg: "TestnetConfig",
+    keep_monitoring: bool = False,
+    terraform_driver: str = DEFAULT_TERRAFORM_DRIVER,
+    **kwargs,
+):
     """Destroys the network according to the given configuration."""
     testnet_home = os.path.join(cfg.home, cfg.id)
 
     # (1) destroy any load testing infrastructure that may still be running
-    loadtest_destroy(cfg, **kwargs)
+    loadtest_destroy(cfg, terraform_driver=terraform_driver, **kwargs)
 
     # (2) destroy all Tendermint node groups
     for name, _ in reversed(cfg.node_groups.items()):
-        terraform_destroy_tendermint_node_group(os.path.join(testnet_home, "tendermint", name))
+        terraform_destroy_tendermint_node_group(
+            os.path.join(testnet_home, "tendermint", name),
+            testnet_known_hosts(cfg),
+            terraform_driver=terraform_driver,
+        )
 
     # (3) optionally destroy the monitoring
     if cfg.monitoring.influxdb.enabled and cfg.monitoring.influxdb.deploy:
         if not keep_monitoring:
-            terraform_destroy_monitoring(os.path.join(testnet_home, "monitoring"))
+            terraform_destroy_monitoring(
+                os.path.join(testnet_home, "monitoring"),
+                testnet_known_hosts(cfg),
+                terraform_driver=terraform_driver,
+            )
         else:
             logger.info("Keeping monitoring services")
+    log_terraform_init_savings()
 
 
 def network_state(
@@ -478,6 +970,9 @@ def network_state(
     ec2_private_key_path: str = None,
     fail_on_missing: bool = True,
     fail_on_error: bool = True,
+    ssh_parallelism: int = DEFAULT_SSH_PARALLELISM,
+    rolling: "RollingConfig" = None,
+    retry_failed: int = 0,
     **kwargs,
 ):
     if not os.path.exists(ec2_private_key_path):
@@ -493,19 +988,149 @@ def network_state(
         for node_group_name, _ in cfg.node_groups.items():
             target_refs.append(TestnetNodeRef(group=node_group_name))
     logger.info("Attempting to change state of network component(s): %s", testnet_node_refs_to_str(target_refs))
-    ansible_set_tendermint_nodes_state(
-        os.path.join(testnet_home, "tendermint"),
+
+    def change_state(wave_refs, _):
+        set_tendermint_nodes_state(
+            os.path.join(testnet_home, "tendermint"),
+            wave_refs,
+            dict([(name, node_group.abci) for name, node_group in cfg.node_groups.items()]),
+            cfg.abci,
+            ec2_private_key_path,
+            testnet_known_hosts(cfg),
+            state,
+            fail_on_missing=fail_on_missing,
+            fail_on_error=fail_on_error,
+            ssh_control_path=testnet_ssh_control_path(cfg),
+            ssh_parallelism=ssh_parallelism,
+            timings_path=testnet_timings(cfg),
+            retry_failed=retry_failed,
+        )
+
+    # stopped nodes have nothing to catch up on
+    run_in_waves(
+        cfg,
         target_refs,
-        dict([(name, node_group.abci) for name, node_group in cfg.node_groups.items()]),
-        cfg.abci,
-        ec2_private_key_path,
-        state,
+        change_state,
+        rolling=rolling,
         fail_on_missing=fail_on_missing,
-        fail_on_error=fail_on_error,
+        wait_for=(lambda _: True) if state in {"started", "restarted"} else (lambda _: False),
     )
     logger.info("Successfully changed state of network component(s)")
 
 
+def run_in_waves(
+    cfg: "TestnetConfig",
+    target_refs: List["TestnetNodeRef"],
+    fn,
+    rolling: "RollingConfig" = None,
+    fail_on_missing: bool = True,
+    wait_for=None,
+):
+    """Calls `fn` with the target node references and the wave's index, either
+    once for all of them or, if `rolling` is given, once per wave of nodes.
+    After each rolling wave, waits for those of the wave's nodes for which
+    `wait_for(host_ref)` is true to catch up (see rolling_height_gate)."""
+    if rolling is None:
+        fn(target_refs, 0)
+        return
+    workdir = os.path.join(cfg.home, cfg.id, "tendermint")
+    waves = rolling_waves(node_to_host_refs(workdir, target_refs, fail_on_missing=fail_on_missing), rolling.wave_size)
+    all_hostnames = [
+        host_ref.hostname for host_ref in node_to_host_refs(
+            workdir,
+            [TestnetNodeRef(group=node_group_name) for node_group_name, _ in cfg.node_groups.items()],
+            fail_on_missing=False,
+        )
+    ]
+    for i, wave in enumerate(waves):
+        wave_refs = [TestnetNodeRef(group=host_ref.group, id=host_ref.id) for host_ref in wave]
+        logger.info("Wave %d of %d: %s", i + 1, len(waves), testnet_node_refs_to_str(wave_refs))
+        wait_hostnames = [host_ref.hostname for host_ref in wave if wait_for is not None and wait_for(host_ref)]
+        past_height = rolling_height_gate(all_hostnames) if len(wait_hostnames) > 0 else None
+        fn(wave_refs, i)
+        wait_for_nodes_caught_up(wait_hostnames, rolling.wave_timeout, past_height=past_height)
+
+
+def rolling_height_gate(hostnames: List[str], timeout: int = None) -> int:
+    """Returns the height beyond which the nodes in a rolling wave must commit
+    blocks before the next wave may start: the chain's current height, provided
+    that it's advancing (i.e. it increases within `timeout` seconds, by default
+    ROLLING_ADVANCE_TIMEOUT). Otherwise,
+    e.g. when starting a stopped network, the chain can't advance until enough
+    voting power is up, so None is returned, and the wave's nodes only need to
+    respond and not be catching up."""
+    before = tendermint_max_height(hostnames)
+    if before is None:
+        logger.info("No nodes are reachable - only waiting for this wave's nodes to respond")
+        return None
+    deadline = time.monotonic() + (ROLLING_ADVANCE_TIMEOUT if timeout is None else timeout)
+    while time.monotonic() < deadline:
+        time.sleep(ROLLING_POLL_INTERVAL)
+        after = tendermint_max_height(hostnames)
+        if after is not None and after > before:
+            return after
+    logger.info("Chain isn't advancing beyond height %d - only waiting for this wave's nodes to respond", before)
+    return None
+
+
+def network_upgrade(
+    cfg: "TestnetConfig",
+    node_or_group_ids: List[str] = None,
+    ec2_private_key_path: str = None,
+    fail_on_missing: bool = True,
+    binary_distribution: str = DEFAULT_BINARY_DISTRIBUTION,
+    rolling: "RollingConfig" = None,
+    retry_failed: int = 0,
+    **kwargs,
+):
+    """Installs each target node's configured Tendermint binary (e.g. after
+    changing its node group's `binary`) and restarts it, keeping its existing
+    configuration, genesis, keys and data, so it stays on the same chain."""
+    if not os.path.exists(ec2_private_key_path):
+        raise Exception("Cannot find EC2 private key: %s" % ec2_private_key_path)
+
+    testnet_home = os.path.join(cfg.home, cfg.id)
+    target_refs = as_testnet_node_refs(
+        node_or_group_ids or [],
+        "from command line parameter(s)",
+    )
+    # if we have no targets, assume all groups are targets
+    if len(target_refs) == 0:
+        for node_group_name, _ in cfg.node_groups.items():
+            target_refs.append(TestnetNodeRef(group=node_group_name))
+    logger.info("Attempting to upgrade network component(s): %s", testnet_node_refs_to_str(target_refs))
+    binaries = ensure_tendermint_binaries(cfg.node_groups, os.path.join(cfg.home, "bin"))
+    tendermint_outputs = OrderedDict()
+    for name, _ in cfg.node_groups.items():
+        output_vars_file = os.path.join(testnet_home, "tendermint", name, "output-vars.yaml")
+        if os.path.isfile(output_vars_file):
+            tendermint_outputs[name] = load_yaml_config(output_vars_file)
+
+    def upgrade(wave_refs, i):
+        ansible_deploy_tendermint(
+            cfg,
+            tendermint_outputs,
+            binaries,
+            ec2_private_key_path,
+            node_refs=wave_refs,
+            copy_node_config=False,
+            file_suffix="-upgrade" if rolling is None else "-upgrade-wave%d" % (i + 1),
+            binary_distribution=binary_distribution,
+            retry_failed=retry_failed,
+        )
+
+    run_in_waves(
+        cfg,
+        target_refs,
+        upgrade,
+        rolling=rolling,
+        fail_on_missing=fail_on_missing,
+        # only nodes that are meant to be running will catch up
+        wait_for=lambda host_ref: cfg.node_groups[host_ref.group].service_state == "started",
+    )
+    logger.info("Successfully upgraded network component(s)")
+
+
 def network_start(cfg: "TestnetConfig", **kwargs):
     network_state(cfg, "started", **kwargs)
 
@@ -519,6 +1144,7 @@ def network_fetch_logs(
     output_path=None, 
     node_or_group_ids=None,
     ec2_private_key_path=None,
+    retry_failed=0,
     **kwargs):
     if output_path is None or len(output_path) == 0:
         raise Exception("fetch_logs command requires an output path parameter")
@@ -541,6 +1167,9 @@ def network_fetch_logs(
         target_refs,
         resolve_relative_path(output_path, os.getcwd()),
         ec2_private_key_path,
+        testnet_known_hosts(cfg),
+        timings_path=testnet_timings(cfg),
+        retry_failed=retry_failed,
     )
 
 
@@ -549,59 +1178,126 @@ def network_reset(
     truncate_logs: bool = False,
     ec2_private_key_path: str = None,
     keep_existing_tendermint_config: bool = False,
+    parallel: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    binary_distribution: str = DEFAULT_BINARY_DISTRIBUTION,
+    retry_failed: int = 0,
     **kwargs,
 ):
     """(Re)deploys Tendermint on all target nodes."""
     if not os.path.exists(ec2_private_key_path):
         raise Exception("Cannot find EC2 private key: %s" % ec2_private_key_path)
 
-    binaries_path = os.path.join(cfg.home, "bin")
-    binaries = ensure_tendermint_binaries(cfg.node_groups, binaries_path)
-
     testnet_home = os.path.join(cfg.home, cfg.id)
-
-    # load the deployment outputs for all node groups and generate/load
-    # Tendermint configuration for each one
-    tendermint_outputs = OrderedDict()
-    for name, node_group_cfg in cfg.node_groups.items():
-        output_vars_filename = os.path.join(testnet_home, "tendermint", name, "output-vars.yaml")
-        tendermint_outputs[name] = load_yaml_config(output_vars_filename)
-
-    # generate the Tendermint network configuration
-    tendermint_config = OrderedDict()
-    for node_group_name, node_group_outputs in tendermint_outputs.items():
-        node_group_cfg = cfg.node_groups[node_group_name]
-        node_count = len(node_group_outputs["inventory_ordered"])
-        # if we're generating configuration
-        if node_group_cfg.generate_tendermint_config:
-            config_path = os.path.join(testnet_home, "tendermint", node_group_name, "config")
-            tendermint_config[node_group_name] = tendermint_generate_config(
-                config_path,
-                node_group_name,
-                node_group_cfg.config_template,
-                node_count if node_group_cfg.validators else 0,
-                0 if node_group_cfg.validators else node_count,
-                node_group_outputs["inventory_ordered"],
-                keep_existing_tendermint_config,
-            )
-        else:
-            # if we're just loading/modifying existing configuration
-            tendermint_config[node_group_name] = tendermint_load_nodes_config(
-                node_group_cfg.custom_tendermint_config_root,
-                node_count,
-            )
-
-    # reconcile the configuration across the nodes
-    tendermint_finalize_config(cfg, tendermint_config)
-
-    # deploy all node groups' configuration and start the relevant nodes
-    ansible_deploy_tendermint(
+    tasks = []
+    # load the deployment outputs for all node groups
+    for name, _ in cfg.node_groups.items():
+        tasks.append(PipelineTask(
+            name="provision:%s" % name,
+            fn=make_node_group_outputs_loader(os.path.join(testnet_home, "tendermint", name, "output-vars.yaml")),
+        ))
+    tasks.extend(tendermint_pipeline_tasks(
         cfg,
-        tendermint_outputs,
-        binaries,
         ec2_private_key_path,
         truncate_logs=truncate_logs,
-    )
+        keep_existing_tendermint_config=keep_existing_tendermint_config,
+        parallel=parallel,
+        binary_distribution=binary_distribution,
+        retry_failed=retry_failed,
+    ))
+    run_pipeline(tasks, max_workers if parallel else 1)
+
+
+def tendermint_pipeline_tasks(
+    cfg: "TestnetConfig",
+    ec2_private_key_path: str,
+    truncate_logs: bool = False,
+    keep_existing_tendermint_config: bool = False,
+    parallel: bool = False,
+    binary_distribution: str = DEFAULT_BINARY_DISTRIBUTION,
+    retry_failed: int = 0,
+    **kwargs,
+) -> List["PipelineTask"]:
+    """Builds the pipeline tasks to generate and deploy the Tendermint
+    configuration for all node groups. Assumes that a "provision:<group>" task,
+    resulting in a TerraformDeployResult, is present for each node group. The
+    resulting tasks are:
+
+    * binaries - Ensures all required Tendermint binaries are present locally.
+    * keyscan:<group> - Adds the group's hosts' SSH keys to known_hosts.
+    * config:<group> - Generates/loads the group's Tendermint configuration.
+    * finalize - Reconciles configuration across all node groups.
+    * ship:<group> - Deploys the group's configuration and starts its nodes (if
+      `parallel` is not set, a single "ship" task deploys all node groups).
+    """
+    testnet_home = os.path.join(cfg.home, cfg.id)
+    tasks = [
+        PipelineTask(
+            name="binaries",
+            fn=make_tendermint_binaries_loader(cfg.node_groups, os.path.join(cfg.home, "bin")),
+            inputs=sorted(set([node_group_cfg.binary for _, node_group_cfg in cfg.node_groups.items()])),
+            # this is cheap, as downloaded binaries are cached locally
+            restore=make_tendermint_binaries_loader(cfg.node_groups, os.path.join(cfg.home, "bin")),
+        ),
+    ]
+    for name, node_group_cfg in cfg.node_groups.items():
+        tasks.append(PipelineTask(
+            name="keyscan:%s" % name,
+            fn=make_node_group_keyscanner(testnet_known_hosts(cfg), name),
+            deps=["provision:%s" % name],
+            inputs=testnet_known_hosts(cfg),
+            restore=restore_nothing,
+        ))
+        tasks.append(PipelineTask(
+            name="config:%s" % name,
+            fn=make_node_group_config_loader(
+                os.path.join(testnet_home, "tendermint", name, "config"),
+                name,
+                node_group_cfg,
+                keep_existing_tendermint_config,
+                testnet_nodes_config_cache(cfg, name),
+            ),
+            deps=["provision:%s" % name],
+            inputs=(
+                node_group_cfg,
+                keep_existing_tendermint_config,
+                hash_files([node_group_cfg.config_template]).hexdigest() if node_group_cfg.config_template else None,
+            ),
+            restore=make_node_group_config_restorer(
+                os.path.join(testnet_home, "tendermint", name, "config"),
+                name,
+                node_group_cfg,
+                testnet_nodes_config_cache(cfg, name),
+            ),
+        ))
+    tasks.append(PipelineTask(
+        name="finalize",
+        fn=make_tendermint_config_finalizer(cfg),
+        deps=["config:%s" % name for name, _ in cfg.node_groups.items()],
+        inputs=(cfg.id, cfg.node_groups),
+        restore=restore_nothing,
+    ))
+    ship_groups = [[name] for name, _ in cfg.node_groups.items()] if parallel else [None]
+    for node_groups in ship_groups:
+        tasks.append(PipelineTask(
+            name="ship" if node_groups is None else "ship:%s" % node_groups[0],
+            fn=make_tendermint_shipper(
+                cfg,
+                ec2_private_key_path,
+                truncate_logs,
+                node_groups,
+                log_output=parallel,
+                binary_distribution=binary_distribution,
+                retry_failed=retry_failed,
+            ),
+            deps=["finalize", "binaries"] + [
+                "keyscan:%s" % name for name, _ in cfg.node_groups.items()
+                if node_groups is None or name in node_groups
+            ],
+            inputs=(ec2_private_key_path, truncate_logs, node_groups, binary_distribution),
+            restore=restore_nothing,
+        ))
+    return tasks
 
 
 def network_info(cfg: "TestnetConfig", **kwargs):
@@ -628,10 +1324,126 @@ def network_info(cfg: "TestnetConfig", **kwargs):
         logger.info("Tendermint node: %s[%d] => %s", host_ref.group, host_ref.id, host_ref.hostname)
 
 
+def network_status(
+    cfg: "TestnetConfig",
+    output_format: str = DEFAULT_STATUS_OUTPUT_FORMAT,
+    **kwargs,
+):
+    """Queries the RPC /status and /net_info endpoints of all of the nodes in
+    the network concurrently, and shows each node's latest block height, sync
+    status, peer count and how far it is behind the highest node."""
+    testnet_home = os.path.join(cfg.home, cfg.id)
+    if not os.path.isdir(testnet_home):
+        raise Exception("Cannot find testnet home directory for \"%s\" - have you deployed the network yet?" % cfg.id)
+
+    host_refs = node_to_host_refs(
+        os.path.join(testnet_home, "tendermint"),
+        [TestnetNodeRef(group=node_group_name) for node_group_name, _ in cfg.node_groups.items()],
+        fail_on_missing=False,
+    )
+    start = time.monotonic()
+    statuses = tendermint_nodes_status(host_refs)
+    logger.debug("Queried status of %d node(s) in %.2f seconds", len(statuses), time.monotonic() - start)
+
+    if output_format == "json":
+        print(json.dumps(
+            OrderedDict([
+                (node_group_name, [status._asdict() for status in statuses if status.group == node_group_name])
+                for node_group_name in cfg.node_groups.keys()
+            ]),
+            indent=2,
+        ))
+    else:
+        print(format_tendermint_nodes_status(cfg, statuses))
+
+
+def network_watch(
+    cfg: "TestnetConfig",
+    node_or_group_ids: List[str] = None,
+    watch: "WatchConfig" = None,
+    **kwargs,
+):
+    """Subscribes to NewBlock events from the given nodes (or the first node
+    of each node group) and periodically reports rolling block time and TPS
+    statistics, raising an alert whenever the chain stalls."""
+    watch = watch or WatchConfig()
+    if watch.window < 2:
+        raise Exception("Watch window must be at least 2 blocks (got %d)" % watch.window)
+    testnet_home = os.path.join(cfg.home, cfg.id)
+    if not os.path.isdir(testnet_home):
+        raise Exception("Cannot find testnet home directory for \"%s\" - have you deployed the network yet?" % cfg.id)
+
+    target_refs = as_testnet_node_refs(
+        node_or_group_ids or [],
+        "from command line parameter(s)",
+    )
+    if len(target_refs) == 0:
+        target_refs = [TestnetNodeRef(group=node_group_name, id=0) for node_group_name, _ in cfg.node_groups.items()]
+    host_refs = node_to_host_refs(os.path.join(testnet_home, "tendermint"), target_refs)
+    if len(host_refs) == 0:
+        raise Exception("No nodes to watch")
+    logger.info(
+        "Watching %s (window of %d blocks, stall threshold %ds)",
+        ", ".join(["%s[%d]" % (host_ref.group, host_ref.id) for host_ref in host_refs]),
+        watch.window,
+        watch.stall_threshold,
+    )
+    watch_tendermint_blocks([host_ref.hostname for host_ref in host_refs], watch)
+
+
+def network_timings(cfg: "TestnetConfig", top: int = DEFAULT_TIMINGS_TOP, **kwargs):
+    """Reports on the slowest hosts and tasks of the most recent run of each
+    of the testnet's Ansible playbooks, flagging outliers."""
+    timings_path = testnet_timings(cfg)
+    timings_files = sorted(
+        [f for f in os.listdir(timings_path) if f.endswith(".jsonl")] if os.path.isdir(timings_path) else [],
+        key=lambda f: os.path.getmtime(os.path.join(timings_path, f)),
+    )
+    if len(timings_files) == 0:
+        raise Exception("No playbook timings recorded for \"%s\" yet - have you deployed the network?" % cfg.id)
+
+    # label hosts by their node references and regions, where we can
+    host_labels = dict()
+    testnet_home = os.path.join(cfg.home, cfg.id)
+    if os.path.isdir(os.path.join(testnet_home, "tendermint")):
+        for host_ref in node_to_host_refs(
+            os.path.join(testnet_home, "tendermint"),
+            [TestnetNodeRef(group=node_group_name) for node_group_name, _ in cfg.node_groups.items()],
+            fail_on_missing=False,
+        ):
+            host_labels[host_ref.hostname] = (
+                "%s[%d]" % (host_ref.group, host_ref.id),
+                node_region(cfg.node_groups[host_ref.group], host_ref.id),
+            )
+
+    for timings_file in timings_files:
+        timings = load_ansible_timings(os.path.join(timings_path, timings_file))
+        if len(timings) == 0:
+            continue
+        print("\n".join(ansible_timings_report(timings_file[:-len(".jsonl")], timings, host_labels, top)))
+        print("")
+
+
+def network_topology(cfg: "TestnetConfig", **kwargs):
+    """Generates each node group's peer topology (from the configuration alone,
+    so the network need not be deployed yet) and shows its statistics."""
+    for node_group_name, node_group_cfg in cfg.node_groups.items():
+        if node_group_cfg.topology is None:
+            logger.info(
+                "Node group %s: full mesh of %d persistent peer(s)",
+                node_group_name,
+                len(topology_nodes(cfg, node_group_name)) - 1,
+            )
+            continue
+        nodes, adjacency = generate_topology(cfg, node_group_name)
+        log_topology_stats(node_group_name, node_group_cfg.topology, node_group_topology_stats(cfg, node_group_name, nodes, adjacency))
+
+
 def loadtest_start(
     cfg: "TestnetConfig",
     aws_keypair_name: str = None,
     load_test_id: str = None,
+    terraform_driver: str = DEFAULT_TERRAFORM_DRIVER,
     **kwargs,
 ):
     if aws_keypair_name is None:
@@ -672,7 +1484,7 @@ def loadtest_start(
             cfg.id,
             load_test_id,
             tmbench_cfg.client_nodes,
-            [("%s:26657" % t) for t in targets],
+            [("%s:%d" % (t, TENDERMINT_RPC_PORT)) for t in targets],
             tmbench_cfg.time,
             tmbench_cfg.broadcast_tx_method,
             tmbench_cfg.connections,
@@ -680,6 +1492,8 @@ def loadtest_start(
             tmbench_cfg.size,
             influxdb_url,
             influxdb_password,
+            testnet_known_hosts(cfg),
+            terraform_driver=terraform_driver,
         )
     else:
         raise Exception("Unsupported load test type: %s" % type(cfg.load_tests[load_test_id]))
@@ -689,6 +1503,7 @@ def loadtest_stop(
     cfg: "TestnetConfig", 
     load_test_id: str = None,
     fail_on_missing: bool = True,
+    terraform_driver: str = DEFAULT_TERRAFORM_DRIVER,
     **kwargs,
 ):
     if load_test_id is None or len(load_test_id) == 0:
@@ -701,7 +1516,9 @@ def loadtest_stop(
         terraform_destroy_tmbench(
             workdir,
             load_test_id,
+            testnet_known_hosts(cfg),
             fail_on_missing=fail_on_missing,
+            terraform_driver=terraform_driver,
         )
 
 
@@ -742,15 +1559,19 @@ TestnetNodeGroupConfig = namedtuple("TestnetNodeGroupConfig",
         "binary", "abci", "validators", "in_genesis", "power", "service_state",
         "config_template", "use_seeds", "persistent_peers", "regions", 
         "instance_type", "volume_size", "generate_tendermint_config",
-        "custom_tendermint_config_root",
+        "custom_tendermint_config_root", "topology",
     ],
     defaults=[
         None, None, True, True, 1000, "started",
         None, [], [], OrderedDict(), 
         "t3.small", 8, True,
-        None,
+        None, None,
     ],
 )
+TestnetTopologyConfig = namedtuple("TestnetTopologyConfig",
+    ["type", "degree", "seed", "inter_region_links"],
+    defaults=["random-regular", 4, 0, 2],
+)
 TestnetABCIConfig = namedtuple("TestnetABCIConfig",
     ["deploy", "start", "stop"],
 )
@@ -776,8 +1597,16 @@ TestnetHostRef = namedtuple("TestnetHostRef",
 )
 
 
+# A node's configuration consists of its node group's shared configuration
+# template (see tendermint_config_template), which must not be modified, along
+# with the node's own overrides, which are only applied to the template when
+# the node's configuration file is written
 TendermintNodeConfig = namedtuple("TendermintNodeConfig",
-    ["config_path", "config", "priv_validator_key", "node_key", "peer_id"],
+    ["config_path", "template", "overrides", "priv_validator_key", "node_key", "peer_id"],
+)
+TendermintNodeConfigOverrides = namedtuple("TendermintNodeConfigOverrides",
+    ["moniker", "persistent_peers", "seeds"],
+    defaults=["", "", ""],
 )
 TendermintNodePrivValidatorKey = namedtuple("TendermintNodePrivValidatorKey",
     ["address", "pub_key", "priv_key"],
@@ -785,29 +1614,85 @@ TendermintNodePrivValidatorKey = namedtuple("TendermintNodePrivValidatorKey",
 TendermintNodeKey = namedtuple("TendermintNodeKey", 
     ["type", "value"],
 )
+# A comma-separated list of peers, along with the (start, end) offsets of each
+# peer's entry in the joined list
+TendermintPeerList = namedtuple("TendermintPeerList",
+    ["joined", "offsets"],
+)
 
 
-AnsibleInventoryEntry = namedtuple("AnsibleInventoryEntry",
-    ["alias", "ansible_host", "node_group", "node_id"],
-    defaults=[None, None, None, None],
+PipelineTask = namedtuple("PipelineTask",
+    ["name", "fn", "deps", "inputs", "restore"],
+    defaults=[None, None, [], None, None],
 )
 
 
-LOAD_TEST_METHODS = {
-    "tm-bench": TestnetTMBenchConfig,
-}
+TerraformDeployResult = namedtuple("TerraformDeployResult",
+    ["output_vars", "skipped"],
+)
 
 
-def load_testnet_config(filename: str) -> TestnetConfig:
-    """Loads the configuration from the given file. Throws an exception if any
-    validation fails. On success, returns the configuration."""
+CommandResult = namedtuple("CommandResult",
+    ["cmd", "returncode", "output", "wall_time"],
+)
 
-    # resolve the tmtestnet home folder path
-    tmtestnet_home = os.path.expanduser(TMTESTNET_HOME)
-    ensure_path_exists(tmtestnet_home)
+
+TendermintNodeStatus = namedtuple("TendermintNodeStatus",
+    ["group", "id", "hostname", "height", "catching_up", "peers", "behind", "error"],
+)
+
+
+# A task's timing on a single host. Timings recorded before the play and task
+# UUID were recorded lack them.
+AnsibleTaskTiming = namedtuple("AnsibleTaskTiming",
+    ["playbook", "host", "task", "start", "end", "duration", "status", "play", "task_uuid"],
+    defaults=[None, None],
+)
+
+
+WatchConfig = namedtuple("WatchConfig",
+    ["window", "report_interval", "stall_threshold", "alert_cmd", "duration"],
+    defaults=[DEFAULT_WATCH_WINDOW, DEFAULT_WATCH_REPORT_INTERVAL, DEFAULT_WATCH_STALL_THRESHOLD, None, 0],
+)
+
+
+BlockSample = namedtuple("BlockSample",
+    ["height", "time", "txs"],
+)
+
+
+RollingConfig = namedtuple("RollingConfig",
+    ["wave_size", "wave_timeout"],
+    defaults=[DEFAULT_WAVE_SIZE, DEFAULT_WAVE_TIMEOUT],
+)
+
+
+AnsibleInventoryEntry = namedtuple("AnsibleInventoryEntry",
+    ["alias", "ansible_host", "node_group", "node_id", "config_archive", "binary_seed"],
+    defaults=[None, None, None, None, None, None],
+)
+
+
+LOAD_TEST_METHODS = {
+    "tm-bench": TestnetTMBenchConfig,
+}
+
+
+def load_testnet_config(filename: str, fail_on_missing_envvars: bool = False) -> TestnetConfig:
+    """Loads the configuration from the given file. Throws an exception if any
+    validation fails. On success, returns the configuration."""
+
+    # resolve the tmtestnet home folder path (it's only created once something
+    # needs to be written to it)
+    tmtestnet_home = os.path.expanduser(TMTESTNET_HOME)
 
     with open(filename, "rt") as f:
-        cfg_dict = yaml.safe_load(f)
+        cfg_text = f.read()
+    # Allow for interpolation of environment variables within YAML files (only
+    # if the file could possibly refer to any, as this slows down parsing)
+    if "$" in cfg_text:
+        configure_env_var_yaml_loading(fail_on_missing=fail_on_missing_envvars)
+    cfg_dict = yaml.safe_load(cfg_text)
 
     if "id" not in cfg_dict:
         raise Exception("Missing required \"id\" parameter in configuration file")
@@ -923,9 +1808,34 @@ def load_node_group_config(
             raise Exception("Cannot find configuration template: %s (%s)" % (_cfg_dict["config_template"], ctx))
     if "abci" in _cfg_dict and _cfg_dict["abci"] not in abci_config:
         raise Exception("Unrecognized ABCI configuration: %s (%s)" % (_cfg_dict["abci"], ctx))
+    _cfg_dict["topology"] = load_topology_config(cfg_dict.get("topology", None), "in \"topology\", %s" % ctx)
     return TestnetNodeGroupConfig(**_cfg_dict)
 
 
+def load_topology_config(cfg_dict: dict, ctx: str) -> TestnetTopologyConfig:
+    # no topology means a full mesh of persistent peers
+    if cfg_dict is None:
+        return None
+    if not isinstance(cfg_dict, dict):
+        raise Exception("Expected topology configuration to be a set of key/value pairs (%s)" % ctx)
+    unknown_fields = set(cfg_dict.keys()) - set(TestnetTopologyConfig._fields)
+    if unknown_fields:
+        raise Exception("Unrecognized topology field(s): %s (%s)" % (", ".join(sorted(unknown_fields)), ctx))
+    topology = TestnetTopologyConfig(**cfg_dict)
+    if topology.type not in TOPOLOGY_TYPES:
+        raise Exception("Unrecognized topology type \"%s\", must be one of: %s (%s)" % (topology.type, ", ".join(TOPOLOGY_TYPES), ctx))
+    if not isinstance(topology.degree, int) or topology.degree < 2:
+        raise Exception("Topology degree must be an integer of at least 2 (%s)" % ctx)
+    if topology.type == "region-clusters" and topology.degree < 3:
+        # each region's ring needs 2 links per node, plus room for links to other regions
+        raise Exception("A region-clusters topology's degree must be at least 3 (%s)" % ctx)
+    if not isinstance(topology.seed, int):
+        raise Exception("Topology seed must be an integer (%s)" % ctx)
+    if not isinstance(topology.inter_region_links, int) or topology.inter_region_links < 1:
+        raise Exception("Topology inter-region links must be an integer of at least 1 (%s)" % ctx)
+    return topology
+
+
 def load_load_test_config(cfg_dict: dict, ctx: str):
     method = cfg_dict.get("method", None)
     if method not in LOAD_TEST_METHODS:
@@ -970,6 +1880,8 @@ def terraform_deploy_monitoring(
     influxdb_password, 
     instance_type, 
     volume_size,
+    known_hosts,
+    terraform_driver=DEFAULT_TERRAFORM_DRIVER,
 ):
     """Deploys the Grafana/InfluxDB monitoring service on AWS with the given
     parameters."""
@@ -1000,22 +1912,18 @@ def terraform_deploy_monitoring(
 
     logger.info("Deploying Grafana/InfluxDB monitoring")
     logger.debug("Using InfluxDB password: %s", mask_password(influxdb_password))
-    sh([
-        "ansible-playbook", 
-        "-e", "@%s" % extra_vars_file,
-        "ansible-terraform.yaml",
-    ])
+    terraform_execute(extra_vars_file, terraform_driver, output_vars_converter=monitoring_output_vars)
     logger.info("Monitoring successfully deployed")
 
     # read the output variables that the Ansible script should have generated
     output_vars = load_yaml_config(output_vars_file)
     # add this host's SSH key to our known_hosts
-    ensure_in_known_hosts(output_vars["host"]["public_dns"])
+    ensure_in_known_hosts(known_hosts, output_vars["host"]["public_dns"])
     return output_vars
 
 
-def terraform_destroy_monitoring(workdir):
-    """Deploys the Grafana/InfluxDB monitoring service on AWS with the given
+def terraform_destroy_monitoring(workdir, known_hosts, terraform_driver=DEFAULT_TERRAFORM_DRIVER):
+    """Destroys the Grafana/InfluxDB monitoring service on AWS with the given
     parameters."""
     extra_vars_file = os.path.join(workdir, "terraform-extra-vars.yaml")
     if not os.path.isfile(extra_vars_file):
@@ -1031,15 +1939,11 @@ def terraform_destroy_monitoring(workdir):
     save_yaml_config(extra_vars_file, extra_vars)
 
     logger.info("Destroying Grafana/InfluxDB monitoring")
-    sh([
-        "ansible-playbook", 
-        "-e", "@%s" % extra_vars_file,
-        "ansible-terraform.yaml",
-    ])
+    terraform_execute(extra_vars_file, terraform_driver)
 
     output_vars = load_yaml_config(output_vars_file)
     logger.info("Removing cached host key for monitoring server")
-    clear_host_keys(output_vars["host"]["public_dns"])
+    clear_all_host_keys(known_hosts, [output_vars["host"]["public_dns"]])
 
     logger.info("Monitoring successfully destroyed")
 
@@ -1054,7 +1958,17 @@ def terraform_deploy_tendermint_node_group(
     instance_type: str,
     volume_size: int,
     regions: OrderedDictType[str, "TestnetRegionConfig"],
-):
+    known_hosts: str,
+    log_file: str = None,
+    force: bool = False,
+    scan_host_keys: bool = True,
+    terraform_driver: str = DEFAULT_TERRAFORM_DRIVER,
+) -> "TerraformDeployResult":
+    """Deploys the given Tendermint node group using Terraform. Unless `force`
+    is set, Terraform is skipped if neither the Terraform inputs for the node
+    group nor its previously generated output variables have changed since its
+    last successful deployment. If `scan_host_keys` is set, the deployed hosts'
+    SSH keys are added to the given known_hosts file."""
     ensure_path_exists(workdir)
     output_vars_template = os.path.join(workdir, "output-vars.yaml.jinja2")
     with open(output_vars_template, "wt") as f:
@@ -1088,13 +2002,26 @@ def terraform_deploy_tendermint_node_group(
     }
     save_yaml_config(extra_vars_file, extra_vars)
 
+    fingerprint_file = os.path.join(workdir, "terraform-fingerprint.yaml")
+    inputs_hash = terraform_inputs_hash(
+        extra_vars["project_path"],
+        [input_vars_file, output_vars_template, extra_vars_file],
+    )
+    if not force and terraform_fingerprint_matches(fingerprint_file, inputs_hash, output_vars_file):
+        logger.info("Terraform inputs for node group %s are unchanged - skipping", node_group_name)
+        return TerraformDeployResult(output_vars=load_yaml_config(output_vars_file), skipped=True)
+    # only consider the deployment up-to-date once it's succeeded
+    if os.path.isfile(fingerprint_file):
+        os.remove(fingerprint_file)
+
     logger.info("Deploying Tendermint node group: %s", node_group_name)
-    sh([
-        "ansible-playbook", 
-        "-e", "@%s" % extra_vars_file,
-        "ansible-terraform.yaml",
-    ])
-    logger.info("Tendermint node group successfully deployed")
+    terraform_execute(
+        extra_vars_file,
+        terraform_driver,
+        output_vars_converter=tendermint_output_vars,
+        log_file=log_file,
+    )
+    logger.info("Tendermint node group successfully deployed: %s", node_group_name)
 
     # read the output variables that the Ansible script should have generated
     output_vars = load_yaml_config(output_vars_file)
@@ -1120,12 +2047,396 @@ def terraform_deploy_tendermint_node_group(
     logger.debug("Wrote Ansible inventory for group %s to file: %s", node_group_name, inventory_file)
     # overwrite the output variables file with the new inventory_file parameter
     save_yaml_config(output_vars_file, output_vars)
-    # add all of the hosts' SSH keys to the known_hosts file on the local machine
-    ensure_all_in_known_hosts(output_vars["inventory_ordered"])
-    return output_vars
+    # add all of the hosts' SSH keys to the testnet's known_hosts file
+    if scan_host_keys:
+        ensure_all_in_known_hosts(known_hosts, output_vars["inventory_ordered"])
+    save_terraform_fingerprint(fingerprint_file, inputs_hash, output_vars_file)
+    return TerraformDeployResult(output_vars=output_vars, skipped=False)
+
+
+def terraform_execute(
+    extra_vars_file: str,
+    driver: str = DEFAULT_TERRAFORM_DRIVER,
+    output_vars_converter=None,
+    log_file: str = None,
+):
+    """Applies or destroys (depending on the "state" variable) the Terraform
+    project described by the given ansible-terraform.yaml extra variables file,
+    using the specified driver. When applying, the project's outputs are
+    written to the extra variables' "output_vars_file", either by way of the
+    "output_vars_template" (for the "ansible" driver) or the given
+    `output_vars_converter` function, which transforms the outputs from
+    `terraform output -json` (for the "native" driver)."""
+    if driver not in TERRAFORM_DRIVERS:
+        raise Exception("Unsupported Terraform driver: %s" % driver)
+    extra_vars = load_yaml_config(extra_vars_file)
+    project_path = extra_vars["project_path"]
+    if driver == "ansible":
+        # the playbook only initializes the project if we ask it to
+        terraform_ensure_initialized(project_path, log_file=log_file)
+        sh([
+            "ansible-playbook", 
+            "-e", "@%s" % extra_vars_file,
+            "ansible-terraform.yaml",
+        ], log_file=log_file, env=terraform_env())
+        return
+
+    workspace = extra_vars["workspace"]
+    terraform_ensure_workspace(project_path, workspace, log_file=log_file)
+    # selecting the workspace through the environment (as opposed to
+    # "terraform workspace select") allows for concurrent operations on
+    # different workspaces of the same project
+    env = terraform_env(TF_WORKSPACE=workspace, TF_IN_AUTOMATION="1")
+    # Terraform runs from within the project, so the input variables file's
+    # path mustn't be relative to our own working directory
+    input_vars_file = os.path.abspath(extra_vars["input_vars_file"])
+    if extra_vars["state"] == "absent":
+        sh([
+            "terraform", "destroy",
+            "-input=false",
+            "-auto-approve",
+            "-var-file=%s" % input_vars_file,
+        ], log_file=log_file, cwd=project_path, env=env)
+        return
+
+    sh([
+        "terraform", "apply",
+        "-input=false",
+        "-auto-approve",
+        "-var-file=%s" % input_vars_file,
+    ], log_file=log_file, cwd=project_path, env=env)
+    result = run_command(
+        ["terraform", "output", "-json"],
+        echo=False,
+        stderr=subprocess.DEVNULL,
+        cwd=project_path,
+        env=env,
+    )
+    if result.returncode != 0:
+        raise Exception("Failed to obtain Terraform outputs for workspace %s (return code %d)" % (workspace, result.returncode))
+    save_yaml_config(extra_vars["output_vars_file"], output_vars_converter(json.loads(result.output)))
+
+
+def terraform_env(**kwargs) -> Dict[str, str]:
+    """Returns the environment in which to execute Terraform (with the given
+    additional variables), sharing the machine-wide provider plugin cache."""
+    os.makedirs(TERRAFORM_PLUGIN_CACHE_DIR, exist_ok=True)
+    return dict(os.environ, TF_PLUGIN_CACHE_DIR=TERRAFORM_PLUGIN_CACHE_DIR, **kwargs)
+
+
+def terraform_requirements_hash(project_path: str) -> str:
+    """Computes a hash of everything in the given Terraform project that
+    determines what "terraform init" installs: the terraform blocks, the
+    providers (both those configured and those implied by resource and data
+    source types) and their versions, module sources and versions, and the
+    dependency lock file, along with the Terraform binary in use."""
+    requirements = []
+    for filename in terraform_project_files(project_path):
+        if not filename.endswith(".tf"):
+            continue
+        with open(filename, "rt") as f:
+            lines = f.read().splitlines()
+        block = None
+        for line in lines:
+            m = re.match(r"^(terraform|provider|module|resource|data)\b(.*?)\{?\s*$", line)
+            if m is not None:
+                block = m.group(1)
+                if block in {"resource", "data"}:
+                    # e.g. resource "aws_instance" "node" implies the "aws" provider
+                    provider = re.match(r'^\s*"([^_"]+)', m.group(2))
+                    if provider is not None:
+                        requirements.append("%s %s" % (block, provider.group(1)))
+                elif block == "terraform":
+                    requirements.append(line)
+                else:
+                    requirements.append("%s %s" % (block, m.group(2).strip()))
+            elif line.startswith("}"):
+                block = None
+            elif block == "terraform" or (block in {"provider", "module"} and re.match(r"^\s*(source|version)\s*=", line)):
+                requirements.append("  %s" % line.strip())
+    sha256 = hashlib.sha256("\n".join(requirements).encode("utf-8"))
+    lock_file = os.path.join(project_path, ".terraform.lock.hcl")
+    if os.path.isfile(lock_file):
+        hash_files([lock_file], sha256)
+    terraform_bin = shutil.which("terraform")
+    if terraform_bin is not None:
+        stat = os.stat(terraform_bin)
+        sha256.update(("%s %d %d" % (os.path.realpath(terraform_bin), stat.st_size, stat.st_mtime_ns)).encode("utf-8"))
+    return sha256.hexdigest()
+
+
+def terraform_ensure_initialized(project_path: str, log_file: str = None):
+    """Initializes the given Terraform project, unless it's already been
+    initialized with the same provider/module requirements."""
+    with TERRAFORM_PROJECT_LOCK:
+        fingerprint_file = os.path.join(project_path, ".terraform", TERRAFORM_INIT_FINGERPRINT)
+        fingerprint = load_yaml_config(fingerprint_file) if os.path.isfile(fingerprint_file) else dict()
+        if fingerprint.get("requirements", None) == terraform_requirements_hash(project_path):
+            logger.info(
+                "Terraform project %s is already initialized - skipping init (saving ~%.2f seconds)",
+                project_path,
+                fingerprint.get("init_seconds", 0.0),
+            )
+            TERRAFORM_INIT_SECONDS_SAVED.append(fingerprint.get("init_seconds", 0.0))
+            return
+        result = sh(["terraform", "init", "-input=false"], log_file=log_file, cwd=project_path, env=terraform_env())
+        # the lock file may have been created or updated by init
+        save_yaml_config(fingerprint_file, {
+            "requirements": terraform_requirements_hash(project_path),
+            "init_seconds": round(result.wall_time, 2),
+        })
+
+
+def log_terraform_init_savings():
+    with TERRAFORM_PROJECT_LOCK:
+        if len(TERRAFORM_INIT_SECONDS_SAVED) > 0:
+            logger.info(
+                "Skipped %d Terraform project initialization(s), saving ~%.2f seconds",
+                len(TERRAFORM_INIT_SECONDS_SAVED),
+                sum(TERRAFORM_INIT_SECONDS_SAVED),
+            )
+        del TERRAFORM_INIT_SECONDS_SAVED[:]
+
+
+def terraform_ensure_workspace(project_path: str, workspace: str, log_file: str = None):
+    """Initializes the given Terraform project (if necessary) and ensures that
+    the given workspace exists."""
+    with TERRAFORM_PROJECT_LOCK:
+        terraform_ensure_initialized(project_path, log_file=log_file)
+        result = run_command(["terraform", "workspace", "list"], echo=False, cwd=project_path, env=terraform_env())
+        if result.returncode != 0:
+            raise Exception("Failed to list Terraform workspaces for project: %s" % project_path)
+        workspaces = set([line.strip(" *") for line in result.output.splitlines()])
+        if workspace not in workspaces:
+            sh(["terraform", "workspace", "new", workspace], log_file=log_file, cwd=project_path)
+            # "workspace new" also selects the new workspace
+            sh(["terraform", "workspace", "select", "default"], log_file=log_file, cwd=project_path)
+
+
+def monitoring_output_vars(outputs: Dict) -> Dict:
+    """Converts the monitoring project's Terraform outputs into the same
+    structure as produced by MONITOR_OUTPUT_VARS_TEMPLATE."""
+    return {
+        "host": {
+            "public_dns": outputs["host"]["value"]["public_dns"],
+            "public_ip": outputs["host"]["value"]["public_ip"],
+        },
+        "influxdb_url": outputs["influxdb_url"]["value"],
+        "grafana_url": outputs["grafana_url"]["value"],
+    }
+
+
+def tendermint_output_vars(outputs: Dict) -> Dict:
+    """Converts the Tendermint project's Terraform outputs into the same
+    structure as produced by TENDERMINT_OUTPUT_VARS_TEMPLATE."""
+    hosts = dict()
+    for region, region_hosts in outputs.items():
+        if not region_hosts["value"]:
+            continue
+        hosts[region] = [
+            {node_id: {"public_dns": node["public_dns"], "public_ip": node["public_ip"]}}
+            for node_id, node in region_hosts["value"].items()
+        ]
+    return {"hosts": hosts}
+
+
+def tmbench_output_vars(outputs: Dict) -> Dict:
+    """Converts the tm-bench project's Terraform outputs into the same
+    structure as produced by TMBENCH_OUTPUT_VARS_TEMPLATE."""
+    return {
+        "hosts": dict([
+            (host_id, {"public_dns": host["public_dns"], "public_ip": host["public_ip"]})
+            for host_id, host in outputs["hosts"]["value"].items()
+        ]),
+    }
+
+
+def make_monitoring_deployer(
+    workdir: str,
+    keypair_name: str,
+    cfg: "TestnetConfig",
+    terraform_driver: str = DEFAULT_TERRAFORM_DRIVER,
+):
+    def deployer(_):
+        return terraform_deploy_monitoring(
+            workdir,
+            keypair_name,
+            cfg.id,
+            cfg.monitoring.influxdb.password,
+            cfg.monitoring.influxdb.instance_type,
+            cfg.monitoring.influxdb.volume_size,
+            testnet_known_hosts(cfg),
+            terraform_driver=terraform_driver,
+        )
+    return deployer
+
+
+def make_node_group_deployer(
+    workdir: str,
+    keypair_name: str,
+    cfg: "TestnetConfig",
+    node_group_name: str,
+    node_group_cfg: TestnetNodeGroupConfig,
+    log_output: bool = False,
+    force: bool = False,
+    terraform_driver: str = DEFAULT_TERRAFORM_DRIVER,
+):
+    """Returns a pipeline task function that deploys the given node group. If
+    `log_output` is set, the Terraform output is written to a log file in the
+    node group's working directory instead of to stdout. The node group's hosts'
+    SSH keys are scanned separately (see make_node_group_keyscanner)."""
+    def deployer(deps):
+        influxdb_url = cfg.monitoring.influxdb.url
+        if "monitoring" in deps:
+            influxdb_url = deps["monitoring"]["influxdb_url"]
+        return terraform_deploy_tendermint_node_group(
+            workdir,
+            keypair_name,
+            cfg.id,
+            node_group_name,
+            influxdb_url,
+            cfg.monitoring.influxdb.password,
+            node_group_cfg.instance_type,
+            node_group_cfg.volume_size,
+            node_group_cfg.regions,
+            testnet_known_hosts(cfg),
+            log_file=os.path.join(workdir, "terraform.log") if log_output else None,
+            force=force,
+            scan_host_keys=False,
+            terraform_driver=terraform_driver,
+        )
+    return deployer
+
+
+def make_node_group_outputs_loader(output_vars_file: str):
+    """Returns a pipeline task function that loads a previously deployed node
+    group's outputs."""
+    def loader(_):
+        return TerraformDeployResult(output_vars=load_yaml_config(output_vars_file), skipped=True)
+    return loader
+
+
+def make_node_group_keyscanner(known_hosts: str, node_group_name: str):
+    def keyscanner(deps):
+        result = deps["provision:%s" % node_group_name]
+        hostnames = result.output_vars["inventory_ordered"]
+        # if Terraform was skipped, we only need the keys we don't have yet
+        if result.skipped:
+            hostnames = hosts_missing_from_known_hosts(known_hosts, hostnames)
+        if len(hostnames) > 0:
+            ensure_all_in_known_hosts(known_hosts, hostnames)
+    return keyscanner
+
+
+def make_tendermint_binaries_loader(node_groups: OrderedDictType[str, TestnetNodeGroupConfig], download_path: str):
+    def loader(_):
+        return ensure_tendermint_binaries(node_groups, download_path)
+    return loader
+
+
+def make_node_group_config_loader(
+    config_path: str,
+    node_group_name: str,
+    node_group_cfg: TestnetNodeGroupConfig,
+    keep_existing: bool,
+    cache_file: str,
+):
+    """Returns a pipeline task function that generates (or loads, if the node
+    group uses custom configuration) the node group's Tendermint configuration."""
+    def loader(deps):
+        hostnames = deps["provision:%s" % node_group_name].output_vars["inventory_ordered"]
+        node_count = len(hostnames)
+        # if we're just loading/modifying existing configuration
+        if not node_group_cfg.generate_tendermint_config:
+            return tendermint_load_nodes_config(
+                node_group_cfg.custom_tendermint_config_root,
+                node_count,
+                cache_file=cache_file,
+            )
+        return tendermint_generate_config(
+            config_path,
+            node_group_name,
+            node_group_cfg.config_template,
+            node_count if node_group_cfg.validators else 0,
+            0 if node_group_cfg.validators else node_count,
+            hostnames,
+            keep_existing,
+            cache_file=cache_file,
+        )
+    return loader
+
+
+def make_node_group_config_restorer(
+    config_path: str,
+    node_group_name: str,
+    node_group_cfg: TestnetNodeGroupConfig,
+    cache_file: str,
+):
+    """Returns a pipeline task function that loads the node group's previously
+    generated Tendermint configuration."""
+    def restorer(deps):
+        node_count = len(deps["provision:%s" % node_group_name].output_vars["inventory_ordered"])
+        return tendermint_load_nodes_config(
+            config_path if node_group_cfg.generate_tendermint_config else node_group_cfg.custom_tendermint_config_root,
+            node_count,
+            cache_file=cache_file,
+        )
+    return restorer
+
+
+def make_yaml_config_loader(filename: str):
+    def loader(_):
+        return load_yaml_config(filename)
+    return loader
+
+
+def restore_nothing(_):
+    return None
+
+
+def make_tendermint_config_finalizer(cfg: "TestnetConfig"):
+    def finalizer(deps):
+        tendermint_config = OrderedDict()
+        for name, _ in cfg.node_groups.items():
+            tendermint_config[name] = deps["config:%s" % name]
+        # reconcile the configuration across the nodes
+        tendermint_finalize_config(cfg, tendermint_config)
+    return finalizer
+
+
+def make_tendermint_shipper(
+    cfg: "TestnetConfig",
+    ec2_private_key_path: str,
+    truncate_logs: bool,
+    node_groups: List[str],
+    log_output: bool = False,
+    binary_distribution: str = DEFAULT_BINARY_DISTRIBUTION,
+    retry_failed: int = 0,
+):
+    """Returns a pipeline task function that deploys the given node groups'
+    configuration (or all node groups' configuration if `node_groups` is None)
+    and starts the relevant nodes."""
+    def shipper(deps):
+        tendermint_outputs = OrderedDict()
+        for name, _ in cfg.node_groups.items():
+            if node_groups is None or name in node_groups:
+                output_vars_file = os.path.join(cfg.home, cfg.id, "tendermint", name, "output-vars.yaml")
+                tendermint_outputs[name] = load_yaml_config(output_vars_file)
+        ansible_deploy_tendermint(
+            cfg,
+            tendermint_outputs,
+            deps["binaries"],
+            ec2_private_key_path,
+            truncate_logs=truncate_logs,
+            node_groups=node_groups,
+            log_output=log_output,
+            binary_distribution=binary_distribution,
+            retry_failed=retry_failed,
+        )
+    return shipper
 
 
-def terraform_destroy_tendermint_node_group(workdir):
+def terraform_destroy_tendermint_node_group(workdir, known_hosts, terraform_driver=DEFAULT_TERRAFORM_DRIVER):
     extra_vars_file = os.path.join(workdir, "terraform-extra-vars.yaml")
     if not os.path.isfile(extra_vars_file):
         raise Exception("Cannot find %s when attempting to destroy Tendermint node group" % extra_vars_file)
@@ -1134,22 +2445,23 @@ def terraform_destroy_tendermint_node_group(workdir):
     if not os.path.isfile(output_vars_file):
         raise Exception("Cannot find %s when attempting to destroy Tendermint node group" % output_vars_file)
     
+    # the node group will need to be redeployed after this
+    fingerprint_file = os.path.join(workdir, "terraform-fingerprint.yaml")
+    if os.path.isfile(fingerprint_file):
+        os.remove(fingerprint_file)
+
     # Reopen the extra vars file, but just change the desired state
     extra_vars = load_yaml_config(extra_vars_file)
     extra_vars["state"] = "absent"
     save_yaml_config(extra_vars_file, extra_vars)
 
     logger.info("Destroying Tendermint node group: %s", extra_vars["node_group"])
-    sh([
-        "ansible-playbook", 
-        "-e", "@%s" % extra_vars_file,
-        "ansible-terraform.yaml",
-    ])
+    terraform_execute(extra_vars_file, terraform_driver)
 
     output_vars = load_yaml_config(output_vars_file)
     hostnames = [hostname for hostname in output_vars["inventory_ordered"]]
-    logger.info("Removing cached host keys from local known_hosts for node group")
-    clear_all_host_keys(hostnames)
+    logger.info("Removing cached host keys from testnet known_hosts for node group")
+    clear_all_host_keys(known_hosts, hostnames)
 
     logger.info("Tendermint node group successfully destroyed: %s", extra_vars["node_group"])
 
@@ -1168,6 +2480,8 @@ def terraform_deploy_tmbench(
     tx_size: int,
     influxdb_url: str,
     influxdb_password: str,
+    known_hosts: str,
+    terraform_driver: str = DEFAULT_TERRAFORM_DRIVER,
 ):
     ensure_path_exists(workdir)
     output_vars_template = os.path.join(workdir, "terraform-output-vars.yaml.jinja2")
@@ -1202,21 +2516,22 @@ def terraform_deploy_tmbench(
     save_yaml_config(extra_vars_file, extra_vars)
 
     logger.info("Deploying tm-bench load test: %s", load_test_id)
-    sh([
-        "ansible-playbook",
-        "-e", "@%s" % extra_vars_file,
-        "ansible-terraform.yaml",
-    ])
+    terraform_execute(extra_vars_file, terraform_driver, output_vars_converter=tmbench_output_vars)
     logger.info("Load test successfully deployed")
 
     output_vars = load_yaml_config(output_vars_file)
     # ensure we can SSH to these hosts
-    for _, host in output_vars["hosts"].items():
-         ensure_in_known_hosts(host["public_dns"])
+    ensure_all_in_known_hosts(known_hosts, [host["public_dns"] for _, host in output_vars["hosts"].items()])
     return output_vars
 
 
-def terraform_destroy_tmbench(workdir: str, load_test_id: str, fail_on_missing: bool = True):
+def terraform_destroy_tmbench(
+    workdir: str,
+    load_test_id: str,
+    known_hosts: str,
+    fail_on_missing: bool = True,
+    terraform_driver: str = DEFAULT_TERRAFORM_DRIVER,
+):
     extra_vars_file = os.path.join(workdir, "terraform-extra-vars.yaml")
     if not os.path.isfile(extra_vars_file):
         if fail_on_missing:
@@ -1237,17 +2552,13 @@ def terraform_destroy_tmbench(workdir: str, load_test_id: str, fail_on_missing:
     save_yaml_config(extra_vars_file, extra_vars)
 
     logger.info("Destroying tm-bench load test: %s", load_test_id)
-    sh([
-        "ansible-playbook", 
-        "-e", "@%s" % extra_vars_file,
-        "ansible-terraform.yaml",
-    ])
+    terraform_execute(extra_vars_file, terraform_driver)
 
-    logger.info("Removing cached host keys from local known_hosts for load test: %s", load_test_id)
+    logger.info("Removing cached host keys from testnet known_hosts for load test: %s", load_test_id)
     # read the hostnames from the output variables
     output_vars = load_yaml_config(output_vars_file)
     hostnames = [host["public_dns"] for _, host in output_vars["hosts"].items()]
-    clear_all_host_keys(hostnames)
+    clear_all_host_keys(known_hosts, hostnames)
 
     logger.info("tm-bench load test successfully destroyed")
 
@@ -1260,65 +2571,280 @@ def tendermint_generate_config(
     non_validators: int,
     hostnames: List[str],
     keep_existing: bool,
+    cache_file: str = None,
 ) -> List[TendermintNodeConfig]:
-    """Generates the Tendermint network configuration for a node group."""
+    """Generates the Tendermint network configuration for a node group, in
+    the same layout as the `tendermint testnet` command would, but without
+    having to shell out to it. Node monikers are set to their hostnames, and
+    like `tendermint testnet`, the P2P settings in TENDERMINT_TESTNET_P2P_CONFIG
+    override those in the configuration template. Existing configuration that
+    is kept is loaded using the given cache file (see
+    tendermint_load_nodes_config)."""
     logger.info("Generating Tendermint configuration for node group: %s", node_group_name)
     if os.path.isdir(workdir):
         if keep_existing:
             logger.info("Configuration already exists, keeping existing configuration")
-            return tendermint_load_nodes_config(workdir, len(hostnames))
+            return tendermint_load_nodes_config(workdir, len(hostnames), cache_file=cache_file)
 
         logger.info("Removing existing configuration directory: %s", workdir)
         shutil.rmtree(workdir)
     ensure_path_exists(workdir)
-    cmd = [
-        "tendermint", "testnet",
-        "--v", "%d" % validators,
-        "--n", "%d" % non_validators,
-        "--populate-persistent-peers=false", # we'll handle this ourselves later
-        "--o", workdir,
-    ]
-    if config_file_template is not None:
-        cmd.extend(["--config", config_file_template])
-    for hostname in hostnames:
-        cmd.extend(["--hostname", hostname])
-    sh(cmd)
-    return tendermint_load_nodes_config(workdir, len(hostnames))
-
 
-def tendermint_load_nodes_config(base_path: str, node_count: int) -> List[TendermintNodeConfig]:
-    """Loads the relevant Tendermint node configuration for all nodes in the
-    given base path."""
-    logger.debug("Loading Tendermint node group configuration for %d nodes from %s", node_count, base_path)
+    template_file = config_file_template or DEFAULT_TENDERMINT_CONFIG_TEMPLATE
+    logger.debug("Using Tendermint configuration template: %s", template_file)
+    template_config = tendermint_testnet_config(load_toml_config(template_file))
+    template, template_overrides = tendermint_config_template(template_config), tendermint_config_overrides(template_config)
+    rendered_template = render_tendermint_config_template(template)
+    node_count = validators + non_validators
+    if node_count != len(hostnames):
+        raise Exception("Expected %d hostnames for node group %s, but got %d" % (node_count, node_group_name, len(hostnames)))
+    # each node needs a node key and a validator key
+    keys = generate_ed25519_keys(2 * node_count)
     result = []
     for i in range(node_count):
-        node_id = "node%d" % i
-        host_cfg_path = os.path.join(base_path, node_id, "config")
-        config_file = os.path.join(host_cfg_path, "config.toml")
-        config = load_toml_config(config_file)
-        priv_val_key = load_tendermint_priv_validator_key(os.path.join(host_cfg_path, "priv_validator_key.json"))
-        node_key = load_tendermint_node_key(os.path.join(host_cfg_path, "node_key.json"))
+        node_key = TendermintNodeKey(
+            type="tendermint/PrivKeyEd25519",
+            value=base64.b64encode(keys[2*i][0]).decode("utf-8"),
+        )
+        val_priv_key, val_pub_key = keys[2*i+1]
+        priv_val_key = TendermintNodePrivValidatorKey(
+            address=ed25519_pub_key_to_id(val_pub_key).upper(),
+            pub_key=TendermintNodeKey(
+                type="tendermint/PubKeyEd25519",
+                value=base64.b64encode(val_pub_key).decode("utf-8"),
+            ),
+            priv_key=TendermintNodeKey(
+                type="tendermint/PrivKeyEd25519",
+                value=base64.b64encode(val_priv_key).decode("utf-8"),
+            ),
+        )
+        overrides = template_overrides._replace(moniker=hostnames[i])
+        host_cfg_path = os.path.join(workdir, "node%d" % i, "config")
+        save_tendermint_node_files(
+            host_cfg_path,
+            os.path.join(workdir, "node%d" % i, "data"),
+            render_tendermint_config(rendered_template, overrides),
+            priv_val_key,
+            node_key,
+        )
         result.append(
             TendermintNodeConfig(
                 config_path=host_cfg_path,
-                config=config,
+                template=template,
+                overrides=overrides,
                 priv_validator_key=priv_val_key,
                 node_key=node_key,
-                peer_id=tendermint_peer_id(
-                    config["moniker"],
-                    ed25519_pub_key_to_id(
-                        get_ed25519_pub_key(
-                            node_key.value,
-                            "node with configuration at %s" % config_file,
-                        ),
-                    ),
-                ),
+                peer_id=tendermint_peer_id(hostnames[i], ed25519_pub_key_to_id(keys[2*i][1])),
             ),
         )
+    logger.info("Generated configuration for %d node(s) in node group: %s", node_count, node_group_name)
+    return result
+
+
+def generate_ed25519_key():
+    """Generates an ed25519 key pair. Returns a tuple containing the
+    Tendermint-formatted private key (the 32-byte seed followed by the public
+    key) and the 32-byte public key."""
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+    from cryptography.hazmat.primitives.serialization import Encoding, PrivateFormat, PublicFormat, NoEncryption
+
+    priv_key = Ed25519PrivateKey.generate()
+    seed = priv_key.private_bytes(Encoding.Raw, PrivateFormat.Raw, NoEncryption())
+    pub_key = priv_key.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw)
+    return seed + pub_key, pub_key
+
+
+def generate_ed25519_keys(count: int) -> List:
+    """Generates the given number of ed25519 key pairs (see
+    generate_ed25519_key). Each key only takes tens of microseconds to
+    generate, so this isn't worth spreading across processes."""
+    return [generate_ed25519_key() for _ in range(count)]
+
+
+def save_tendermint_node_files(
+    config_path: str,
+    data_path: str,
+    config: str,
+    priv_val_key: TendermintNodePrivValidatorKey,
+    node_key: TendermintNodeKey,
+):
+    """Writes out the (rendered) configuration, keys and initial validator
+    state for a single node, in the same format as the `tendermint testnet`
+    command."""
+    ensure_path_exists(config_path)
+    ensure_path_exists(data_path)
+    with open(os.path.join(config_path, "config.toml"), "wt") as f:
+        f.write(config)
+    save_json_config(os.path.join(config_path, "node_key.json"), {
+        "priv_key": {"type": node_key.type, "value": node_key.value},
+    })
+    save_json_config(os.path.join(config_path, "priv_validator_key.json"), {
+        "address": priv_val_key.address,
+        "pub_key": {"type": priv_val_key.pub_key.type, "value": priv_val_key.pub_key.value},
+        "priv_key": {"type": priv_val_key.priv_key.type, "value": priv_val_key.priv_key.value},
+    })
+    save_json_config(os.path.join(data_path, "priv_validator_state.json"), {
+        "height": "0",
+        "round": "0",
+        "step": 0,
+    })
+
+
+def tendermint_load_nodes_config(base_path: str, node_count: int, cache_file: str = None) -> List[TendermintNodeConfig]:
+    """Loads the relevant Tendermint node configuration for all nodes in the
+    given base path. If `cache_file` is given, nodes whose files haven't
+    changed since they were last loaded or written are loaded from that
+    configuration cache, and the rest are parsed in parallel."""
+    logger.debug("Loading Tendermint node group configuration for %d nodes from %s", node_count, base_path)
+    cache = load_nodes_config_cache(cache_file) if cache_file is not None else dict()
+    host_cfg_paths = [os.path.join(base_path, "node%d" % i, "config") for i in range(node_count)]
+    result = [cached_tendermint_node_config(cache, host_cfg_path) for host_cfg_path in host_cfg_paths]
+    missing = [i for i in range(node_count) if result[i] is None]
+    logger.debug("Found %d of %d node(s) in configuration cache", node_count - len(missing), node_count)
+    if not missing:
+        return result
+
+    missing_paths = [host_cfg_paths[i] for i in missing]
+    if len(missing) < CONFIG_LOAD_THREAD_POOL_THRESHOLD:
+        loaded = [load_tendermint_node_config(host_cfg_path) for host_cfg_path in missing_paths]
+    else:
+        with ThreadPoolExecutor(max_workers=CONFIG_LOAD_WORKERS) as executor:
+            loaded = list(executor.map(load_tendermint_node_config, missing_paths))
+    for i, node_cfg in zip(missing, loaded):
+        result[i] = node_cfg
+    result = share_tendermint_config_templates(result)
+    if cache_file is not None:
+        save_nodes_config_cache(cache_file, result)
+    return result
+
+
+def share_tendermint_config_templates(nodes: List[TendermintNodeConfig]) -> List[TendermintNodeConfig]:
+    """Replaces nodes' configuration templates that are equal to one another
+    with a single shared template."""
+    templates = []
+    result = []
+    for node_cfg in nodes:
+        shared = next((template for template in templates if template is node_cfg.template or template == node_cfg.template), None)
+        if shared is None:
+            templates.append(node_cfg.template)
+            shared = node_cfg.template
+        result.append(node_cfg if shared is node_cfg.template else node_cfg._replace(template=shared))
     return result
 
 
-def tendermint_finalize_config(cfg: "TestnetConfig", tendermint_config: Dict[str, List[TendermintNodeConfig]]):
+def load_tendermint_node_config(host_cfg_path: str) -> TendermintNodeConfig:
+    config_file = os.path.join(host_cfg_path, "config.toml")
+    config = load_toml_config(config_file)
+    priv_val_key = load_tendermint_priv_validator_key(os.path.join(host_cfg_path, "priv_validator_key.json"))
+    node_key = load_tendermint_node_key(os.path.join(host_cfg_path, "node_key.json"))
+    return TendermintNodeConfig(
+        config_path=host_cfg_path,
+        template=tendermint_config_template(config),
+        overrides=tendermint_config_overrides(config),
+        priv_validator_key=priv_val_key,
+        node_key=node_key,
+        peer_id=tendermint_peer_id(
+            config["moniker"],
+            ed25519_pub_key_to_id(
+                get_ed25519_pub_key(
+                    node_key.value,
+                    "node with configuration at %s" % config_file,
+                ),
+            ),
+        ),
+    )
+
+
+def tendermint_node_files_stat(host_cfg_path: str) -> Dict[str, List[int]]:
+    """Returns the modification time and size of each of the files from which
+    a node's configuration is loaded, or None if any of them are missing."""
+    result = dict()
+    for filename in ["config.toml", "priv_validator_key.json", "node_key.json"]:
+        try:
+            st = os.stat(os.path.join(host_cfg_path, filename))
+        except FileNotFoundError:
+            return None
+        result[filename] = [st.st_mtime_ns, st.st_size]
+    return result
+
+
+def cached_tendermint_node_config(cache: Dict, host_cfg_path: str) -> TendermintNodeConfig:
+    """Returns the given node's configuration from the given cache, or None if
+    it isn't cached or if its files have changed since it was cached."""
+    entry = cache.get("nodes", dict()).get(host_cfg_path, None)
+    if entry is None or entry["stat"] != tendermint_node_files_stat(host_cfg_path):
+        return None
+    address, pub_key, priv_key = entry["priv_validator_key"]
+    return TendermintNodeConfig(
+        config_path=host_cfg_path,
+        template=cache["templates"][entry["template"]],
+        overrides=TendermintNodeConfigOverrides(*entry["overrides"]),
+        priv_validator_key=TendermintNodePrivValidatorKey(
+            address=address,
+            pub_key=TendermintNodeKey(*pub_key),
+            priv_key=TendermintNodeKey(*priv_key),
+        ),
+        node_key=TendermintNodeKey(*entry["node_key"]),
+        peer_id=entry["peer_id"],
+    )
+
+
+def load_nodes_config_cache(cache_file: str) -> Dict:
+    if not os.path.isfile(cache_file):
+        return dict()
+    try:
+        with open(cache_file, "rt") as f:
+            return json.load(f)
+    except ValueError as e:
+        logger.warning("Ignoring corrupt node configuration cache %s: %s", cache_file, e)
+        return dict()
+
+
+def save_nodes_config_cache(cache_file: str, nodes: List[TendermintNodeConfig]):
+    """Caches the given nodes' configuration in the given file, along with the
+    current modification times and sizes of their files. Shared configuration
+    templates are only cached once. As the cache contains the nodes' keys, it's
+    only readable by the current user."""
+    cache = {"templates": [], "nodes": dict()}
+    template_ids = dict()
+    for node_cfg in nodes:
+        stat = tendermint_node_files_stat(node_cfg.config_path)
+        if stat is None:
+            continue
+        if id(node_cfg.template) not in template_ids:
+            template_ids[id(node_cfg.template)] = len(cache["templates"])
+            cache["templates"].append(node_cfg.template)
+        cache["nodes"][node_cfg.config_path] = {
+            "stat": stat,
+            "template": template_ids[id(node_cfg.template)],
+            "overrides": node_cfg.overrides,
+            "priv_validator_key": node_cfg.priv_validator_key,
+            "node_key": node_cfg.node_key,
+            "peer_id": node_cfg.peer_id,
+        }
+    ensure_path_exists(os.path.dirname(cache_file))
+    with tempfile.NamedTemporaryFile("wt", dir=os.path.dirname(cache_file), delete=False) as f:
+        json.dump(cache, f)
+    os.replace(f.name, cache_file)
+    logger.debug("Cached configuration for %d node(s) in %s", len(cache["nodes"]), cache_file)
+
+
+def tendermint_finalize_config(
+    cfg: "TestnetConfig",
+    tendermint_config: Dict[str, List[TendermintNodeConfig]],
+    max_workers: int = CONFIG_WRITE_WORKERS,
+):
+    """Writes out every node's final configuration and genesis file.
+
+    Each group's peer lists are joined once, and each node's own list is sliced
+    out of the joined list (or, with a topology, joined from just the node's
+    own peers), so deriving it only costs as much as the list itself. Each of
+    the group's configuration templates is rendered once, after which each
+    node's overrides are substituted into the rendered text. See
+    benchmarks/finalize_config.py.
+    """
+    import pytz
+
     genesis_doc = {
         # amino is very particular about this format, and must be in UTC
         "genesis_time": pytz.utc.localize(datetime.datetime.utcnow()).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
@@ -1326,25 +2852,43 @@ def tendermint_finalize_config(cfg: "TestnetConfig", tendermint_config: Dict[str
         "validators": [],
         "app_hash": "",
     }
+    writers = []
+    finalized = dict()
     for node_group_name, node_group_cfg in cfg.node_groups.items():
-        # first handle persistent peers for this group
-        persistent_peers = unique_peer_ids(
+        # first handle persistent peers for this group, which either form a
+        # full mesh or are given by the group's topology
+        persistent_peers = make_peer_list(unique_peer_ids(
             node_group_cfg.persistent_peers, 
             tendermint_config,
-        )
+        )) if node_group_cfg.topology is None else None
+        topology_peers = tendermint_topology_peers(
+            cfg,
+            node_group_name,
+            tendermint_config,
+        ) if node_group_cfg.topology is not None else None
         # then handle seeds for this group
-        seeds = unique_peer_ids(
+        seeds = make_peer_list(unique_peer_ids(
             node_group_cfg.use_seeds, 
             tendermint_config,
-        )
-
-        # update this node group's configuration
-        for node_cfg in tendermint_config[node_group_name]:
-            _cfg = deepcopy(node_cfg.config)
-            _cfg["p2p"]["persistent_peers"] = ",".join(persistent_peers - {node_cfg.peer_id})
-            _cfg["p2p"]["seeds"] = ",".join(seeds - {node_cfg.peer_id})
-            # write out the updated configuration TOML file
-            save_toml_config(os.path.join(node_cfg.config_path, "config.toml"), _cfg)
+        ))
+
+        template, rendered_template = None, None
+        finalized[node_group_name] = []
+        for i, node_cfg in enumerate(tendermint_config[node_group_name]):
+            if node_cfg.template is not template:
+                template, rendered_template = node_cfg.template, render_tendermint_config_template(node_cfg.template)
+            overrides = node_cfg.overrides._replace(
+                persistent_peers=(
+                    peer_list_without(persistent_peers, node_cfg.peer_id) if topology_peers is None else topology_peers[i]
+                ),
+                seeds=peer_list_without(seeds, node_cfg.peer_id),
+            )
+            writers.append(make_tendermint_config_writer(
+                os.path.join(node_cfg.config_path, "config.toml"),
+                rendered_template,
+                overrides,
+            ))
+            finalized[node_group_name].append(node_cfg._replace(overrides=overrides))
 
             # if this group needs to be in the genesis file
             if node_group_cfg.validators and node_group_cfg.in_genesis:
@@ -1355,16 +2899,419 @@ def tendermint_finalize_config(cfg: "TestnetConfig", tendermint_config: Dict[str
                         "value": node_cfg.priv_validator_key.pub_key.value,
                     },
                     "power": "%d" % node_group_cfg.power,
-                    "name": node_cfg.config["moniker"],
+                    "name": node_cfg.overrides.moniker,
                 })
-        
-    # write all nodes' genesis files
+
+    # the genesis file is identical for all nodes, so it's stored once and
+    # linked into each node's configuration
+    artifacts_path = testnet_artifacts(cfg)
+    genesis_hash = save_artifact(artifacts_path, json.dumps(genesis_doc, indent=2).encode("utf-8"))
+    logger.debug("Stored genesis file as artifact %s", genesis_hash)
+    shared_files = {"config/genesis.json": genesis_hash}
     for node_group_name, node_group_cfg in cfg.node_groups.items():
         for node_cfg in tendermint_config[node_group_name]:
-            node_genesis_file = os.path.join(node_cfg.config_path, "genesis.json")
-            with open(node_genesis_file, "wt") as f:
-                json.dump(genesis_doc, f, indent=2)
-            logger.debug("Wrote genesis file: %s", node_genesis_file)
+            writers.append(make_artifact_linker(
+                artifacts_path,
+                genesis_hash,
+                os.path.join(node_cfg.config_path, "genesis.json"),
+            ))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for filename in executor.map(lambda writer: writer(), writers):
+            logger.debug("Wrote %s", filename)
+
+        # pack each node's own files into a single archive (the shared files
+        # are shipped separately)
+        config_archives = OrderedDict()
+        for node_group_name in cfg.node_groups.keys():
+            config_archives[node_group_name] = list(executor.map(
+                lambda node_cfg: save_artifact(
+                    artifacts_path,
+                    pack_node_files(os.path.dirname(node_cfg.config_path), exclude=shared_files.keys()),
+                ),
+                tendermint_config[node_group_name],
+            ))
+
+    # keep each node group's configuration cache in step with what was written
+    for node_group_name, nodes in finalized.items():
+        save_nodes_config_cache(testnet_nodes_config_cache(cfg, node_group_name), nodes)
+
+    tendermint_workdir = os.path.join(cfg.home, cfg.id, "tendermint")
+    save_yaml_config(os.path.join(tendermint_workdir, "shared-files.yaml"), shared_files)
+    save_yaml_config(os.path.join(tendermint_workdir, "config-archives.yaml"), dict(config_archives))
+    prune_artifacts(
+        artifacts_path,
+        keep=set(shared_files.values()) | set([h for hashes in config_archives.values() for h in hashes]),
+    )
+
+
+def tendermint_config_template(config: Dict) -> Dict:
+    """Returns a shallow copy of the given node configuration in which the
+    values that can be overridden per node are replaced by placeholders."""
+    template = dict(config)
+    template["moniker"] = CONFIG_PLACEHOLDERS["moniker"]
+    template["p2p"] = dict(template.get("p2p", {}))
+    template["p2p"]["persistent_peers"] = CONFIG_PLACEHOLDERS["persistent_peers"]
+    template["p2p"]["seeds"] = CONFIG_PLACEHOLDERS["seeds"]
+    return template
+
+
+def tendermint_testnet_config(config: Dict) -> Dict:
+    """Returns a shallow copy of the given configuration with the same P2P
+    settings overridden as `tendermint testnet` would."""
+    result = dict(config)
+    result["p2p"] = dict(result.get("p2p", {}), **TENDERMINT_TESTNET_P2P_CONFIG)
+    return result
+
+
+def tendermint_config_overrides(config: Dict) -> TendermintNodeConfigOverrides:
+    """Extracts the values that can be overridden per node from the given node
+    configuration."""
+    p2p = config.get("p2p", {})
+    return TendermintNodeConfigOverrides(
+        moniker=config.get("moniker", ""),
+        persistent_peers=p2p.get("persistent_peers", ""),
+        seeds=p2p.get("seeds", ""),
+    )
+
+
+def render_tendermint_config_template(template: Dict) -> str:
+    import toml
+
+    return toml.dumps(template)
+
+
+def render_tendermint_config(rendered_template: str, overrides: TendermintNodeConfigOverrides) -> str:
+    """Substitutes the given node's overrides into its rendered configuration
+    template."""
+    content = rendered_template
+    for key, value in overrides._asdict().items():
+        content = content.replace(toml_string(CONFIG_PLACEHOLDERS[key]), toml_string(value), 1)
+    return content
+
+
+def make_tendermint_config_writer(filename: str, rendered_template: str, overrides: TendermintNodeConfigOverrides):
+    def tendermint_config_writer():
+        with open(filename, "wt") as f:
+            f.write(render_tendermint_config(rendered_template, overrides))
+        return filename
+    return tendermint_config_writer
+
+
+def pack_node_files(node_path: str, exclude=()) -> bytes:
+    """Packs all of the files in the given node's directory (apart from those
+    whose relative paths are in `exclude`) into a gzipped tarball. Timestamps
+    and ownership are left out of the archive, so unchanged files always
+    produce an identical archive (and therefore the same content hash)."""
+    import gzip
+    import tarfile
+
+    paths = []
+    for root, dirs, files in os.walk(node_path):
+        for name in dirs + files:
+            paths.append(os.path.relpath(os.path.join(root, name), node_path))
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=CONFIG_ARCHIVE_COMPRESSION_LEVEL, mtime=0) as gz:
+        with tarfile.open(fileobj=gz, mode="w") as tar:
+            for path in sorted(paths):
+                if path in exclude:
+                    continue
+                info = tar.gettarinfo(os.path.join(node_path, path), arcname=path)
+                info.mtime, info.uid, info.gid, info.uname, info.gname = 0, 0, 0, "", ""
+                if info.isreg():
+                    with open(os.path.join(node_path, path), "rb") as f:
+                        tar.addfile(info, f)
+                else:
+                    tar.addfile(info)
+    return buf.getvalue()
+
+
+def make_artifact_linker(artifacts_path: str, artifact_hash: str, filename: str):
+    def artifact_linker():
+        link_artifact(artifacts_path, artifact_hash, filename)
+        return filename
+    return artifact_linker
+
+
+def toml_string(value: str) -> str:
+    # TOML basic strings use the same escape sequences as JSON strings
+    return json.dumps(value, ensure_ascii=False)
+
+
+def tendermint_topology_peers(
+    cfg: "TestnetConfig",
+    node_group_name: str,
+    tendermint_config: Dict[str, List[TendermintNodeConfig]],
+) -> List[str]:
+    """Generates the given node group's topology and returns each of its nodes'
+    joined list of persistent peers."""
+    nodes, adjacency = generate_topology(cfg, node_group_name)
+    log_topology_stats(
+        node_group_name,
+        cfg.node_groups[node_group_name].topology,
+        node_group_topology_stats(cfg, node_group_name, nodes, adjacency),
+    )
+    for group, node_id in nodes:
+        if node_id >= len(tendermint_config[group]):
+            raise Exception(
+                "Topology for node group %s refers to node %s[%d], but only %d node(s) are configured" %
+                (node_group_name, group, node_id, len(tendermint_config[group]))
+            )
+    return [
+        ",".join(tendermint_config[nodes[j][0]][nodes[j][1]].peer_id for j in sorted(adjacency[i]))
+        for i in range(len(tendermint_config[node_group_name]))
+    ]
+
+
+def topology_nodes(cfg: "TestnetConfig", node_group_name: str) -> List:
+    """Returns the (group, node ID) pairs of the nodes making up the given node
+    group's topology: the group's own nodes, followed by any other nodes
+    referenced by its persistent peers."""
+    result = OrderedDict()
+    for ref in [TestnetNodeRef(group=node_group_name)] + cfg.node_groups[node_group_name].persistent_peers:
+        if ref.group not in cfg.node_groups:
+            raise Exception("Unrecognized node group \"%s\" in persistent peers for node group %s" % (ref.group, node_group_name))
+        node_ids = range(node_group_node_count(cfg.node_groups[ref.group])) if ref.id is None else [ref.id]
+        for node_id in node_ids:
+            result[(ref.group, node_id)] = None
+    return list(result.keys())
+
+
+def node_group_node_count(node_group_cfg: TestnetNodeGroupConfig) -> int:
+    return sum([region.node_count for region in node_group_cfg.regions.values()])
+
+
+def node_region(node_group_cfg: TestnetNodeGroupConfig, node_id: int) -> str:
+    for region_id, region in node_group_cfg.regions.items():
+        if region.start_id <= node_id < region.start_id + region.node_count:
+            return region_id
+    return None
+
+
+def generate_topology(cfg: "TestnetConfig", node_group_name: str):
+    """Generates the given node group's topology, returning the (group, node ID)
+    pairs of the nodes in the topology along with each node's set of neighbours
+    (as indices into that list). Only links involving at least one of the
+    group's own nodes end up in its nodes' configurations, so links between
+    other groups' nodes are dropped. Each other group's nodes are connected to
+    one another by that group's own configuration, though, so the topology only
+    needs to be connected given those connections (see configured_topology).
+    The same configuration and seed always produce the same topology."""
+    topology = cfg.node_groups[node_group_name].topology
+    nodes = topology_nodes(cfg, node_group_name)
+    own_node_count = node_group_node_count(cfg.node_groups[node_group_name])
+    rng = random.Random(topology.seed)
+    for _ in range(TOPOLOGY_ATTEMPTS):
+        if topology.type == "random-regular":
+            adjacency = random_regular_topology(len(nodes), topology.degree, rng)
+        elif topology.type == "ring-chords":
+            adjacency = ring_chords_topology(len(nodes), topology.degree, rng)
+        else:
+            adjacency = region_clusters_topology(
+                [node_region(cfg.node_groups[group], node_id) for group, node_id in nodes],
+                topology.degree,
+                topology.inter_region_links,
+                rng,
+            )
+        adjacency = realized_topology(adjacency, own_node_count)
+        if topology_is_connected(configured_topology(nodes, adjacency, own_node_count)[1]):
+            return nodes, adjacency
+    raise Exception(
+        "Failed to generate a connected %s topology for node group %s without relying on links between other "
+        "groups' nodes" % (topology.type, node_group_name)
+    )
+
+
+def node_group_topology_stats(cfg: "TestnetConfig", node_group_name: str, nodes: List, adjacency: List[Set[int]]):
+    return topology_stats(*configured_topology(nodes, adjacency, node_group_node_count(cfg.node_groups[node_group_name])))
+
+
+def realized_topology(adjacency: List[Set[int]], own_node_count: int) -> List[Set[int]]:
+    """Drops the links between nodes that don't belong to the node group whose
+    topology this is (i.e. those at or beyond index `own_node_count`), since
+    they're never written into any configuration."""
+    return [
+        neighbours if i < own_node_count else set(j for j in neighbours if j < own_node_count)
+        for i, neighbours in enumerate(adjacency)
+    ]
+
+
+def configured_topology(nodes: List, adjacency: List[Set[int]], own_node_count: int):
+    """Given a node group's realized topology (see realized_topology), returns
+    the links configured between the group's own nodes and the other groups'
+    nodes they link to (other groups' nodes that aren't linked to are left
+    out), along with the same links plus those assumed between each other
+    group's nodes. The latter are the other group's responsibility, and are
+    assumed to be direct links, as in a full mesh."""
+    kept = [i for i in range(len(nodes)) if i < own_node_count or len(adjacency[i]) > 0]
+    index = dict([(i, k) for k, i in enumerate(kept)])
+    links = [set(index[j] for j in adjacency[i]) for i in kept]
+    paths = [set(neighbours) for neighbours in links]
+    other_groups = OrderedDict()
+    for i in kept[own_node_count:]:
+        other_groups.setdefault(nodes[i][0], []).append(index[i])
+    for members in other_groups.values():
+        for a in members:
+            paths[a].update(b for b in members if b != a)
+    return links, paths
+
+
+def complete_topology(n: int) -> List[Set[int]]:
+    return [set(range(n)) - {i} for i in range(n)]
+
+
+def random_regular_topology(n: int, degree: int, rng: random.Random) -> List[Set[int]]:
+    """Generates a connected random topology in which every node has exactly
+    the given number of peers, by randomly pairing up nodes' free connection
+    slots and starting over if it gets stuck."""
+    if n <= degree + 1:
+        return complete_topology(n)
+    if (n * degree) % 2 != 0:
+        raise Exception("A random-regular topology needs an even product of node count and degree (got %d nodes of degree %d)" % (n, degree))
+    for _ in range(TOPOLOGY_ATTEMPTS):
+        adjacency = [set() for _ in range(n)]
+        slots = [i for i in range(n) for _ in range(degree)]
+        while slots:
+            for _ in range(TOPOLOGY_PEER_CANDIDATES):
+                a, b = rng.randrange(len(slots)), rng.randrange(len(slots))
+                u, v = slots[a], slots[b]
+                if u != v and v not in adjacency[u]:
+                    break
+            else:
+                break
+            adjacency[u].add(v)
+            adjacency[v].add(u)
+            for j in sorted([a, b], reverse=True):
+                slots[j] = slots[-1]
+                slots.pop()
+        if not slots and topology_is_connected(adjacency):
+            return adjacency
+    raise Exception("Failed to generate a connected random-regular topology of %d nodes with degree %d" % (n, degree))
+
+
+def ring_chords_topology(n: int, degree: int, rng: random.Random) -> List[Set[int]]:
+    """Generates a topology in which nodes are connected in a ring, and then
+    randomly connected to other nodes (chords) until they have up to the given
+    number of peers."""
+    if n <= degree + 1:
+        return complete_topology(n)
+    adjacency = [set() for _ in range(n)]
+    for i in range(n):
+        adjacency[i].add((i + 1) % n)
+        adjacency[(i + 1) % n].add(i)
+    order = list(range(n))
+    rng.shuffle(order)
+    for u in order:
+        for _ in range(TOPOLOGY_PEER_CANDIDATES):
+            if len(adjacency[u]) >= degree:
+                break
+            v = rng.randrange(n)
+            if v != u and v not in adjacency[u] and len(adjacency[v]) < degree:
+                adjacency[u].add(v)
+                adjacency[v].add(u)
+    return adjacency
+
+
+def region_clusters_topology(
+    regions: List[str],
+    degree: int,
+    inter_region_links: int,
+    rng: random.Random,
+) -> List[Set[int]]:
+    """Generates a topology in which the nodes in each region form a ring with
+    chords, and each pair of regions is connected by up to the given number of
+    links between randomly chosen nodes that have fewer than `degree` peers."""
+    clusters = OrderedDict()
+    for i, region in enumerate(regions):
+        clusters.setdefault(region, []).append(i)
+    adjacency = [set() for _ in range(len(regions))]
+    # leave room in each region for links to other regions, so that no node
+    # ends up with more than `degree` peers
+    cluster_degree = degree if len(clusters) == 1 else degree - 1
+    for members in clusters.values():
+        for a, neighbours in enumerate(ring_chords_topology(len(members), cluster_degree, rng)):
+            adjacency[members[a]].update(members[b] for b in neighbours)
+    region_ids = list(clusters.keys())
+    for x in range(len(region_ids)):
+        for y in range(x + 1, len(region_ids)):
+            for _ in range(inter_region_links):
+                free_x = [u for u in clusters[region_ids[x]] if len(adjacency[u]) < degree]
+                free_y = [v for v in clusters[region_ids[y]] if len(adjacency[v]) < degree]
+                if not free_x or not free_y:
+                    break
+                for _ in range(TOPOLOGY_PEER_CANDIDATES):
+                    u, v = rng.choice(free_x), rng.choice(free_y)
+                    if v not in adjacency[u]:
+                        adjacency[u].add(v)
+                        adjacency[v].add(u)
+                        break
+    return adjacency
+
+
+def topology_distances(adjacency: List[Set[int]], source: int) -> List[int]:
+    """Returns the number of hops from the given node to every other node in the
+    topology (-1 for unreachable nodes)."""
+    distances = [-1] * len(adjacency)
+    distances[source] = 0
+    frontier = [source]
+    while frontier:
+        next_frontier = []
+        for u in frontier:
+            for v in adjacency[u]:
+                if distances[v] < 0:
+                    distances[v] = distances[u] + 1
+                    next_frontier.append(v)
+        frontier = next_frontier
+    return distances
+
+
+def topology_is_connected(adjacency: List[Set[int]]) -> bool:
+    return len(adjacency) == 0 or min(topology_distances(adjacency, 0)) >= 0
+
+
+def topology_stats(adjacency: List[Set[int]], paths: List[Set[int]] = None) -> OrderedDictType:
+    """Computes degree and diameter statistics for the given (connected)
+    topology. If given, distances are measured over `paths` (the same nodes
+    with additional links) instead. For large topologies, the diameter and mean
+    path length are estimated from a fixed sample of nodes."""
+    n = len(adjacency)
+    degrees = [len(neighbours) for neighbours in adjacency]
+    paths = adjacency if paths is None else paths
+    exact = n <= TOPOLOGY_DIAMETER_SAMPLES
+    sources = range(n) if exact else random.Random(0).sample(range(n), TOPOLOGY_DIAMETER_SAMPLES)
+    eccentricities, total_distance = [], 0
+    for source in sources:
+        distances = topology_distances(paths, source)
+        eccentricities.append(max(distances))
+        total_distance += sum(distances)
+    stats = OrderedDict()
+    stats["nodes"] = n
+    stats["links"] = sum(degrees) // 2
+    stats["min_degree"] = min(degrees) if n > 0 else 0
+    stats["max_degree"] = max(degrees) if n > 0 else 0
+    stats["mean_degree"] = (sum(degrees) / n) if n > 0 else 0.0
+    stats["diameter"] = max(eccentricities) if n > 0 else 0
+    stats["diameter_exact"] = exact
+    stats["mean_path_length"] = (total_distance / (len(sources) * (n - 1))) if n > 1 else 0.0
+    return stats
+
+
+def log_topology_stats(node_group_name: str, topology: TestnetTopologyConfig, stats: OrderedDictType):
+    logger.info(
+        "Node group %s: %s topology (seed %d) of %d node(s) with %d link(s), degree min/mean/max %d/%.2f/%d, "
+        "diameter %s%d, mean path length %.2f",
+        node_group_name,
+        topology.type,
+        topology.seed,
+        stats["nodes"],
+        stats["links"],
+        stats["min_degree"],
+        stats["mean_degree"],
+        stats["max_degree"],
+        "" if stats["diameter_exact"] else ">=",
+        stats["diameter"],
+        stats["mean_path_length"],
+    )
 
 
 def ansible_deploy_tendermint(
@@ -1373,17 +3320,51 @@ def ansible_deploy_tendermint(
     binaries: Dict[str, str],
     ec2_private_key_path: str,
     truncate_logs: bool = False,
+    node_groups: List[str] = None,
+    log_output: bool = False,
+    binary_distribution: str = DEFAULT_BINARY_DISTRIBUTION,
+    retry_failed: int = 0,
+    node_refs: List[TestnetNodeRef] = None,
+    copy_node_config: bool = True,
+    file_suffix: str = None,
 ):
+    """Deploys the Tendermint configuration for the given node groups (or all
+    node groups if `node_groups` is None), or just the nodes referenced by
+    `node_refs` if given, and starts the relevant nodes. Unless
+    `copy_node_config` is set, only the Tendermint binary is (re)installed, and
+    the nodes' existing configuration and data are kept. If `log_output` is
+    set, Ansible's output is written to a log file instead of to stdout. Hosts
+    that fail are retried up to `retry_failed` times.
+
+    With "regional" binary distribution, the first host of each node group in
+    each region is the seed from which the rest of the group's hosts in that
+    region fetch their binary (so seeds are included in retries of the hosts
+    that depend on them)."""
     workdir = os.path.join(cfg.home, cfg.id, "tendermint")
     if not os.path.isdir(workdir):
         raise Exception("Missing working directory: %s" % workdir)
     
-    logger.info("Generating Ansible configuration for all node groups")
+    if file_suffix is None:
+        file_suffix = "" if node_groups is None else "-%s" % "-".join(node_groups)
+    logger.info(
+        "Generating Ansible configuration for %s",
+        "all node groups" if node_groups is None else "node group(s): %s" % ", ".join(node_groups),
+    )
     inventory = OrderedDict()
     inventory["tendermint"] = []
     node_group_vars = dict()
+    retry_dependencies = dict()
+    # each node's configuration is shipped as a single archive, named by its
+    # content hash
+    shared_files_file = os.path.join(workdir, "shared-files.yaml")
+    config_archives_file = os.path.join(workdir, "config-archives.yaml")
+    config_archives = load_yaml_config(config_archives_file) if os.path.isfile(config_archives_file) else dict()
     # first we generate the Ansible extra-vars and inventory for all node groups
     for node_group_name, node_group_cfg in cfg.node_groups.items():
+        if node_groups is not None and node_group_name not in node_groups:
+            continue
+        if node_refs is not None and not any([ref.group == node_group_name for ref in node_refs]):
+            continue
         node_group_vars[node_group_name] = {
             "service_name": "tendermint",
             "service_user": "tendermint",
@@ -1394,57 +3375,96 @@ def ansible_deploy_tendermint(
             "service_desc": "Tendermint",
             "service_exec_cmd": "/usr/bin/tendermint node",
             "src_binary": binaries[node_group_cfg.binary],
+            "src_binary_sha256": file_sha256(binaries[node_group_cfg.binary]),
             "dest_binary": "/usr/bin/tendermint",
-            "src_config_path": os.path.join(workdir, node_group_name, "config"),
         }
         outputs = tendermint_outputs[node_group_name]
+        if copy_node_config and len(config_archives.get(node_group_name, [])) != len(outputs["inventory_ordered"]):
+            raise Exception("Missing configuration archives for node group %s - has its configuration been finalized?" % node_group_name)
         i = 0
+        region_seeds = dict()
         for hostname in outputs["inventory_ordered"]:
+            if node_refs is not None and not any([
+                ref.group == node_group_name and (ref.id is None or ref.id == i) for ref in node_refs
+            ]):
+                i += 1
+                continue
             node_id = "node%d" % i
+            alias = "%s__%s" % (node_group_name, node_id)
+            region_seed = region_seeds.setdefault(node_region(node_group_cfg, i), alias)
+            if binary_distribution == "regional" and region_seed != alias:
+                retry_dependencies[alias] = region_seed
             inventory["tendermint"].append(
                 AnsibleInventoryEntry(
-                    alias="%s__%s" % (node_group_name, node_id),
+                    alias=alias,
                     ansible_host=hostname,
                     node_group=node_group_name,
                     node_id=node_id,
+                    config_archive=config_archives[node_group_name][i] if copy_node_config else None,
+                    binary_seed=region_seed,
                 ),
             )
             i += 1
     
+    # files shared between all nodes are shipped once per host by content hash
     extra_vars = {
         "node_groups": node_group_vars,
         "truncate_logs": truncate_logs,
+        "copy_node_config": copy_node_config,
+        "artifacts_path": testnet_artifacts(cfg),
+        "binary_distribution": binary_distribution,
+        "binary_distribution_port": BINARY_DISTRIBUTION_PORT,
+        "binary_distribution_timeout": BINARY_DISTRIBUTION_TIMEOUT,
+        "shared_files": load_yaml_config(shared_files_file) if os.path.isfile(shared_files_file) else dict(),
     }
 
-    inventory_file = os.path.join(workdir, "inventory")
+    inventory_file = os.path.join(workdir, "inventory%s" % file_suffix)
     save_ansible_inventory(inventory_file, inventory)
-    extra_vars_file = os.path.join(workdir, "extra-vars.yaml")
+    extra_vars_file = os.path.join(workdir, "extra-vars%s.yaml" % file_suffix)
     save_yaml_config(extra_vars_file, extra_vars)
 
-    logger.info("Deploying Tendermint network")
-    sh([
-        "ansible-playbook",
-        "-i", inventory_file,
-        "-e", "@%s" % extra_vars_file,
-        "-u", "ec2-user",
-        "--private-key", ec2_private_key_path,
-        os.path.join("tendermint", "ansible", "deploy.yaml"),
-    ])
+    logger.info("Deploying Tendermint network%s", "" if node_groups is None else " node group(s): %s" % ", ".join(node_groups))
+    sh(
+        [
+            "ansible-playbook",
+            "-i", inventory_file,
+            "-e", "@%s" % extra_vars_file,
+            "-u", "ec2-user",
+            "--private-key", ec2_private_key_path,
+        ] + ansible_ssh_args(testnet_known_hosts(cfg)) + [
+            os.path.join("tendermint", "ansible", "deploy.yaml"),
+        ],
+        log_file=os.path.join(workdir, "ansible-deploy%s.log" % file_suffix) if log_output else None,
+        env=ansible_timings_env(os.path.join(testnet_timings(cfg), "deploy%s.jsonl" % file_suffix)),
+        retry_failed=retry_failed,
+        retry_dependencies=retry_dependencies,
+    )
     logger.info("Tendermint network successfully deployed")
 
 
-def ansible_set_tendermint_nodes_state(
+def set_tendermint_nodes_state(
     workdir: str,
     refs: List[TestnetNodeRef],
     node_group_abcis: Dict[str, str], # mapping of node group names to ABCI names
     abci_configs: Dict[str, TestnetABCIConfig], # mapping of ABCI config names to ABCI configs
     ec2_private_key_path: str,
+    known_hosts: str,
     state: str,
     fail_on_missing: bool = True,
     fail_on_error: bool = True,
+    ssh_control_path: str = None,
+    ssh_parallelism: int = DEFAULT_SSH_PARALLELISM,
+    timings_path: str = None,
+    retry_failed: int = 0,
 ):
     """Attempts to collect all nodes' details from the given references list
-    and ensure that they are all set to the desired state (Ansible state)."""
+    and ensure that they are all set to the desired state (Ansible state). ABCI
+    applications' states are changed using their Ansible playbooks (which are
+    all executed concurrently, as they apply to different hosts), while the
+    Tendermint service on each host is controlled directly over SSH. If
+    `timings_path` is given, the ABCI playbooks' timings are recorded there.
+    Both the ABCI playbooks and the Tendermint service changes are rerun up to
+    `retry_failed` times on the hosts on which they failed."""
     valid_states = {"started", "stopped", "restarted"}
     if state not in valid_states:
         raise Exception("Desired service state must be one of: %s", ", ".join(valid_states))
@@ -1456,9 +3476,9 @@ def ansible_set_tendermint_nodes_state(
     for host_ref in host_refs:
         node_group_abci = node_group_abcis.get(host_ref.group, None)
         if node_group_abci is not None:
-            if host_ref.group not in hostnames_by_abci:
-                hostnames_by_abci[host_ref.group] = []
-            hostnames_by_abci[host_ref.group].append(host_ref.hostname)
+            if node_group_abci not in hostnames_by_abci:
+                hostnames_by_abci[node_group_abci] = []
+            hostnames_by_abci[node_group_abci].append(host_ref.hostname)
 
     if len(host_refs) == 0:
         logger.info("No deployed hosts' states to change")
@@ -1468,7 +3488,8 @@ def ansible_set_tendermint_nodes_state(
 
     ok = True
     with tempfile.TemporaryDirectory() as tmpdir:
-        abci_playbook_cmds = []
+        abci_playbook_cmds = OrderedDict()
+        abci_playbook_envs = dict()
 
         inventory_file = os.path.join(tmpdir, "inventory")
         inventory = OrderedDict()
@@ -1484,53 +3505,550 @@ def ansible_set_tendermint_nodes_state(
             if isinstance(abci_cfg.extra_vars, dict):
                 extra_vars.update(abci_cfg.extra_vars)
             save_yaml_config(abci_extra_vars_file, extra_vars)
-            abci_playbook_cmds.append([("%s hosts for ABCI configuration: %s" % (state_verb.capitalize(), abci_config_name),
+            abci_playbook_desc = "%s hosts for ABCI configuration: %s" % (state_verb, abci_config_name)
+            if timings_path is not None:
+                abci_playbook_envs[abci_playbook_desc] = ansible_timings_env(
+                    os.path.join(timings_path, "abci-%s-%s.jsonl" % (abci_config_name, state)),
+                )
+            abci_playbook_cmds[abci_playbook_desc] = [
                 "ansible-playbook",
                 "-i", inventory_file,
                 "-u", "ec2-user",
                 "-e", "@%s" % abci_extra_vars_file,
                 "--private-key", ec2_private_key_path,
+            ] + ansible_ssh_args(known_hosts) + [
                 abci_cfg.playbook,
-            )])
+            ]
         save_ansible_inventory(inventory_file, inventory)
-        
-        tendermint_playbook_cmd = [
-            "ansible-playbook",
-            "-i", inventory_file,
-            "-u", "ec2-user",
-            "-e", "state=%s" % state,
-            "--private-key", ec2_private_key_path,
-            os.path.join("tendermint", "ansible", "tendermint-state.yaml"),
-        ]
-        cmds = [("Changing Tendermint nodes' state", tendermint_playbook_cmd)]
+
+        tendermint_state_changer = make_ssh_tendermint_state_changer(
+            host_refs,
+            state,
+            ec2_private_key_path,
+            known_hosts,
+            ssh_control_path,
+            ssh_parallelism,
+            retry_failed=retry_failed,
+        )
+        steps = [("Changing Tendermint nodes' state", tendermint_state_changer)]
+        abci_steps = [(
+            "%s %d ABCI application(s) concurrently" % (state_verb.capitalize(), len(abci_playbook_cmds)),
+            make_abci_state_changer(
+                abci_playbook_cmds,
+                "%s ABCI applications" % ("start" if state in {"started", "restarted"} else "stop"),
+                envs=abci_playbook_envs,
+                retry_failed=retry_failed,
+            ),
+        )] if abci_playbook_cmds else []
         # if we're starting, we need to start the ABCI apps first
         if state in {"started", "restarted"}:
-            cmds = abci_playbook_cmds + cmds
+            steps = abci_steps + steps
         else:
             # otherwise, if we're stopping, we need to stop the ABCI apps last
-            cmds = cmds + abci_playbook_cmds
+            steps = steps + abci_steps
 
         try:
-            for desc_cmd in cmds:
-                desc, cmd = desc_cmd
+            for desc, step in steps:
                 logger.info(desc)
-                sh(cmd)
+                step()
         except Exception as e:
             ok = False
             if fail_on_error:
                 raise e
+            logger.error("%s", e)
             logger.info("Failed %s hosts - skipping", state_verb)
 
     if ok:
         logger.info("Hosts' state successfully set to \"%s\"", state)
 
 
+def make_abci_state_changer(playbook_cmds: OrderedDictType, desc: str, envs: Dict = None, retry_failed: int = 0):
+    """Returns a function that executes all of the given ABCI playbook commands
+    concurrently, keeping each playbook's output separate. Failures are
+    reported together once all of the playbooks have completed."""
+    def state_changer():
+        sh_all(playbook_cmds, len(playbook_cmds), desc, envs=envs, retry_failed=retry_failed)
+    return state_changer
+
+
+def make_ssh_tendermint_state_changer(
+    host_refs: List[TestnetHostRef],
+    state: str,
+    ec2_private_key_path: str,
+    known_hosts: str,
+    control_path: str,
+    max_workers: int,
+    retry_failed: int = 0,
+):
+    """Returns a function that sets the Tendermint service on all of the given
+    hosts to the given state concurrently (for at most `max_workers` hosts at a
+    time) over SSH. Hosts on which this fails are retried up to `retry_failed`
+    times. If any hosts still fail, all failures are reported together."""
+    action = {"started": "start", "stopped": "stop", "restarted": "restart"}[state]
+
+    def state_changer():
+        tasks = OrderedDict()
+        for host_ref in host_refs:
+            tasks["%s (%s)" % (testnet_node_ref_to_str(host_ref), host_ref.hostname)] = make_ssh_runner(
+                host_ref.hostname,
+                "sudo systemctl %s tendermint" % action,
+                ec2_private_key_path,
+                known_hosts,
+                control_path,
+            )
+        start = time.monotonic()
+        run_in_parallel(tasks, max_workers, "%s Tendermint" % action, retry_failed=retry_failed)
+        logger.info("Tendermint service %s on %d host(s) in %.2f seconds", state, len(host_refs), time.monotonic() - start)
+
+    return state_changer
+
+
+def make_ssh_runner(hostname: str, remote_cmd: str, ec2_private_key_path: str, known_hosts: str, control_path: str):
+    def runner():
+        result = run_command(ssh_command(hostname, remote_cmd, ec2_private_key_path, known_hosts, control_path), echo=False)
+        if result.returncode != 0:
+            raise Exception("Command \"%s\" failed with return code %d: %s" % (remote_cmd, result.returncode, result.output.strip()))
+        logger.debug("Executed \"%s\" on %s in %.2f seconds", remote_cmd, hostname, result.wall_time)
+        return result
+    return runner
+
+
+def ssh_command(
+    hostname: str,
+    remote_cmd: str,
+    ec2_private_key_path: str,
+    known_hosts: str,
+    control_path: str = None,
+) -> List[str]:
+    """Builds the SSH command to execute the given command on the given host as
+    ec2-user. If `control_path` is given, the connection to the host is
+    multiplexed over a master connection whose socket is kept at that path,
+    which is reused by subsequent commands."""
+    cmd = [
+        "ssh",
+        "-i", ec2_private_key_path,
+        "-o", "UserKnownHostsFile=%s" % known_hosts,
+        "-o", "BatchMode=yes",
+        "-o", "ConnectTimeout=%d" % SSH_CONNECT_TIMEOUT,
+    ]
+    if control_path is not None:
+        ensure_path_exists(os.path.dirname(control_path))
+        cmd += [
+            "-o", "ControlMaster=auto",
+            "-o", "ControlPath=%s" % control_path,
+            "-o", "ControlPersist=%d" % SSH_CONTROL_PERSIST,
+        ]
+    return cmd + ["ec2-user@%s" % hostname, remote_cmd]
+
+
+def rolling_waves(items: List, wave_size: str) -> List[List]:
+    """Splits the given items into consecutive waves of the given size, which is
+    either a number of items (e.g. "5") or a percentage of them (e.g. "10%")."""
+    wave_size = str(wave_size).strip()
+    try:
+        if wave_size.endswith("%"):
+            percentage = float(wave_size[:-1])
+            if percentage <= 0 or percentage > 100:
+                raise ValueError()
+            size = int(math.ceil(len(items) * percentage / 100.0))
+        else:
+            size = int(wave_size)
+            if size < 1:
+                raise ValueError()
+    except ValueError:
+        raise Exception("Invalid wave size \"%s\": must be a positive number of nodes or a percentage between 0%% and 100%%" % wave_size)
+    size = max(1, size)
+    return [items[i:i+size] for i in range(0, len(items), size)]
+
+
+def tendermint_rpc_session(max_hosts: int):
+    """Creates an HTTP session for querying the RPC endpoints of up to
+    `max_hosts` nodes concurrently, keeping a connection open to each."""
+    import requests
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=max(1, max_hosts), pool_maxsize=2)
+    session.mount("http://", adapter)
+    return session
+
+
+def tendermint_rpc_query(hostname: str, endpoint: str, session=None) -> Dict:
+    """Queries the given RPC endpoint (e.g. "status") of the given node.
+    Returns the result, or raises an exception if the node could not be
+    queried."""
+    import requests
+
+    response = (session or requests).get(
+        "http://%s:%d/%s" % (hostname, TENDERMINT_RPC_PORT, endpoint),
+        timeout=(RPC_CONNECT_TIMEOUT, RPC_REQUEST_TIMEOUT),
+    )
+    response.raise_for_status()
+    body = response.json()
+    if "error" in body:
+        raise Exception("RPC error from %s/%s: %s" % (hostname, endpoint, body["error"]))
+    return body.get("result", body)
+
+
+def tendermint_node_status(hostname: str, session=None) -> Dict:
+    """Queries the given node's RPC /status endpoint. Returns the status result,
+    or None if the node could not be queried."""
+    try:
+        return tendermint_rpc_query(hostname, "status", session=session)
+    except Exception as e:
+        logger.debug("Failed to query status of %s: %s", hostname, e)
+        return None
+
+
+def tendermint_nodes_status(host_refs: List[TestnetHostRef]) -> List[TendermintNodeStatus]:
+    """Queries the /status and /net_info RPC endpoints of all of the given
+    nodes concurrently. Nodes that could not be queried have their `error`
+    set."""
+    if len(host_refs) == 0:
+        return []
+    queries = [(host_ref.hostname, endpoint) for host_ref in host_refs for endpoint in ["status", "net_info"]]
+    results = dict()
+    with tendermint_rpc_session(len(host_refs)) as session:
+        def query(hostname_endpoint):
+            try:
+                return tendermint_rpc_query(*hostname_endpoint, session=session)
+            except Exception as e:
+                logger.debug("Failed to query %s of %s: %s", hostname_endpoint[1], hostname_endpoint[0], e)
+                return e
+
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            for hostname_endpoint, result in zip(queries, executor.map(query, queries)):
+                results[hostname_endpoint] = result
+
+    statuses = []
+    for host_ref in host_refs:
+        status, net_info = results[(host_ref.hostname, "status")], results[(host_ref.hostname, "net_info")]
+        height, catching_up, peers, errors = None, None, None, []
+        if isinstance(status, Exception):
+            errors.append("status: %s" % status)
+        else:
+            try:
+                height, catching_up = tendermint_status_sync_info(status)
+            except Exception as e:
+                errors.append("status: %s" % e)
+        if isinstance(net_info, Exception):
+            errors.append("net_info: %s" % net_info)
+        else:
+            try:
+                peers = int(net_info["n_peers"])
+            except (KeyError, TypeError, ValueError) as e:
+                errors.append("net_info: malformed response (%s)" % repr(e))
+        statuses.append(TendermintNodeStatus(
+            group=host_ref.group,
+            id=host_ref.id,
+            hostname=host_ref.hostname,
+            height=height,
+            catching_up=catching_up,
+            peers=peers,
+            behind=None,
+            error="; ".join(errors) if len(errors) > 0 else None,
+        ))
+    heights = [status.height for status in statuses if status.height is not None]
+    max_height = max(heights) if len(heights) > 0 else None
+    return [
+        status._replace(behind=max_height - status.height) if status.height is not None else status
+        for status in statuses
+    ]
+
+
+def tendermint_status_sync_info(status: Dict):
+    """Returns the latest block height and whether or not the node is catching
+    up from the given /status result. Raises an exception if the result is
+    malformed."""
+    try:
+        return int(status["sync_info"]["latest_block_height"]), bool(status["sync_info"]["catching_up"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise Exception("malformed response (%s)" % repr(e))
+
+
+def subscribe_tendermint_blocks(hostname: str, publish, stop: threading.Event):
+    """Subscribes to NewBlock events over the given node's RPC websocket,
+    passing a BlockSample to `publish` for each block until `stop` is set.
+    Dropped connections are re-established."""
+    import websocket
+
+    url = "ws://%s:%d/websocket" % (hostname, TENDERMINT_RPC_PORT)
+    while not stop.is_set():
+        ws = None
+        try:
+            ws = websocket.create_connection(url, timeout=RPC_CONNECT_TIMEOUT)
+            ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "method": "subscribe",
+                "id": 0,
+                "params": {"query": "tm.event='NewBlock'"},
+            }))
+            logger.debug("Subscribed to new blocks from %s", hostname)
+            # wake up regularly to check whether we've been asked to stop
+            ws.settimeout(1)
+            while not stop.is_set():
+                try:
+                    msg = json.loads(ws.recv())
+                except websocket.WebSocketTimeoutException:
+                    continue
+                if "error" in msg:
+                    raise Exception("RPC error: %s" % msg["error"])
+                block = msg.get("result", dict()).get("data", dict()).get("value", dict()).get("block", None)
+                if block is None:
+                    continue
+                publish(BlockSample(
+                    height=int(block["header"]["height"]),
+                    time=parse_tendermint_time(block["header"]["time"]),
+                    txs=len(block["data"].get("txs") or []),
+                ))
+        except Exception as e:
+            logger.warning("Lost subscription to %s (retrying in %ds): %s", hostname, WATCH_RECONNECT_INTERVAL, e)
+            stop.wait(WATCH_RECONNECT_INTERVAL)
+        finally:
+            if ws is not None:
+                ws.close()
+
+
+def watch_tendermint_blocks(hostnames: List[str], watch: WatchConfig):
+    """Collects blocks from the given nodes (de-duplicated by height) into a
+    fixed-size ring buffer, periodically reporting statistics over it, and
+    alerting when no new block has arrived within the stall threshold. Runs
+    until interrupted or until the watch duration has elapsed."""
+    blocks = queue.Queue(maxsize=WATCH_QUEUE_SIZE)
+    publish = make_block_publisher(blocks)
+    stop = threading.Event()
+    subscribers = [
+        threading.Thread(target=subscribe_tendermint_blocks, args=(hostname, publish, stop), daemon=True)
+        for hostname in hostnames
+    ]
+    for subscriber in subscribers:
+        subscriber.start()
+
+    window = deque(maxlen=watch.window)
+    start = last_block_at = last_report_at = time.monotonic()
+    stalled = False
+    try:
+        while watch.duration <= 0 or time.monotonic() - start < watch.duration:
+            try:
+                block = blocks.get(timeout=1)
+                # the same block arrives from every node we're subscribed to
+                if len(window) == 0 or block.height > window[-1].height:
+                    window.append(block)
+                    last_block_at = time.monotonic()
+                    if stalled:
+                        stalled = False
+                        logger.info("Chain recovered at height %d", block.height)
+                        alert_tendermint_watch(watch, "recovered", block.height)
+            except queue.Empty:
+                pass
+            now = time.monotonic()
+            if not stalled and now - last_block_at >= watch.stall_threshold:
+                stalled = True
+                height = window[-1].height if len(window) > 0 else 0
+                logger.error("Chain stalled: no new block for %d seconds (last height seen: %d)", now - last_block_at, height)
+                alert_tendermint_watch(watch, "stalled", height)
+            if now - last_report_at >= watch.report_interval:
+                last_report_at = now
+                log_block_stats(block_stats(window))
+    except KeyboardInterrupt:
+        logger.info("Interrupted")
+    finally:
+        stop.set()
+    if len(window) > 0:
+        log_block_stats(block_stats(window))
+
+
+def make_block_publisher(blocks: queue.Queue):
+    """Returns a function that puts the given block on the `blocks` queue,
+    unless a block at the same or a greater height has already been put on it
+    (as the same block arrives from every node we're subscribed to), or unless
+    the queue is full, in which case the block is dropped."""
+    lock = threading.Lock()
+    latest = [0]
+
+    def publish(block: BlockSample):
+        with lock:
+            if block.height <= latest[0]:
+                return
+            latest[0] = block.height
+        try:
+            blocks.put_nowait(block)
+        except queue.Full:
+            logger.warning("Dropped block %d: too many blocks waiting to be processed", block.height)
+
+    return publish
+
+
+def alert_tendermint_watch(watch: WatchConfig, alert: str, height: int) -> threading.Thread:
+    """Runs the watch's alert command (if any) in the background, so that a
+    slow command doesn't hold up watching, killing it if it runs for longer
+    than WATCH_ALERT_TIMEOUT seconds. Returns the thread running it."""
+    if watch.alert_cmd is None:
+        return None
+    env = dict(os.environ)
+    env["TMTESTNET_ALERT"] = alert
+    env["TMTESTNET_HEIGHT"] = str(height)
+
+    def run_alert_cmd():
+        try:
+            result = subprocess.run(watch.alert_cmd, shell=True, env=env, timeout=WATCH_ALERT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            logger.warning("Alert command timed out after %d seconds", WATCH_ALERT_TIMEOUT)
+            return
+        if result.returncode != 0:
+            logger.warning("Alert command failed with exit code %d", result.returncode)
+
+    thread = threading.Thread(target=run_alert_cmd, daemon=True)
+    thread.start()
+    return thread
+
+
+def block_stats(window: deque) -> OrderedDictType:
+    """Computes the block time percentiles (in seconds) and TPS over the blocks
+    in the given window."""
+    blocks = list(window)
+    stats = OrderedDict([("height", blocks[-1].height if len(blocks) > 0 else 0), ("blocks", len(blocks))])
+    intervals = sorted([b.time - a.time for a, b in zip(blocks[:-1], blocks[1:])])
+    for p in WATCH_PERCENTILES:
+        stats["p%d" % p] = percentile(intervals, p)
+    span = blocks[-1].time - blocks[0].time if len(blocks) > 1 else 0
+    # the first block's transactions were committed before the window began
+    stats["tps"] = sum([b.txs for b in blocks[1:]]) / span if span > 0 else 0.0
+    return stats
+
+
+def log_block_stats(stats: OrderedDictType):
+    logger.info(
+        "Height %d: over the last %d block(s), block time %s, %.2f TPS",
+        stats["height"],
+        stats["blocks"],
+        ", ".join(["p%d %.2fs" % (p, stats["p%d" % p]) for p in WATCH_PERCENTILES]),
+        stats["tps"],
+    )
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of the given (sorted) values."""
+    if len(sorted_values) == 0:
+        return 0.0
+    return sorted_values[max(0, int(math.ceil(len(sorted_values) * p / 100.0)) - 1)]
+
+
+def parse_tendermint_time(s: str) -> float:
+    """Parses a Tendermint RFC3339 timestamp (with up to nanosecond precision)
+    into seconds since the epoch."""
+    m = re.match(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(\.\d+)?Z$", s)
+    if m is None:
+        raise Exception("Unrecognized block time: %s" % s)
+    t = datetime.datetime.strptime(m.group(1), "%Y-%m-%dT%H:%M:%S").replace(tzinfo=datetime.timezone.utc)
+    return t.timestamp() + (float(m.group(2)) if m.group(2) else 0.0)
+
+
+def format_tendermint_nodes_status(cfg: TestnetConfig, statuses: List[TendermintNodeStatus]) -> str:
+    """Renders the given node statuses as a plain text table, grouped by node
+    group, with a summary line per group."""
+    header = ["NODE", "HOSTNAME", "HEIGHT", "BEHIND", "CATCHING UP", "PEERS", "ERROR"]
+    rows = []
+    for node_group_name in cfg.node_groups.keys():
+        group_statuses = [status for status in statuses if status.group == node_group_name]
+        if len(group_statuses) == 0:
+            continue
+        for status in group_statuses:
+            rows.append([
+                "%s[%d]" % (status.group, status.id),
+                status.hostname,
+                "-" if status.height is None else str(status.height),
+                "-" if status.behind is None else str(status.behind),
+                "-" if status.catching_up is None else ("yes" if status.catching_up else "no"),
+                "-" if status.peers is None else str(status.peers),
+                status.error or "",
+            ])
+        reachable = [status for status in group_statuses if status.height is not None]
+        rows.append([
+            "%s" % node_group_name,
+            "%d/%d up" % (len(reachable), len(group_statuses)),
+            "max %d" % max([status.height for status in reachable]) if len(reachable) > 0 else "-",
+            "max %d" % max([status.behind for status in reachable]) if len(reachable) > 0 else "-",
+            "%d node(s)" % len([status for status in reachable if status.catching_up]),
+            "",
+            "",
+        ])
+        rows.append(None)
+    widths = [max([len(header[i])] + [len(row[i]) for row in rows if row is not None]) for i in range(len(header))]
+    lines = ["  ".join(header[i].ljust(widths[i]) for i in range(len(header))).rstrip()]
+    for row in rows[:-1]:
+        lines.append("" if row is None else "  ".join(row[i].ljust(widths[i]) for i in range(len(header))).rstrip())
+    return "\n".join(lines)
+
+
+def tendermint_max_height(hostnames: List[str]) -> int:
+    """Returns the highest latest block height reported by any of the given
+    nodes, or None if none of them could be queried."""
+    if len(hostnames) == 0:
+        return None
+    with tendermint_rpc_session(len(hostnames)) as session, \
+            ThreadPoolExecutor(max_workers=len(hostnames)) as executor:
+        statuses = list(executor.map(lambda hostname: tendermint_node_status(hostname, session=session), hostnames))
+    heights = []
+    for hostname, status in zip(hostnames, statuses):
+        if status is None:
+            continue
+        try:
+            heights.append(tendermint_status_sync_info(status)[0])
+        except Exception as e:
+            logger.debug("Ignoring status of %s: %s", hostname, e)
+    return max(heights) if len(heights) > 0 else None
+
+
+def wait_for_nodes_caught_up(hostnames: List[str], timeout: int, past_height: int = None):
+    """Polls the given nodes' RPC /status endpoints until they all respond,
+    report that they're no longer catching up and (if `past_height` is given)
+    have committed a block beyond `past_height`, or until the timeout (in
+    seconds) expires, in which case an exception is raised. Requiring the
+    height to advance means that stalled or forked nodes, which also report
+    that they're not catching up, don't pass."""
+    if len(hostnames) == 0:
+        return
+    logger.info(
+        "Waiting up to %d seconds for %d node(s) to catch up%s",
+        timeout,
+        len(hostnames),
+        "" if past_height is None else " and commit blocks beyond height %d" % past_height,
+    )
+    start = time.monotonic()
+    pending = list(hostnames)
+
+    def is_pending(status):
+        if status is None:
+            return True
+        try:
+            height, catching_up = tendermint_status_sync_info(status)
+        except Exception:
+            return True
+        return catching_up or (past_height is not None and height <= past_height)
+
+    with tendermint_rpc_session(len(pending)) as session, \
+            ThreadPoolExecutor(max_workers=len(pending)) as executor:
+        while True:
+            statuses = list(executor.map(lambda hostname: tendermint_node_status(hostname, session=session), pending))
+            pending = [hostname for hostname, status in zip(pending, statuses) if is_pending(status)]
+            if len(pending) == 0:
+                break
+            if time.monotonic() - start >= timeout:
+                raise Exception("Timed out after %d seconds waiting for node(s) to catch up: %s" % (timeout, ", ".join(pending)))
+            logger.debug("Still waiting for %d node(s) to catch up", len(pending))
+            time.sleep(ROLLING_POLL_INTERVAL)
+    logger.info("%d node(s) caught up after %.2f seconds", len(hostnames), time.monotonic() - start)
+
+
 def ansible_fetch_logs(
     workdir: str,
     refs: List[TestnetNodeRef],
     output_path: str,
     ec2_private_key_path: str,
+    known_hosts: str,
     fail_on_missing: bool = True,
+    timings_path: str = None,
+    retry_failed: int = 0,
 ):
     with tempfile.TemporaryDirectory() as tmpdir:
         inventory_file = os.path.join(tmpdir, "inventory")
@@ -1538,14 +4056,19 @@ def ansible_fetch_logs(
         save_ansible_inventory(inventory_file, OrderedDict({
             "tendermint": [host_ref.hostname for host_ref in host_refs],
         }))
-        sh([
-            "ansible-playbook",
-            "-i", inventory_file,
-            "-u", "ec2-user",
-            "-e", "local_log_path=%s" % output_path,
-            "--private-key", ec2_private_key_path,
-            os.path.join("tendermint", "ansible", "fetch-logs.yaml"),
-        ])
+        sh(
+            [
+                "ansible-playbook",
+                "-i", inventory_file,
+                "-u", "ec2-user",
+                "-e", "local_log_path=%s" % output_path,
+                "--private-key", ec2_private_key_path,
+            ] + ansible_ssh_args(known_hosts) + [
+                os.path.join("tendermint", "ansible", "fetch-logs.yaml"),
+            ],
+            env=ansible_timings_env(os.path.join(timings_path, "fetch-logs.jsonl")) if timings_path is not None else None,
+            retry_failed=retry_failed,
+        )
 
 
 # -----------------------------------------------------------------------------
@@ -1555,35 +4078,395 @@ def ansible_fetch_logs(
 # -----------------------------------------------------------------------------
 
 
-def sh(cmd):
+def run_command(cmd, log_file=None, echo=True, stderr=subprocess.STDOUT, cwd=None, env=None) -> "CommandResult":
+    """Executes the given command, waiting for it to exit without polling. The
+    command's output is streamed in chunks into an in-memory buffer (and,
+    optionally, to stdout and/or appended to the given log file) as it arrives.
+    Never raises an exception on failure - check the result's return code."""
+    output = io.BytesIO()
+    start = time.monotonic()
+    log_f = open(log_file, "ab") if log_file is not None else None
+    try:
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr, cwd=cwd, env=env) as p:
+            for chunk in iter(lambda: p.stdout.read1(COMMAND_OUTPUT_CHUNK_SIZE), b""):
+                output.write(chunk)
+                if log_f is not None:
+                    log_f.write(chunk)
+                if echo:
+                    sys.stdout.buffer.write(chunk)
+                    sys.stdout.buffer.flush()
+            p.wait()
+    finally:
+        if log_f is not None:
+            log_f.close()
+    return CommandResult(
+        cmd=cmd,
+        returncode=p.returncode,
+        output=output.getvalue().decode("utf-8", errors="replace"),
+        wall_time=time.monotonic() - start,
+    )
+
+
+def run_ansible_playbook(
+    cmd: List[str],
+    retry_failed: int,
+    retry_dependencies: Dict[str, str] = None,
+    log_file: str = None,
+    echo: bool = True,
+    cwd: str = None,
+    env: Dict[str, str] = None,
+) -> "CommandResult":
+    """Executes the given ansible-playbook command like run_command. If it
+    fails on some hosts, it's rerun (with the same parameters) against only
+    those hosts - along with any hosts they depend on, as per the
+    `retry_dependencies` mapping of hosts to the host they depend on - up to
+    `retry_failed` times, backing off exponentially between attempts. Returns
+    the result of the last attempt, with the output and wall time of all of
+    the attempts."""
+    env = dict(env if env is not None else os.environ)
+    outputs = []
+    start = time.monotonic()
+    with tempfile.TemporaryDirectory() as retry_path:
+        # have Ansible write the hosts that failed to a retry file
+        env["ANSIBLE_RETRY_FILES_ENABLED"] = "True"
+        env["ANSIBLE_RETRY_FILES_SAVE_PATH"] = retry_path
+        timings_file = env.get("TMTESTNET_TIMINGS_FILE", None)
+        # retries' timings are recorded alongside the first attempt's, so
+        # clear out those of any previous run's retries
+        if timings_file is not None:
+            timings_prefix = re.sub(r"\.jsonl$", "-retry", os.path.basename(timings_file))
+            for f in os.listdir(os.path.dirname(timings_file)):
+                if f.startswith(timings_prefix) and f.endswith(".jsonl"):
+                    os.remove(os.path.join(os.path.dirname(timings_file), f))
+        limit = []
+        backoff = RETRY_BACKOFF_INITIAL
+        for attempt in range(retry_failed + 1):
+            if timings_file is not None and attempt > 0:
+                env["TMTESTNET_TIMINGS_FILE"] = re.sub(r"(\.jsonl)?$", "-retry%d.jsonl" % attempt, timings_file, count=1)
+            result = run_command(cmd + limit, log_file=log_file, echo=echo, cwd=cwd, env=env)
+            outputs.append(result.output)
+            retry_files = [f for f in os.listdir(retry_path) if f.endswith(".retry")]
+            if result.returncode == 0 or attempt == retry_failed or len(retry_files) == 0:
+                break
+            failed_hosts = []
+            for retry_file in retry_files:
+                with open(os.path.join(retry_path, retry_file), "rt") as f:
+                    failed_hosts.extend([line.strip() for line in f if len(line.strip()) > 0])
+                os.remove(os.path.join(retry_path, retry_file))
+            if len(failed_hosts) == 0:
+                break
+            retry_hosts = list(OrderedDict.fromkeys(
+                failed_hosts + [(retry_dependencies or dict())[host] for host in failed_hosts if host in (retry_dependencies or dict())],
+            ))
+            logger.warning(
+                "Playbook failed on %d host(s) - retrying on %d host(s) in %d seconds (retry %d of %d): %s",
+                len(failed_hosts),
+                len(retry_hosts),
+                backoff,
+                attempt + 1,
+                retry_failed,
+                ", ".join(retry_hosts),
+            )
+            time.sleep(backoff)
+            backoff = min(backoff * 2, RETRY_BACKOFF_MAX)
+            limit_file = os.path.join(retry_path, "limit-%d" % attempt)
+            with open(limit_file, "wt") as f:
+                f.write("\n".join(retry_hosts) + "\n")
+            limit = ["--limit", "@%s" % limit_file]
+    return result._replace(output="".join(outputs), wall_time=time.monotonic() - start)
+
+
+def sh(cmd, log_file=None, cwd=None, env=None, retry_failed=0, retry_dependencies=None) -> "CommandResult":
+    """Executes the given command, printing its output. If `log_file` is
+    specified, the command's output is appended to that file instead. If
+    `retry_failed` is set, the command must be an ansible-playbook command,
+    which is rerun against its failed hosts (see run_ansible_playbook)."""
     logger.info("Executing command: %s" % " ".join(cmd))
-    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT) as p:
+    if log_file is not None:
+        logger.info("Writing command output to: %s", log_file)
+    else:
         print("")
-        for line in p.stdout:
-            print(line.decode("utf-8").rstrip())
-        while p.poll() is None:
-            time.sleep(1)
+    if retry_failed > 0:
+        result = run_ansible_playbook(
+            cmd,
+            retry_failed,
+            retry_dependencies=retry_dependencies,
+            log_file=log_file,
+            echo=log_file is None,
+            cwd=cwd,
+            env=env,
+        )
+    else:
+        result = run_command(cmd, log_file=log_file, echo=log_file is None, cwd=cwd, env=env)
+    if log_file is None:
         print("")
-    
-        if p.returncode != 0:
-            raise Exception("Process failed with return code %d" % p.returncode)
+    logger.info("Command completed in %.2f seconds with return code %d", result.wall_time, result.returncode)
+    if result.returncode != 0:
+        if log_file is not None:
+            raise Exception("Process failed with return code %d (see %s)" % (result.returncode, log_file))
+        raise Exception("Process failed with return code %d" % result.returncode)
+    return result
+
+
+def sh_all(
+    cmds: OrderedDictType,
+    max_workers: int,
+    desc: str,
+    envs: Dict = None,
+    retry_failed: int = 0,
+) -> OrderedDictType:
+    """Executes the given commands (an ordered mapping of descriptions to
+    commands) concurrently using at most `max_workers` processes at a time.
+    Each command's output is buffered separately and printed, in order, once
+    all of the commands have completed. Commands whose descriptions are in
+    `envs` are executed with the corresponding environment. If `retry_failed`
+    is set, the commands must be ansible-playbook commands (see
+    run_ansible_playbook). Raises a single exception reporting all of the
+    commands that failed."""
+    tasks = OrderedDict()
+    for cmd_desc, cmd in cmds.items():
+        logger.info("Executing command (%s): %s", cmd_desc, " ".join(cmd))
+        tasks[cmd_desc] = make_command_runner(cmd, env=(envs or dict()).get(cmd_desc, None), retry_failed=retry_failed)
+    results = run_in_parallel(tasks, max_workers, desc)
+    failed = []
+    for cmd_desc, result in results.items():
+        logger.info("Output for \"%s\" (%.2f seconds, return code %d):", cmd_desc, result.wall_time, result.returncode)
+        print("")
+        print(result.output.rstrip())
+        print("")
+        if result.returncode != 0:
+            failed.append("%s (return code %d)" % (cmd_desc, result.returncode))
+    if len(failed) > 0:
+        raise Exception("Failed to %s: %s" % (desc, "; ".join(failed)))
+    return results
+
+
+def run_pipeline(
+    tasks: List[PipelineTask],
+    max_workers: int,
+    journal_file: str = None,
+    resume: bool = False,
+) -> Dict:
+    """Executes the given pipeline tasks using at most `max_workers` threads,
+    starting each task as soon as all of its dependencies have completed. Each
+    task's function is called with a mapping of its dependencies' names to
+    their results. Tasks are only submitted to the thread pool as threads
+    become free, so once a task fails, no further tasks are started (not even
+    those that would otherwise have been queued), and a single
+    exception reporting all failed tasks is raised once the running tasks have
+    completed. On success, the pipeline's critical path is logged and a
+    mapping of task names to results is returned.
+
+    If `journal_file` is supplied, the outcome of each task that specifies its
+    `inputs` is recorded in that file, along with a fingerprint of its inputs
+    and those of its dependencies. If `resume` is set, tasks that completed
+    successfully in a previous run with the same fingerprint, and none of whose
+    dependencies had to be executed again, are not executed - their results
+    are obtained from their `restore` functions instead."""
+    names = set([task.name for task in tasks])
+    for task in tasks:
+        for dep in task.deps:
+            if dep not in names:
+                raise Exception("Unknown dependency \"%s\" for pipeline task \"%s\"" % (dep, task.name))
+
+    previous_journal = dict()
+    if resume and journal_file is not None and os.path.isfile(journal_file):
+        previous_journal = load_yaml_config(journal_file) or dict()
+    journal = dict()
+
+    pending = OrderedDict([(task.name, task) for task in tasks])
+    running = dict()
+    results = dict()
+    timings = dict()
+    fingerprints = dict()
+    executed = set()
+    restored = []
+    errors = OrderedDict()
+    pipeline_start = time.monotonic()
+    max_workers = max(1, max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while len(pending) > 0 or len(running) > 0:
+            # keep scheduling while restoring tasks satisfies other tasks' dependencies
+            scheduling = len(errors) == 0
+            while scheduling:
+                scheduling = False
+                for name, task in list(pending.items()):
+                    if not all([dep in results for dep in task.deps]):
+                        continue
+                    deps = dict([(dep, results[dep]) for dep in task.deps])
+                    fingerprints[name] = pipeline_task_fingerprint(task, fingerprints)
+                    if pipeline_task_resumable(task, fingerprints[name], previous_journal, executed):
+                        del pending[name]
+                        logger.info("Task already completed previously: %s", name)
+                        results[name] = task.restore(deps)
+                        journal[name] = previous_journal[name]
+                        restored.append(name)
+                        scheduling = True
+                        continue
+                    # leave the task pending until a thread is free
+                    if len(running) >= max_workers:
+                        continue
+                    del pending[name]
+                    executed.add(name)
+                    running[executor.submit(run_pipeline_task, task, deps)] = name
+            if len(running) == 0:
+                break
+            done, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name], timings[name] = future.result()
+                    journal[name] = {"fingerprint": fingerprints[name], "status": "completed"}
+                except Exception as e:
+                    logger.error("Pipeline task failed: %s (%s)", name, e)
+                    errors[name] = e
+                    journal[name] = {"fingerprint": fingerprints[name], "status": "failed", "error": str(e)}
+                if journal_file is not None:
+                    save_pipeline_journal(journal_file, journal)
+
+    if journal_file is not None:
+        save_pipeline_journal(journal_file, journal)
+    if len(restored) > 0:
+        logger.info("Resumed %d previously completed task(s): %s", len(restored), ", ".join(restored))
+    if len(errors) > 0:
+        raise Exception("Failed pipeline task(s): %s" % "; ".join(["%s: %s" % (name, e) for name, e in errors.items()]))
+    if len(pending) > 0:
+        raise Exception("Cyclic dependencies between pipeline tasks: %s" % ", ".join(pending.keys()))
+
+    log_pipeline_critical_path(tasks, timings, pipeline_start)
+    return results
+
+
+def pipeline_task_fingerprint(task: PipelineTask, fingerprints: Dict[str, str]) -> str:
+    """Computes a fingerprint of the given task's inputs, chained with its
+    dependencies' fingerprints."""
+    sha256 = hashlib.sha256(repr(task.inputs).encode("utf-8"))
+    for dep in task.deps:
+        sha256.update(("\0%s=%s" % (dep, fingerprints[dep])).encode("utf-8"))
+    return sha256.hexdigest()
+
+
+def pipeline_task_resumable(task: PipelineTask, fingerprint: str, previous_journal: Dict, executed: Set[str]) -> bool:
+    if task.inputs is None or task.restore is None:
+        return False
+    if any([dep in executed for dep in task.deps]):
+        return False
+    entry = previous_journal.get(task.name, None)
+    return entry is not None and entry.get("status", None) == "completed" and \
+        entry.get("fingerprint", None) == fingerprint
+
+
+def save_pipeline_journal(filename: str, journal: Dict):
+    """Atomically writes the given pipeline journal to the specified file."""
+    tmp_file = "%s.tmp" % filename
+    with open(tmp_file, "wt") as f:
+        yaml.safe_dump(journal, f)
+    os.replace(tmp_file, filename)
+
+
+def run_pipeline_task(task: PipelineTask, deps: Dict):
+    logger.info("Starting task: %s", task.name)
+    start = time.monotonic()
+    result = task.fn(deps)
+    end = time.monotonic()
+    logger.info("Completed task: %s (%.2f seconds)", task.name, end - start)
+    return result, (start, end)
+
+
+def log_pipeline_critical_path(tasks: List[PipelineTask], timings: Dict, pipeline_start: float):
+    """Logs the chain of tasks that determined the pipeline's total duration,
+    by walking back from the last task to complete through the latest-finishing
+    dependency of each task."""
+    if len(timings) == 0:
+        return
+    deps = dict([(task.name, task.deps) for task in tasks])
+    name = max(timings.keys(), key=lambda n: timings[n][1])
+    path = [name]
+    # restored tasks weren't executed, so they don't contribute to the path
+    while any([dep in timings for dep in deps[name]]):
+        name = max([dep for dep in deps[name] if dep in timings], key=lambda n: timings[n][1])
+        path.append(name)
+    logger.info("Completed in %.2f seconds, with critical path:", timings[path[0]][1] - pipeline_start)
+    for name in reversed(path):
+        start, end = timings[name]
+        logger.info("  %s: %.2f seconds (started at +%.2f seconds)", name, end - start, start - pipeline_start)
+
+
+def make_command_runner(cmd, env=None, retry_failed=0):
+    def runner():
+        if retry_failed > 0:
+            return run_ansible_playbook(cmd, retry_failed, echo=False, env=env)
+        return run_command(cmd, echo=False, env=env)
+    return runner
+
+
+def run_in_parallel(tasks: OrderedDictType, max_workers: int, desc: str, retry_failed: int = 0) -> OrderedDictType:
+    """Executes the given tasks (an ordered mapping of names to callables)
+    using a pool of at most `max_workers` threads. Returns an ordered mapping
+    of task names to results. If any of the tasks fail, all of them are still
+    allowed to complete, after which only the failed tasks are rerun up to
+    `retry_failed` times (backing off exponentially between attempts, like
+    run_ansible_playbook). If any tasks still fail, a single exception is
+    raised reporting all of the failures."""
+    results = OrderedDict()
+    errors = OrderedDict()
+    pending = OrderedDict(tasks)
+    backoff = RETRY_BACKOFF_INITIAL
+    for attempt in range(retry_failed + 1):
+        errors = OrderedDict()
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = OrderedDict([(name, executor.submit(task)) for name, task in pending.items()])
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    logger.error("Failed to %s: %s (%s)", desc, name, e)
+                    errors[name] = e
+        if len(errors) == 0 or attempt == retry_failed:
+            break
+        logger.warning(
+            "Failed to %s for %d task(s) - retrying in %d seconds (retry %d of %d): %s",
+            desc,
+            len(errors),
+            backoff,
+            attempt + 1,
+            retry_failed,
+            ", ".join(errors.keys()),
+        )
+        time.sleep(backoff)
+        backoff = min(backoff * 2, RETRY_BACKOFF_MAX)
+        pending = OrderedDict([(name, tasks[name]) for name in errors])
+    if len(errors) > 0:
+        raise Exception("Failed to %s: %s" % (
+            desc,
+            "; ".join(["%s: %s" % (name, e) for name, e in errors.items()]),
+        ))
+    return OrderedDict([(name, results[name]) for name in tasks])
 
 
 def configure_logging(verbose=False):
-    """Supercharge our logger."""
-    handler = colorlog.StreamHandler()
-    handler.setFormatter(
-        colorlog.ColoredFormatter(
-            "%(log_color)s%(asctime)s\t%(levelname)s\t%(message)s",
-            log_colors={
-                "DEBUG": "cyan",
-                "INFO": "green",
-                "WARNING": "bold_yellow",
-                "ERROR": "bold_red",
-                "CRITICAL": "bold_red",
-            }
-        ),
-    )
+    """Supercharge our logger. Log output is only coloured when it's going to a
+    terminal, in which case colorlog is imported."""
+    fmt = "%(asctime)s\t%(levelname)s\t%(message)s"
+    if sys.stderr.isatty():
+        import colorlog
+
+        handler = colorlog.StreamHandler()
+        handler.setFormatter(
+            colorlog.ColoredFormatter(
+                "%(log_color)s" + fmt,
+                log_colors={
+                    "DEBUG": "cyan",
+                    "INFO": "green",
+                    "WARNING": "bold_yellow",
+                    "ERROR": "bold_red",
+                    "CRITICAL": "bold_red",
+                }
+            ),
+        )
+    else:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(fmt))
     logger.addHandler(handler)
     logger.setLevel(logging.DEBUG if verbose else logging.INFO)
 
@@ -1682,6 +4565,8 @@ def github_release_url(filename, version):
 
 
 def download(url, filename):
+    import requests
+
     logger.info("Downloading: %s", url)
     with open(filename, "wb") as f:
         response = requests.get(url)
@@ -1721,17 +4606,27 @@ def resolve_relative_path(path: str, base_path: str) -> str:
 
 
 def load_toml_config(filename):
+    import toml
+
     logger.debug("Loading TOML configuration file: %s", filename)
     with open(filename, "rt") as f:
         return toml.load(f)
 
     
 def save_toml_config(filename, cfg):
+    import toml
+
     with open(filename, "wt") as f:
         toml.dump(cfg, f)
     logger.debug("Wrote configuration to %s", filename)
 
 
+def save_json_config(filename, cfg):
+    with open(filename, "wt") as f:
+        json.dump(cfg, f, indent=2)
+    logger.debug("Wrote configuration to %s", filename)
+
+
 def load_yaml_config(filename):
     with open(filename, "rt") as f:
         return yaml.safe_load(f)
@@ -1743,7 +4638,69 @@ def save_yaml_config(filename, cfg):
     logger.debug("Wrote configuration to %s", filename)
 
 
+def hash_files(filenames: List[str], sha256=None):
+    """Adds the names and contents of the given files to the given SHA256 hash
+    object (or a new one, if not supplied), and returns the hash object."""
+    if sha256 is None:
+        sha256 = hashlib.sha256()
+    for filename in filenames:
+        sha256.update(filename.encode("utf-8") + b"\0")
+        with open(filename, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha256.update(chunk)
+        sha256.update(b"\0")
+    return sha256
+
+
+def file_sha256(filename: str) -> str:
+    """Returns the hex-encoded SHA256 hash of the given file's contents."""
+    sha256 = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def terraform_project_files(project_path: str) -> List[str]:
+    """Returns a sorted list of the files in the given Terraform project,
+    excluding Terraform's own working files. The dependency lock file is also
+    excluded, since "terraform init" may create or update it after the
+    project's inputs have been hashed (it's accounted for when deciding whether
+    to re-initialize the project instead)."""
+    result = []
+    for dirpath, dirnames, filenames in os.walk(project_path):
+        dirnames[:] = sorted([d for d in dirnames if d not in {".terraform", "terraform.tfstate.d"}])
+        for filename in sorted(filenames):
+            if filename.startswith("terraform.tfstate") or filename == ".terraform.lock.hcl":
+                continue
+            result.append(os.path.join(dirpath, filename))
+    return result
+
+
+def terraform_inputs_hash(project_path: str, input_files: List[str]) -> str:
+    """Computes a hash of the given Terraform project's files together with
+    the given input files."""
+    return hash_files(input_files, hash_files(terraform_project_files(project_path))).hexdigest()
+
+
+def terraform_fingerprint_matches(fingerprint_file: str, inputs_hash: str, output_vars_file: str) -> bool:
+    if not os.path.isfile(fingerprint_file) or not os.path.isfile(output_vars_file):
+        return False
+    fingerprint = load_yaml_config(fingerprint_file) or dict()
+    return fingerprint.get("inputs", None) == inputs_hash and \
+        fingerprint.get("outputs", None) == hash_files([output_vars_file]).hexdigest()
+
+
+def save_terraform_fingerprint(fingerprint_file: str, inputs_hash: str, output_vars_file: str):
+    save_yaml_config(fingerprint_file, {
+        "inputs": inputs_hash,
+        "outputs": hash_files([output_vars_file]).hexdigest(),
+    })
+
+
 def ensure_tendermint_binary(path: str, download_path: str) -> str:
+    import zipfile
+
     if not path.startswith("v"):
         if not os.path.isfile(path):
             raise Exception("Cannot find binary at path: %s" % path)
@@ -1826,60 +4783,337 @@ def parse_regions_list(regions_list: list, ctx: str) -> OrderedDictType[str, Tes
     return result
 
 
-def get_host_keys(hostname, retries=10, retry_wait=5):
-    """Calls ssh-keyscan for the given hostname to get its keys."""
+def get_host_keys(
+    hostnames: List[str],
+    retries: int = KEYSCAN_RETRIES,
+    retry_wait: float = KEYSCAN_RETRY_WAIT,
+    timeout: int = KEYSCAN_TIMEOUT,
+) -> Dict[str, List[str]]:
+    """Calls ssh-keyscan for all of the given hostnames at once to get their
+    keys. Hosts for which no keys could be obtained are scanned again, backing
+    off exponentially between attempts. Returns a mapping of hostnames to their
+    keys (each in known_hosts line format)."""
+    result = dict()
+    pending = list(hostnames)
     for i in range(retries):
-        logger.debug("Scanning keys for host: %s", hostname)
-        keys = []
-        with subprocess.Popen(["ssh-keyscan", hostname], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as p:
-            for line in p.stdout:
-                key = line.decode("utf-8").rstrip()
-                if len(key) > 0:
-                    keys.append(key)
-            while p.poll() is None:
-                time.sleep(1)
-
-            if p.returncode == 0 and len(keys) > 0:
-                return keys
-            elif i < (retries-1):
-                logger.warning("ssh-keyscan failed with return code %d and %d keys - trying again in %d seconds" % (p.returncode, len(keys), retry_wait))
-                time.sleep(retry_wait)
-    raise Exception("Call to ssh-keyscan failed with return code %d" % p.returncode)
-
-
-def clear_host_keys(hostname: str):
-    logger.debug("Removing any existing keys for host: %s", hostname)
-    with subprocess.Popen(["ssh-keygen", "-R", hostname], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) as p:
-        while p.poll() is None:
-            time.sleep(1)
-        if p.returncode != 0:
-            raise Exception("Call to ssh-keygen failed with return code %d" % p.returncode)
-
-
-def clear_all_host_keys(hostnames: List[str]):
+        logger.debug("Scanning keys for hosts: %s", pending)
+        by_lower = dict([(hostname.lower(), hostname) for hostname in pending])
+        scan = run_command(
+            ["ssh-keyscan", "-T", "%d" % timeout] + pending,
+            echo=False,
+            stderr=subprocess.DEVNULL,
+        )
+        for line in scan.output.splitlines():
+            key = line.strip()
+            if len(key) == 0 or key.startswith("#"):
+                continue
+            hostname = by_lower.get(key.split(" ", 1)[0].lower(), None)
+            if hostname is not None:
+                result.setdefault(hostname, []).append(key)
+
+        pending = [hostname for hostname in pending if hostname not in result]
+        if len(pending) == 0:
+            return result
+        if i < (retries-1):
+            wait = min(retry_wait * (2 ** i), KEYSCAN_MAX_RETRY_WAIT)
+            logger.warning("ssh-keyscan returned no keys for %d host(s) - trying again in %.1f seconds" % (len(pending), wait))
+            time.sleep(wait)
+    raise Exception("Call to ssh-keyscan failed to obtain keys for host(s): %s" % ", ".join(pending))
+
+
+def clear_all_host_keys(known_hosts: str, hostnames: List[str]):
+    """Removes all keys for the given hostnames from the specified known_hosts
+    file in a single rewrite."""
     logger.debug("Removing host keys for hostnames: %s", hostnames)
-    for hostname in hostnames:
-        clear_host_keys(hostname)
+    update_known_hosts(known_hosts, dict([(hostname, []) for hostname in hostnames]))
 
 
-def ensure_in_known_hosts(hostname):
+def known_hosts_line_matches(line: str, hostnames: Set[str]) -> bool:
+    """Checks whether the given known_hosts line holds a key for any of the
+    given (lowercase) hostnames. Supports hashed known_hosts entries."""
+    parts = line.strip().split(" ", 1)
+    if len(parts) < 2 or parts[0].startswith("#"):
+        return False
+    hosts_field = parts[0]
+    if hosts_field.startswith("|1|"):
+        try:
+            salt_b64, hash_b64 = hosts_field[3:].split("|", 1)
+            salt = base64.b64decode(salt_b64)
+            expected = base64.b64decode(hash_b64)
+        except ValueError:
+            return False
+        for hostname in hostnames:
+            if hmac.new(salt, hostname.encode("utf-8"), hashlib.sha1).digest() == expected:
+                return True
+        return False
+    return any([h.lower() in hostnames for h in hosts_field.split(",")])
+
+
+def update_known_hosts(known_hosts: str, host_keys: Dict[str, List[str]]):
+    """Replaces any existing keys for the given hosts in the specified
+    known_hosts file with the given keys, in a single atomic write."""
+    hostnames = set([hostname.lower() for hostname in host_keys.keys()])
+    with KNOWN_HOSTS_LOCK:
+        lines = []
+        if os.path.isfile(known_hosts):
+            with open(known_hosts, "rt") as f:
+                lines = [line for line in f if not known_hosts_line_matches(line, hostnames)]
+        for _, keys in host_keys.items():
+            lines.extend(["%s\n" % key for key in keys])
+        ensure_path_exists(os.path.dirname(known_hosts))
+        fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(known_hosts), prefix=".known_hosts.")
+        try:
+            with os.fdopen(fd, "wt") as f:
+                f.writelines(lines)
+            if os.path.isfile(known_hosts):
+                shutil.copymode(known_hosts, tmp_file)
+            os.replace(tmp_file, known_hosts)
+        except Exception as e:
+            os.unlink(tmp_file)
+            raise e
+    logger.debug("Updated keys for %d host(s) in %s", len(hostnames), known_hosts)
+
+
+def hosts_missing_from_known_hosts(known_hosts: str, hostnames: List[str]) -> List[str]:
+    """Returns those of the given hostnames for which there are no keys in the
+    specified known_hosts file."""
+    if not os.path.isfile(known_hosts):
+        return list(hostnames)
+    known = set()
+    hashed_lines = []
+    with open(known_hosts, "rt") as f:
+        for line in f:
+            hosts_field = line.strip().split(" ", 1)[0]
+            if hosts_field.startswith("|1|"):
+                hashed_lines.append(line)
+            else:
+                known.update([h.lower() for h in hosts_field.split(",")])
+    return [
+        hostname for hostname in hostnames
+        if hostname.lower() not in known and
+            not any([known_hosts_line_matches(line, {hostname.lower()}) for line in hashed_lines])
+    ]
+
+
+def ensure_in_known_hosts(known_hosts: str, hostname: str):
     """Calls ssh-keyscan for the given host and ensures that all relevant keys
-    for the host are in the user's known_hosts file."""
-    known_hosts = os.path.expanduser("~/.ssh/known_hosts")
-    # clear any existing keys for the host
-    clear_host_keys(hostname)
-    host_keys = get_host_keys(hostname)
-    # add these keys to the known_hosts file
-    with open(known_hosts, "at") as f:
-        for key in host_keys:
-            f.write("%s\n" % key)
+    for the host are in the specified known_hosts file."""
+    ensure_all_in_known_hosts(known_hosts, [hostname])
+
+
+def ensure_all_in_known_hosts(
+    known_hosts: str,
+    hostnames: List[str],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    batch_size: int = KEYSCAN_BATCH_SIZE,
+):
+    """Scans the SSH keys of all of the given hosts, in batches of up to
+    `batch_size` hosts using at most `max_workers` concurrent ssh-keyscan
+    processes, and then updates the specified known_hosts file in one go."""
+    logger.info("Adding all target nodes' SSH keys to testnet known_hosts: %s", known_hosts)
+    batches = OrderedDict()
+    for i in range(0, len(hostnames), batch_size):
+        batch = hostnames[i:i+batch_size]
+        batches["hosts %d-%d" % (i, i+len(batch)-1)] = make_host_keys_scanner(batch)
+    host_keys = dict()
+    for _, batch_keys in run_in_parallel(batches, max_workers, "scan SSH host keys").items():
+        host_keys.update(batch_keys)
+    update_known_hosts(known_hosts, host_keys)
+
+
+def testnet_known_hosts(cfg: "TestnetConfig") -> str:
+    """Returns the path to the known_hosts file for the given testnet. Each
+    testnet keeps its own set of host keys so as to avoid polluting the user's
+    ~/.ssh/known_hosts file."""
+    return os.path.join(cfg.home, cfg.id, "known_hosts")
+
+
+def testnet_timings(cfg: "TestnetConfig") -> str:
+    """Returns the path to the directory in which the given testnet's Ansible
+    playbook runs record their per-host, per-task timings."""
+    return os.path.join(cfg.home, cfg.id, "timings")
+
+
+def ansible_timings_env(timings_file: str) -> Dict[str, str]:
+    """Returns the environment with which to execute ansible-playbook so that
+    each task's start and end time on each host is written to the given file
+    (as JSON lines), in addition to Ansible's usual output."""
+    os.makedirs(os.path.dirname(timings_file), exist_ok=True)
+    env = dict(os.environ)
+    env["ANSIBLE_CALLBACK_PLUGINS"] = os.pathsep.join(
+        [ANSIBLE_CALLBACK_PLUGINS_PATH] + ([env["ANSIBLE_CALLBACK_PLUGINS"]] if env.get("ANSIBLE_CALLBACK_PLUGINS") else []),
+    )
+    # older versions of Ansible only recognize the whitelist
+    for var in ["ANSIBLE_CALLBACKS_ENABLED", "ANSIBLE_CALLBACK_WHITELIST"]:
+        env[var] = ",".join([ANSIBLE_TIMINGS_CALLBACK] + ([env[var]] if env.get(var) else []))
+    env["TMTESTNET_TIMINGS_FILE"] = timings_file
+    return env
 
 
-def ensure_all_in_known_hosts(hostnames):
-    """Runs ensure_in_known_hosts() for each of the given hostnames."""
-    logger.info("Adding all target nodes' SSH keys to local known_hosts")
-    for hostname in hostnames:
-        ensure_in_known_hosts(hostname)
+def load_ansible_timings(filename: str) -> List[AnsibleTaskTiming]:
+    timings = []
+    with open(filename, "rt") as f:
+        for line in f:
+            if len(line.strip()) > 0:
+                timings.append(AnsibleTaskTiming(**json.loads(line)))
+    return timings
+
+
+def ansible_timings_report(
+    label: str,
+    timings: List[AnsibleTaskTiming],
+    host_labels: Dict[str, tuple],
+    top: int,
+) -> List[str]:
+    """Renders a report on the given timings of a playbook run, ranking hosts
+    by the total time their tasks took, and tasks by their wall time (i.e.
+    until the slowest host completed them). Hosts and tasks' hosts that took
+    much longer than the median are flagged as outliers. `host_labels` maps
+    hostnames to their node reference and region, where known. Tasks are
+    identified by their UUID (or their play and name for older timings), so
+    identically named tasks in different plays or roles aren't merged."""
+    def is_outlier(duration, median):
+        return duration > median * TIMINGS_OUTLIER_FACTOR and duration - median >= TIMINGS_OUTLIER_MIN_SECONDS
+
+    def host_label(host):
+        node_ref, region = host_labels.get(host, (None, None))
+        return host if node_ref is None else "%s %s%s" % (node_ref, host, "" if region is None else " (%s)" % region)
+
+    def median_ratio(duration, median):
+        return "%.1fx median" % (duration / median) if median > 0 else "median 0.0s"
+
+    host_totals = OrderedDict()
+    task_timings = OrderedDict()
+    for timing in timings:
+        host_totals[timing.host] = host_totals.get(timing.host, 0.0) + timing.duration
+        task_timings.setdefault(timing.task_uuid or (timing.play, timing.task), []).append(timing)
+    median_host_total = statistics.median(host_totals.values())
+    # only qualify tasks by their play if there's more than one
+    multiple_plays = len(set([t.play for t in timings])) > 1
+
+    def task_label(timing):
+        return timing.task if not multiple_plays else "%s: %s" % (timing.play, timing.task)
+
+    lines = [
+        "%s (%s): %d host(s), %d task(s), %.1fs wall time" % (
+            label,
+            timings[0].playbook,
+            len(host_totals),
+            len(task_timings),
+            max([t.end for t in timings]) - min([t.start for t in timings]),
+        ),
+        "  Slowest hosts by total task time (median %.1fs):" % median_host_total,
+    ]
+    for host, total in sorted(host_totals.items(), key=lambda item: -item[1])[:top]:
+        lines.append("    %8.1fs  %s%s" % (
+            total,
+            host_label(host),
+            "  OUTLIER (%s)" % median_ratio(total, median_host_total) if is_outlier(total, median_host_total) else "",
+        ))
+
+    region_totals = dict()
+    for host, total in host_totals.items():
+        region = host_labels.get(host, (None, None))[1]
+        if region is not None:
+            region_totals.setdefault(region, []).append(total)
+    if len(region_totals) > 1:
+        lines.append("  Median host time by region: %s" % ", ".join([
+            "%s %.1fs" % (region, statistics.median(totals))
+            for region, totals in sorted(region_totals.items(), key=lambda item: -statistics.median(item[1]))
+        ]))
+
+    lines.append("  Slowest tasks by wall time:")
+    task_stats = []
+    for task_hosts in task_timings.values():
+        slowest = max(task_hosts, key=lambda t: t.duration)
+        median = statistics.median([t.duration for t in task_hosts])
+        task_stats.append((
+            max([t.end for t in task_hosts]) - min([t.start for t in task_hosts]),
+            task_label(task_hosts[0]),
+            slowest,
+            median,
+            [t for t in task_hosts if is_outlier(t.duration, median)],
+        ))
+    for wall_time, task, slowest, median, outliers in sorted(task_stats, key=lambda s: -s[0])[:top]:
+        lines.append("    %8.1fs  %s (median %.1fs, slowest %.1fs on %s)%s" % (
+            wall_time,
+            task,
+            median,
+            slowest.duration,
+            host_label(slowest.host),
+            "  OUTLIER on %d host(s)" % len(outliers) if len(outliers) > 0 else "",
+        ))
+    return lines
+
+
+def testnet_nodes_config_cache(cfg: "TestnetConfig", node_group_name: str) -> str:
+    """Returns the path to the given node group's configuration cache (see
+    tendermint_load_nodes_config)."""
+    return os.path.join(cfg.home, cfg.id, "tendermint", node_group_name, NODES_CONFIG_CACHE_FILE)
+
+
+def testnet_artifacts(cfg: "TestnetConfig") -> str:
+    """Returns the path to the given testnet's content-addressed store of files
+    shared between nodes."""
+    return os.path.join(cfg.home, cfg.id, "artifacts")
+
+
+def save_artifact(artifacts_path: str, content: bytes) -> str:
+    """Saves the given content to the artifact store (if it isn't already
+    there) and returns its SHA256 hash, which is its name in the store."""
+    artifact_hash = hashlib.sha256(content).hexdigest()
+    artifact_file = os.path.join(artifacts_path, artifact_hash)
+    if not os.path.exists(artifact_file):
+        os.makedirs(artifacts_path, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=artifacts_path, delete=False) as f:
+            f.write(content)
+        os.replace(f.name, artifact_file)
+    return artifact_hash
+
+
+def link_artifact(artifacts_path: str, artifact_hash: str, filename: str):
+    """Hard-links the given artifact to the given filename, replacing any
+    existing file there. Falls back to copying the artifact if it cannot be
+    linked (e.g. if the two paths are on different filesystems)."""
+    artifact_file = os.path.join(artifacts_path, artifact_hash)
+    if os.path.lexists(filename):
+        # never write through an existing link into the store
+        os.remove(filename)
+    try:
+        os.link(artifact_file, filename)
+    except OSError:
+        shutil.copyfile(artifact_file, filename)
+
+
+def prune_artifacts(artifacts_path: str, keep: Set[str]):
+    """Removes artifacts that are no longer linked to by any node and that are
+    not in the given set of hashes to keep."""
+    if not os.path.isdir(artifacts_path):
+        return
+    for artifact_hash in os.listdir(artifacts_path):
+        artifact_file = os.path.join(artifacts_path, artifact_hash)
+        if artifact_hash not in keep and os.stat(artifact_file).st_nlink <= 1:
+            os.remove(artifact_file)
+            logger.debug("Pruned unused artifact: %s", artifact_hash)
+
+
+def testnet_ssh_control_path(cfg: "TestnetConfig") -> str:
+    """Returns the path template for the given testnet's multiplexed SSH
+    connections' sockets (%C is expanded by SSH to a hash of the connection's
+    parameters)."""
+    return os.path.join(cfg.home, cfg.id, "ssh", "%C")
+
+
+def ansible_ssh_args(known_hosts: str) -> List[str]:
+    """Returns the ansible-playbook parameters needed to have SSH use the given
+    known_hosts file."""
+    return ["--ssh-common-args", "-o UserKnownHostsFile=%s" % known_hosts]
+
+
+def make_host_keys_scanner(hostnames: List[str]):
+    def scanner():
+        return get_host_keys(hostnames)
+    return scanner
 
 
 def tendermint_peer_id(host: str, address: str = None) -> str:
@@ -1923,16 +5157,38 @@ def ed25519_pub_key_to_id(pub_key: bytes) -> str:
 def unique_peer_ids(
     refs_list: List[TestnetNodeRef], 
     tendermint_config: Dict[str, List[TendermintNodeConfig]],
-) -> Set[str]:
-    result = set()
+) -> List[str]:
+    """Returns the peer IDs of the referenced nodes, without duplicates, in the
+    order in which they're referenced."""
+    result = OrderedDict()
     for ref in refs_list:
         # if the whole group needs to be added to the list
         if ref.id is None:
             for node_cfg in tendermint_config[ref.group]:
-                result.add(node_cfg.peer_id)
+                result[node_cfg.peer_id] = None
         else:
-            result.add(tendermint_config[ref.group][ref.id].peer_id)
-    return result
+            result[tendermint_config[ref.group][ref.id].peer_id] = None
+    return list(result.keys())
+
+
+def make_peer_list(peer_ids: List[str]) -> TendermintPeerList:
+    offsets, offset = dict(), 0
+    for peer_id in peer_ids:
+        offsets[peer_id] = (offset, offset + len(peer_id))
+        offset += len(peer_id) + 1
+    return TendermintPeerList(joined=",".join(peer_ids), offsets=offsets)
+
+
+def peer_list_without(peers: TendermintPeerList, peer_id: str) -> str:
+    """Returns the given joined peer list without the given peer's entry, by
+    slicing around its offsets rather than re-joining the remaining peers."""
+    if peer_id not in peers.offsets:
+        return peers.joined
+    start, end = peers.offsets[peer_id]
+    if end == len(peers.joined):
+        # the peer is the last entry in the list, so drop its preceding comma
+        return peers.joined[:max(start - 1, 0)]
+    return peers.joined[:start] + peers.joined[end + 1:]
 
 
 def save_ansible_inventory(filename: str, inventory: OrderedDictType[str, List]):
@@ -1959,6 +5215,10 @@ def save_ansible_inventory(filename: str, inventory: OrderedDictType[str, List])
                         line += " node_group=%s" % entry.node_group
                     if entry.node_id is not None:
                         line += " node_id=%s" % entry.node_id
+                    if entry.config_archive is not None:
+                        line += " config_archive=%s" % entry.config_archive
+                    if entry.binary_seed is not None:
+                        line += " binary_seed=%s" % entry.binary_seed
                     f.write("%s\n" % line)
                 else:
                     raise Exception("Unknown type for Ansible inventory entry: %s" % entry)